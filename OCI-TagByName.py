@@ -32,18 +32,42 @@
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 import os
-import oci
-import copy
+import time
 import argparse
-from datetime import datetime
-from modules.identity import create_signer, check_compartment_state, get_region_subscription_list, get_compartment_name, get_compartment_list, check_tags, list_ads
+
+# only import the oci service packages a run needs (modules/clients.py)
+os.environ.setdefault('OCI_PYTHON_SDK_NO_SERVICE_IMPORTS', 'true')
+
+import oci
+from types import SimpleNamespace
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from modules.identity import create_signer, check_compartment_state, get_region_subscription_list, get_compartment_name, get_compartment_list, check_tags, get_home_region
 from modules.resources import ResourcesFinder
-from modules.tagging import ResourcesTagger
-from modules.utils import green, yellow, red, magenta, cyan, clear, print_info, print_output, strfdelta
+from modules.tagging import set_defined_tag, merge_tags, conditional_tag_methods, tagging_stats
+from modules.scheduler import WorkStealingScheduler
+from modules.pipeline import Pipeline
+from modules.join import ComputeIndex, DatabaseIndex
+from modules.waiter import LifecycleWaiter
+from modules.orchestrator import StartStopOrchestrator
+from modules.metrics import RunMetrics
+from modules.profiling import PhaseProfiler
+from modules.discovery import find_untagged_resources, search_stats
+from modules.state import StateStore
+from modules.clients import ClientRegistry, import_families, client_name, family_clients
+from modules.ratelimit import RateLimiter
+from modules.bulk import BulkTagger
+from modules.plan import PlanWriter, ApplyJournal, read_plan, count_plan, parse_shard
+from modules.progress import Progress
+from modules.report import RunReport
+from modules.utils import black, blue, green, yellow, red, magenta, cyan, clear, print_info, print_error, print_output, print_resource_error, strfdelta
 
 script_path = os.path.abspath(__file__)
 script_name = (os.path.basename(script_path))[:-3]
 analysis_start = datetime.now()
+state_path = os.path.join(os.path.dirname(script_path), f'{script_name}.db')
+profile_path = os.path.join(os.path.dirname(script_path), f'{script_name}-profile')
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 # get command line arguments
@@ -84,6 +108,52 @@ def parse_arguments():
                         help='Tag Development resources')
     parser.add_argument('-all', action='store_true', default=False, dest='all_services', 
                         help='Tag all supported resources')
+    parser.add_argument('-rw', '--region-workers', type=int, default=1, dest='region_workers', 
+                        help='number of regions analyzed in parallel, default: 1')
+    parser.add_argument('-w', '--workers', type=int, default=1, dest='workers', 
+                        help='number of workers sharing (region, compartment, service) units, default: 1')
+    parser.add_argument('--search', action='store_true', default=False, dest='search', 
+                        help='discover untagged resources through resource search instead of listing every compartment')
+    parser.add_argument('-st', '--state', nargs='?', const=state_path, default=None, dest='state_file', 
+                        help=f'skip resources unchanged since last run using a local state store, default: {state_path}')
+    parser.add_argument('--compact-state', nargs='?', type=int, const=30, default=None, dest='compact_state', metavar='DAYS', 
+                        help='drop state entries not seen for DAYS (default: 30), vacuum the state store and exit')
+    parser.add_argument('--since', nargs='?', const='last', default=None, dest='since', metavar='DATETIME', 
+                        help='only tag resources created after DATETIME (UTC), default: start of last successful run')
+    parser.add_argument('--full-every', type=int, default=0, dest='full_every', metavar='DAYS', 
+                        help='with --since, run a full resync when the last one is older than DAYS, default: never')
+    parser.add_argument('-rl', '--rate-limit', nargs='?', type=float, const=50.0, default=None, dest='rate_limit', metavar='MAX_RPS', 
+                        help='adaptive rate limit per region and service endpoint, up to MAX_RPS requests/sec (default: 50)')
+    parser.add_argument('--bulk', action='store_true', default=False, dest='bulk', 
+                        help='tag resources through Identity bulk edit tags work requests, when the resource type allows it')
+    parser.add_argument('--plan', default='', dest='plan_file', metavar='FILE', 
+                        help='discover resources and write pending tag changes to FILE (JSON lines), no tag is applied')
+    parser.add_argument('--apply', default='', dest='apply_file', metavar='FILE', 
+                        help='apply the tag changes of a plan FILE with -w workers, resumes an interrupted apply')
+    parser.add_argument('--join', action='store_true', default=False, dest='join', 
+                        help='list child resources (volumes, backups, db homes, vm clusters) once per compartment and join them in memory')
+    parser.add_argument('--pipeline', action='store_true', default=False, dest='pipeline', 
+                        help='overlap discovery and tagging: discovery workers queue resources drained by tagging workers')
+    parser.add_argument('--discovery-workers', type=int, default=4, dest='discovery_workers', 
+                        help='with --pipeline, number of discovery workers, default: 4')
+    parser.add_argument('--tagging-workers', type=int, default=8, dest='tagging_workers', 
+                        help='with --pipeline, number of tagging workers, default: 8')
+    parser.add_argument('--queue-size', type=int, default=1000, dest='queue_size', 
+                        help='with --pipeline, resources queued before discovery waits for tagging, default: 1000')
+    parser.add_argument('--max-running', type=int, default=4, dest='max_running', 
+                        help='inactive MySQL / Visual Builder instances started at once to be tagged, default: 4')
+    parser.add_argument('--metrics', default='', dest='metrics_file', metavar='FILE', 
+                        help='write run metrics to FILE (.prom, node_exporter textfile collector) during and at the end of the run')
+    parser.add_argument('--metrics-interval', type=int, default=60, dest='metrics_interval', metavar='SECONDS', 
+                        help='with --metrics, seconds between writes during the run, 0: only at the end, default: 60')
+    parser.add_argument('--profile', nargs='?', const=profile_path, default=None, dest='profile_dir', metavar='DIR', 
+                        help=f'profile cpu per phase, one .pstats per phase and summary.txt in DIR, default: {profile_path}')
+    parser.add_argument('--report', default='', dest='report_file', metavar='FILE', 
+                        help='write one line per resource to FILE: JSON lines, CSV when FILE ends with .csv, gzip when it ends with .gz')
+    parser.add_argument('-q', '--quiet', action='store_true', default=False, dest='quiet', 
+                        help='no per-resource output on the terminal, errors and summary only')
+    parser.add_argument('--shard', default='0/1', dest='shard', metavar='I/N', 
+                        help='with --apply, only apply every N-th change starting at I, default: 0/1')
 
     return parser.parse_args()
 
@@ -107,6 +177,64 @@ if cmd.all_services:
     cmd.analytics = True
     cmd.development = True
 
+if cmd.plan_file and cmd.apply_file:
+    print_error('--plan and --apply', 'can not be used together')
+    raise SystemExit(1)
+
+shard = parse_shard(cmd.shard)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# cpu profiling per phase
+# phases run one at a time so each profile only holds
+# its own work: workers, region workers and pipeline
+# are disabled
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+profiler = PhaseProfiler(cmd.profile_dir) if cmd.profile_dir else None
+
+# -w only shares listing units and plan entries, search
+# discovery and the pipeline run with their own workers
+if cmd.workers > 1:
+    if profiler:
+        ignored_by = '--profile'
+    elif cmd.apply_file:
+        ignored_by = None
+    elif cmd.search:
+        ignored_by = '--search'
+    elif cmd.pipeline:
+        ignored_by = '--pipeline'
+    else:
+        ignored_by = None
+
+    if ignored_by:
+        print_error(f'-w {cmd.workers}', f'is ignored with {ignored_by}', level='INFO')
+
+if profiler:
+    cmd.workers = 1
+    cmd.region_workers = 1
+    cmd.pipeline = False
+
+def profile_phase(name):
+    return profiler.phase(name) if profiler else nullcontext()
+
+if shard is None:
+    print_error('Invalid --shard:', cmd.shard, 'expected I/N with 0 <= I < N')
+    raise SystemExit(1)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# open local state store
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# --since alone only reads and writes run watermarks, tags
+# are skipped by OCID (state) only with -st
+store = StateStore(cmd.state_file or state_path) if (cmd.state_file or cmd.since or cmd.compact_state is not None) else None
+state = store if cmd.state_file else None
+
+if cmd.compact_state is not None:
+    deleted = store.compact(cmd.compact_state)
+    print_info(green, 'State', 'compacted', f'{deleted} removed, {store.count()} kept')
+    raise SystemExit(0)
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 # print header
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -118,10 +246,11 @@ print_info(green, 'Analysis', 'started', script_name)
 # oci authentication
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-config, signer, oci_tname=create_signer(cmd.config_file_path, 
-                                        cmd.config_profile, 
-                                        cmd.is_delegation_token, 
-                                        cmd.is_config_file)
+with profile_phase('auth'):
+    config, signer, oci_tname=create_signer(cmd.config_file_path, 
+                                            cmd.config_profile, 
+                                            cmd.is_delegation_token, 
+                                            cmd.is_config_file)
 tenancy_id=config['tenancy']
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -136,10 +265,6 @@ search_client=oci.resource_search.ResourceSearchClient(
                 config=config, 
                 signer=signer)
 
-obj_storage_client=oci.object_storage.ObjectStorageClient(
-                config=config, 
-                signer=signer)
-
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 # set target regions
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -167,21 +292,61 @@ if cmd.exclude_comp:
     excluded_compartment_name = get_compartment_name(identity_client, cmd.exclude_comp)
     print_info(green, 'Compartment', 'excluded', excluded_compartment_name[:33])
 
-my_compartments=get_compartment_list(identity_client, top_level_compartment_id, cmd.exclude_comp)
+with profile_phase('compartments'):
+    my_compartments=get_compartment_list(identity_client, top_level_compartment_id, cmd.exclude_comp, tenancy_id)
 print_info(green, 'Compartment(#)', 'selected', len(my_compartments))
 
+if state:
+    print_info(green, 'State', 'entries', state.count())
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# set incremental watermark
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+run_start = datetime.now(timezone.utc)
+since = None
+
+# watermarks are kept per scope (families, region, compartment
+# subtree): a narrower run never moves the watermark of others
+watermark_scope = '{}|{}|{}|{}'.format(
+                                      ','.join(family for family in family_clients if getattr(cmd, family)),
+                                      cmd.target_region.lower() or '*',
+                                      top_level_compartment_id,
+                                      cmd.exclude_comp or '-'
+                                      )
+
+if cmd.since:
+    try:
+        since = store.get_watermark(f'last_run:{watermark_scope}') if cmd.since == 'last' else datetime.fromisoformat(cmd.since)
+    except ValueError:
+        print_error('Invalid --since datetime:', cmd.since, 'expected ISO 8601, e.g. 2024-01-31T22:00:00')
+        raise SystemExit(1)
+
+    if since and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    last_full_run = store.get_watermark(f'last_full_run:{watermark_scope}')
+
+    if cmd.full_every and (last_full_run is None or run_start - last_full_run >= timedelta(days=cmd.full_every)):
+        since = None
+
+    print_info(green, 'Resources', 'created since', since.strftime('%Y-%m-%d %H:%M:%S UTC') if since else 'full resync')
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 # check TagNamespace and TagKey
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-check_tags(identity_client, search_client, cmd.tag_namespace, cmd.tag_key)
+with profile_phase('check_tags'):
+    check_tags(identity_client, search_client, cmd.tag_namespace, cmd.tag_key)
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 # print header
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 print(green(f"{'*'*94:94}\n"))
-print(f"{'REGION':20}{'AD':6}{'COMPARTMENT':20}{'RESOURCE_TYPE':20}{'RESOURCE_NAME':20}\n")
+
+if not cmd.quiet:
+    print(f"{'REGION':20}{'AD':6}{'COMPARTMENT':20}{'RESOURCE_TYPE':20}{'RESOURCE_NAME':20}\n")
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 # set custom retry strategy
@@ -205,1155 +370,1427 @@ custom_retry_strategy = oci.retry.RetryStrategyBuilder(
                                                         ).get_retry_strategy()
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
-# start analysis
+# init client registry
+# service clients are built per region on first use,
+# so narrow runs (-c, -s ...) only pay for what they tag
+# with -rl, their requests go through the rate limiter.
+# tagger errors are printed through the run progress
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-# Iterate over regions and compartments
-
-for region in analyzed_regions:
-    config['region']=region.region_name
-    identity_client=oci.identity.IdentityClient(config=config, signer=signer)
-    core_client=oci.core.ComputeClient(config=config, signer=signer)
-    blk_storage_client=oci.core.BlockstorageClient(config=config, signer=signer)
-    object_client=oci.object_storage.ObjectStorageClient(config=config, signer=signer)
-    fss_client=oci.file_storage.FileStorageClient(config=config, signer=signer)
-    loadbalancer_client=oci.load_balancer.LoadBalancerClient(config=config, signer=signer)
-    networkloadbalancer_client=oci.network_load_balancer.NetworkLoadBalancerClient(config=config, signer=signer)
-    networkfw_client=oci.network_firewall.NetworkFirewallClient(config=config, signer=signer)
-    database_client=oci.database.DatabaseClient(config=config, signer=signer)
-    mysql_client=oci.mysql.DbSystemClient(config=config, signer=signer)
-    nosql_client=oci.nosql.NosqlClient(config=config, signer=signer)
-    opensearch_client=oci.opensearch.OpensearchClusterClient(config=config, signer=signer)
-    analytics_client=oci.analytics.AnalyticsClient(config=config, signer=signer)
-    bds_client=oci.bds.BdsClient(config=config, signer=signer)
-    data_catalog_client=oci.data_catalog.DataCatalogClient(config=config, signer=signer)
-    data_integration_client=oci.data_integration.DataIntegrationClient(config=config, signer=signer)
-    function_client=oci.functions.FunctionsManagementClient(config=config, signer=signer)
-    container_client=oci.container_instances.ContainerInstanceClient(config=config, signer=signer)
-    artifact_client=oci.artifacts.ArtifactsClient(config=config, signer=signer)
-    mesh_client=oci.service_mesh.ServiceMeshClient(config=config, signer=signer)
-    visual_builder_client=oci.visual_builder.VbInstanceClient(config=config, signer=signer)
-
-    all_ads=list_ads(identity_client, tenancy_id)
-    tagging_status = '   {}: Tagging {}: {}'
-    
-    for compartment in my_compartments:
-        
-        finder = ResourcesFinder(compartment.id, custom_retry_strategy)
-        
-        print('   {}: Analyzing compartment: {}'.format(region.region_name, compartment.name[0:18]),end=' '*15+'\r',flush=True)
+rate_limiter = RateLimiter(rate=min(10.0, cmd.rate_limit), max_rate=cmd.rate_limit) if cmd.rate_limit else None
+metrics = RunMetrics(cmd.metrics_file, cmd.metrics_interval) if cmd.metrics_file else None
+client_registry = ClientRegistry(config, signer, rate_limiter, metrics, printer=lambda text: progress.write(text))
 
-        if cmd.compute:
-            #-----------------------------------------
-            # get compute instances
-            #-----------------------------------------
-            all_instances=finder.list_instances(core_client)
-
-            for instance in all_instances:
-                service='instance'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, instance.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    # 1- retrieve instance tags
-                    defined_tags_dict = copy.deepcopy(instance.defined_tags)
-
-                    # 2- add key/value to defined_tags_dict
-                    # 2a- if tagnamespace already exists in defined_tags_dict:
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = instance.display_name
-
-                    # 2b- else when tagnamespace doesn't exist in defined_tags_dict
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: instance.display_name}})
-                    
-                    tagger = ResourcesTagger(core_client)
-                    tagger.tag_instance_resource(instance.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': green,
-                        'region': region.region_name,
-                        'region_ad': instance.availability_domain,
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': instance.display_name
-                        }
-                    print_output(output_data)
-
-                    #-----------------------------------------
-                    # get attached boot volume
-                    #-----------------------------------------
-                    instance_bootvolattach=finder.list_instances_bootvol(core_client, instance.availability_domain, instance.id)
-
-                    for bootvolattach in instance_bootvolattach:
-                        service='bootvolume'
-                        print(tagging_status.format(service, region.region_name, bootvolattach.display_name[0:18]),end=' '*15+'\r',flush=True)
-                        
-                        bootvol=blk_storage_client.get_boot_volume(bootvolattach.boot_volume_id).data
-
-                        defined_tags_dict = copy.deepcopy(bootvol.defined_tags)
-                        try:
-                            defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = instance.display_name
-                        except Exception:
-                            defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: instance.display_name}})
-
-                        tagger = ResourcesTagger(blk_storage_client)
-                        tagger.tag_bootvolume_resource(bootvol.id, defined_tags_dict)
-
-                        output_data = {
-                            'color': green,
-                            'region': region.region_name,
-                            'region_ad': bootvol.availability_domain,
-                            'compartment': compartment.name,
-                            'service': service, 
-                            'obj_name': bootvol.display_name
-                            }
-                        print_output(output_data)
-                        
-                    #-----------------------------------------
-                    # get boot volume backups
-                    #-----------------------------------------
-                    boot_volume_backups=finder.list_boot_volume_backups(blk_storage_client, bootvol.id)
-
-                    for boot_volume_backup in boot_volume_backups:
-                        service='boot_backup'
-                        print(tagging_status.format(service, region.region_name, boot_volume_backup.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                        bootvolbkp=blk_storage_client.get_boot_volume_backup(boot_volume_backup.id).data
-
-                        defined_tags_dict = copy.deepcopy(boot_volume_backup.defined_tags)
-                        try:
-                            defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = instance.display_name
-                        except Exception:
-                            defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: instance.display_name}})
-
-                        tagger = ResourcesTagger(blk_storage_client)
-                        tagger.tag_boot_backup_resource(boot_volume_backup.id, defined_tags_dict)
-
-                        output_data = {
-                            'color': green,
-                            'region': region.region_name,
-                            'region_ad': ' - ',
-                            'compartment': compartment.name,
-                            'service': service, 
-                            'obj_name': bootvolbkp.display_name
-                            }
-                        print_output(output_data)
-
-                    #-----------------------------------------
-                    # get attached block volumes
-                    #-----------------------------------------
-                    try:
-                        instance_vol_attach=finder.list_instances_volattach(core_client, instance.availability_domain, instance.id)
-
-                        for vol_attach in instance_vol_attach:
-                            service='volume'
-                            print(tagging_status.format(service, region.region_name, vol_attach.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                            volume=blk_storage_client.get_volume(vol_attach.volume_id).data
-
-                            defined_tags_dict = copy.deepcopy(volume.defined_tags)
-                            try:
-                                defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = instance.display_name
-                            except Exception:
-                                defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: instance.display_name}})
-
-                            tagger = ResourcesTagger(blk_storage_client)
-                            tagger.tag_volume_resource(volume.id, defined_tags_dict)
-
-                            output_data = {
-                                'color': green,
-                                'region': region.region_name,
-                                'region_ad': volume.availability_domain,
-                                'compartment': compartment.name,
-                                'service': service, 
-                                'obj_name': volume.display_name
-                                }
-                            print_output(output_data)
-
-                        #-----------------------------------------
-                        # get block volume backups
-                        #-----------------------------------------
-                        volume_backups=finder.list_volume_backups(blk_storage_client, volume.id)
-
-                        for volume_backup in volume_backups:
-                            service='volume_backup'
-                            print(tagging_status.format(service, region.region_name, volume_backup.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                            volbkp=blk_storage_client.get_volume_backup(volume_backup.id).data
-
-                            defined_tags_dict = copy.deepcopy(volume_backup.defined_tags)
-                            try:
-                                defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = instance.display_name
-                            except Exception:
-                                defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: instance.display_name}})
-
-                            tagger = ResourcesTagger(blk_storage_client)
-                            tagger.tag_volume_backup_resource(volume_backup.id, defined_tags_dict)
-
-                            output_data = {
-                                'color': green,
-                                'region': region.region_name,
-                                'region_ad': ' - ',
-                                'compartment': compartment.name,
-                                'service': service, 
-                                'obj_name': volbkp.display_name
-                                }
-                            print_output(output_data)
-
-                    except Exception:
-                        pass # pass if no block volumes or backups found
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{instance.display_name}\n ocid:{instance.id}\n {e}\n'))
-                    
-
-        if cmd.storage:
-            #-----------------------------------------
-            # get buckets
-            #-----------------------------------------
-            namespace_name=object_client.get_namespace().data
-            resources=finder.list_buckets(object_client, namespace_name)
-
-            for resource in resources:
-                service='bucket'
-
-                try:
-                    working_bucket=object_client.get_bucket(namespace_name,resource.name).data
-
-                    print(tagging_status.format(service, region.region_name, working_bucket.name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(working_bucket.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.name}})
-
-                    tagger = ResourcesTagger(object_client)
-                    tagger.tag_bucket_resource(working_bucket.name, defined_tags_dict)
-
-                    output_data = {
-                        'color': yellow,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': working_bucket.name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{working_bucket.name}\n ocid:{working_bucket.id}\n {e}\n'))
-                    
-            
-            #-----------------------------------------
-            # get fss
-            #-----------------------------------------
+if metrics:
+    metrics.start_writer()
 
-            for ad in all_ads:
-                resources=finder.list_fss(fss_client, ad)
-
-                for resource in resources:
-                    service='fss'
-
-                    try:
-                        print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-                        
-                        defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                        try:
-                            defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                        except Exception:
-                            defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-
-                        tagger = ResourcesTagger(fss_client)
-                        tagger.tag_fss_resource(resource.id, defined_tags_dict)
-
-                        output_data = {
-                            'color': yellow,
-                            'region': region.region_name,
-                            'region_ad': resource.availability_domain,
-                            'compartment': compartment.name,
-                            'service': service, 
-                            'obj_name': resource.display_name
-                            }
-                        print_output(output_data)
-
-                    except Exception as e:
-                        print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                        
-
-        if cmd.network:
-            #-----------------------------------------
-            # get load balancers
-            #-----------------------------------------
-            resources=finder.list_load_balancers(loadbalancer_client)
-
-            for resource in resources:
-                service='loadbalancer'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                    
-                    tagger = ResourcesTagger(loadbalancer_client)
-                    tagger.tag_lb_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': magenta,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# init run report, one line per resource
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-            #-----------------------------------------
-            # get network load balancers
-            #-----------------------------------------
-            resources=finder.list_network_load_balancers(networkloadbalancer_client)
-
-            for resource in resources:
-                service='ntwloadbalancer'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                    
-                    tagger = ResourcesTagger(networkloadbalancer_client)
-                    tagger.tag_nlb_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': magenta,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
+report = RunReport(cmd.report_file) if cmd.report_file else None
 
-            #-----------------------------------------
-            # get network firewalls
-            #-----------------------------------------
-            resources=finder.list_network_firewalls(networkfw_client)
-
-            for resource in resources:
-                service='networkfw'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                    
-                    tagger = ResourcesTagger(networkfw_client)
-                    tagger.tag_networkfw_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': magenta,
-                        'region': region.region_name,
-                        'region_ad': resource.availability_domain,
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
-
-        if cmd.database:
-            #-----------------------------------------
-            # get database systems
-            #-----------------------------------------
-            resources=finder.list_dbsystems(database_client)
-
-            for resource in resources:
-                service='dbsystem'
-
-                try:
-                    try:
-                        print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                        defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                        try:
-                            defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                        except Exception:
-                            defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                        
-                        tagger = ResourcesTagger(database_client)
-                        tagger.tag_dbsystem_resource(resource.id, defined_tags_dict)
-
-                        output_data = {
-                            'color': cyan,
-                            'region': region.region_name,
-                            'region_ad': resource.availability_domain,
-                            'compartment': compartment.name,
-                            'service': service, 
-                            'obj_name': resource.display_name
-                            }
-                        print_output(output_data)
-
-                    except Exception as e:
-                        print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-
-                    #-----------------------------------------
-                    # get db_homes in database systems
-                    #-----------------------------------------
-                    dbhomes=finder.list_db_homes(database_client, resource.id)
-
-                    for dbhome in dbhomes:
-                        service='dbhome'
-                        
-                        #-----------------------------------------
-                        # get databases in db_homes
-                        #-----------------------------------------
-                        databases=finder.list_databases(database_client, dbhome.id)
-
-                        for database in databases:
-                            service='dbsys_db'
-
-                            try:
-                                print(tagging_status.format(service, region.region_name, database.db_name[0:18]),end=' '*15+'\r',flush=True)
-
-                                defined_tags_dict = copy.deepcopy(database.defined_tags)
-                                try:
-                                    defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                                except Exception:
-                                    defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-
-                                tagger = ResourcesTagger(database_client)
-                                tagger.tag_dbsys_db_resource(database.id, defined_tags_dict)
-
-                                output_data = {
-                                    'color': cyan,
-                                    'region': region.region_name,
-                                    'region_ad': ' - ',
-                                    'compartment': compartment.name,
-                                    'service': service, 
-                                    'obj_name': database.db_name
-                                    }
-                                print_output(output_data)
-
-                            except Exception as e:
-                                print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{database.db_name}\n ocid:{database.id}\n {e}\n'))
-                                
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
-                    
-            #-----------------------------------------
-            # get autonomous databases
-            #-----------------------------------------
-            resources=finder.list_autonomous_db(database_client)
-
-            for resource in resources:
-                service='autonomous'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                    
-                    tagger = ResourcesTagger(database_client)
-                    tagger.tag_autonomous_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': cyan,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
+def record(region, region_ad, compartment, service, obj_name, ocid, action, latency=None, error=None):
+    if report:
+        report.write(region, region_ad, compartment, service, obj_name, ocid, action, latency, error)
 
-            #-----------------------------------------
-            # get cloud exadata infrastructures
-            #-----------------------------------------
-            resources=finder.list_cloud_exadata_infrastructures(database_client)
-
-            for resource in resources:
-                service='exa_infra'
-
-                try:
-                    try:
-                        print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                        defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                        try:
-                            defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                        except Exception:
-                            defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                        
-                        tagger = ResourcesTagger(database_client)
-                        tagger.tag_exa_infra_resource(resource.id, defined_tags_dict)
-
-                        output_data = {
-                            'color': cyan,
-                            'region': region.region_name,
-                            'region_ad': ' - ',
-                            'compartment': compartment.name,
-                            'service': service, 
-                            'obj_name': resource.display_name
-                            }
-                        print_output(output_data)
-
-                    except Exception as e:
-                        print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                        
-
-                    #-----------------------------------------
-                    # get cloud_autonomous_vm_clusters
-                    #-----------------------------------------
-                    cloud_autonomous_vm_clusters=finder.list_cloud_autonomous_vm_clusters(database_client, resource.id)
-
-                    for cloud_autonomous_vm_cluster in cloud_autonomous_vm_clusters:
-                        service='auto_vm_cluster'
-
-                        try:
-                            print(tagging_status.format(service, region.region_name, cloud_autonomous_vm_cluster.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                            defined_tags_dict = copy.deepcopy(cloud_autonomous_vm_cluster.defined_tags)
-                            try:
-                                defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = cloud_autonomous_vm_cluster.display_name
-                            except Exception:
-                                defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: cloud_autonomous_vm_cluster.display_name}})
-                            
-                            tagger = ResourcesTagger(database_client)
-                            tagger.tag_auto_vm_cluster_resource(cloud_autonomous_vm_cluster.id, defined_tags_dict)
-
-                            output_data = {
-                                'color': cyan,
-                                'region': region.region_name,
-                                'region_ad': ' - ',
-                                'compartment': compartment.name,
-                                'service': service, 
-                                'obj_name': cloud_autonomous_vm_cluster.display_name
-                                }
-                            print_output(output_data)
-
-                        except Exception as e:
-                            print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{cloud_autonomous_vm_cluster.display_name}\n ocid:{cloud_autonomous_vm_cluster.id}\n {e}\n'))
-                            
-
-                    #-----------------------------------------
-                    # get cloud_vm_clusters
-                    #-----------------------------------------
-                    cloud_vm_clusters=finder.list_cloud_vm_clusters(database_client, resource.id)
-
-                    for cloud_vm_cluster in cloud_vm_clusters:
-                        service='cloud_vm_cluster'
-
-                        try:
-                            print(tagging_status.format(service, region.region_name, cloud_vm_cluster.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                            defined_tags_dict = copy.deepcopy(cloud_vm_cluster.defined_tags)
-                            try:
-                                defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = cloud_vm_cluster.display_name
-                            except Exception:
-                                defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: cloud_vm_cluster.display_name}})
-                            
-                            tagger = ResourcesTagger(database_client)
-                            tagger.tag_cloud_vm_cluster_resource(cloud_vm_cluster.id, defined_tags_dict)
-
-                            output_data = {
-                                'color': cyan,
-                                'region': region.region_name,
-                                'region_ad': ' - ',
-                                'compartment': compartment.name,
-                                'service': service, 
-                                'obj_name': cloud_vm_cluster.display_name
-                                }
-                            print_output(output_data)
-
-                        except Exception as e:
-                            print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{cloud_vm_cluster.display_name}\n ocid:{cloud_vm_cluster.id}\n {e}\n'))
-                            
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{cloud_vm_cluster.display_name}\n ocid:{cloud_vm_cluster.id}\n {e}\n'))
-                    
+def resource_error(ctx, compartment, service, obj_name, obj_id, error):
+    tagging_stats.count('errors')
+    print_resource_error(ctx.region.region_name, compartment.name, obj_name, obj_id, error, progress.write)
+    record(ctx.region.region_name, None, compartment.name, service, obj_name, obj_id, 'failed', error=error)
+tagging_status = '   {}: Tagging {}: {}'
 
-            #-----------------------------------------
-            # get MySQL databases
-            #-----------------------------------------
-            resources=finder.list_mysql_db(mysql_client)
-
-            # MySQL instances must be running to update tag
-            # script starts inactive/untagged instances, apply tags and stops
-            stop_after_tag = False
-
-            for resource in resources:
-                service='mysql'
-                
-                mysql_inst=mysql_client.get_db_system(resource.id).data
-
-                try:
-                    print(tagging_status.format(service, region.region_name, mysql_inst.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(mysql_inst.defined_tags)
-
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = mysql_inst.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: mysql_inst.display_name}})
-
-                    # if != means tag is missing
-                    if defined_tags_dict != mysql_inst.defined_tags:
-                            
-                        if (mysql_inst.lifecycle_state == 'INACTIVE'):
-                            stop_after_tag = True
-
-                            print('   Starting MySQL: {}'.format(mysql_inst.display_name),end=' '*40 +'\r',flush=True)
-
-                            mysql_client.start_db_system(
-                                                        mysql_inst.id, 
-                                                        retry_strategy=custom_retry_strategy
-                                                        )
-                            
-                            oci.wait_until(
-                                            mysql_client, 
-                                            mysql_client.get_db_system(mysql_inst.id),
-                                            'lifecycle_state', 
-                                            'ACTIVE', 
-                                            max_wait_seconds=600, 
-                                            retry_strategy=custom_retry_strategy
-                                            ).data
-
-                        tagger = ResourcesTagger(mysql_client)
-                        tagger.tag_cloud_vm_cluster_resource(mysql_inst.id, defined_tags_dict)
-
-                        output_data = {
-                            'color': cyan,
-                            'region': region.region_name,
-                            'region_ad': ' - ',
-                            'compartment': compartment.name,
-                            'service': service, 
-                            'obj_name': mysql_inst.display_name
-                            }
-                        print_output(output_data)
-
-                    # stop instance previously stopped
-                    if stop_after_tag == True:
-                            print('   Stopping MySQL: {}'.format(mysql_inst.display_name),end=' '*40 +'\r',flush=True)
-                            stop_db_system_details=oci.mysql.models.StopDbSystemDetails(shutdown_type="SLOW")
-                            mysql_client.stop_db_system(mysql_inst.id, stop_db_system_details, retry_strategy=custom_retry_strategy)
-                            wait_response = oci.wait_until(mysql_client, mysql_client.get_db_system(mysql_inst.id), 'lifecycle_state', 'UPDATING', max_wait_seconds=600).data
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{mysql_inst.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# init bulk tagger
+# tagging work requests are sent to the home region
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-            #-----------------------------------------
-            # get NoSQL databases
-            #-----------------------------------------
-            resources=finder.list_nosql_db(nosql_client)
-
-            for resource in resources:
-                service='nosql'
-                
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.name}})
-                    
-                    tagger = ResourcesTagger(nosql_client)
-                    tagger.tag_nosql_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': cyan,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.name}\n ocid:{resource.id}\n {e}\n'))
-                    
+bulk_tagger = None
+plan_writer = PlanWriter(cmd.plan_file) if cmd.plan_file else None
 
-            #-----------------------------------------
-            # get OpenSearch clusters
-            #-----------------------------------------
-            resources=finder.list_opensearch_clusters(opensearch_client)
-
-            for resource in resources:
-                service='opensearch'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                    
-                    tagger = ResourcesTagger(opensearch_client)
-                    tagger.tag_opensearch_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': cyan,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
-
-        if cmd.analytics:
-            #-----------------------------------------
-            # get analytics instances
-            #-----------------------------------------
-            resources=finder.list_analytics(analytics_client)
-
-            for resource in resources:
-                service='analytics'
-                resource=analytics_client.get_analytics_instance(resource.id).data
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.name}})
-                    
-                    tagger = ResourcesTagger(analytics_client)
-                    tagger.tag_analytics_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': cyan,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.name}\n ocid:{resource.id}\n {e}\n'))
-                    
+if cmd.bulk and not plan_writer:
+    home_region_name = get_home_region(identity_client, tenancy_id).region_name
+    bulk_tagger = BulkTagger(
+                            lambda: client_registry.get(home_region_name, 'identity_client'),
+                            cmd.tag_namespace,
+                            cmd.tag_key,
+                            custom_retry_strategy
+                            )
 
-            #-----------------------------------------
-            # get big data instances
-            #-----------------------------------------
-            resources=finder.list_bds(bds_client)
-
-            for resource in resources:
-                service='bigdata'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                    
-                    tagger = ResourcesTagger(bds_client)
-                    tagger.tag_bigdata_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': cyan,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# init discovery / tagging pipeline
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-            #-----------------------------------------
-            # get data catalogs
-            #-----------------------------------------
-            resources=finder.list_catalogs(data_catalog_client)
+pipeline = Pipeline(cmd.discovery_workers, cmd.tagging_workers, cmd.queue_size) if cmd.pipeline and not cmd.apply_file else None
 
-            for resource in resources:
-                service='datacatalog'
+# with --join, databases of db homes are listed by one
+# pool for the whole run, its workers keep their clients
+join_executor = ThreadPoolExecutor(max_workers=8) if cmd.join else None
 
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# init lifecycle waiter, resources updated back to
+# ACTIVE are polled in the background
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
+waiter = LifecycleWaiter()
 
-                    tagger = ResourcesTagger(data_catalog_client)
-                    tagger.tag_data_catalog_resource(resource.id, defined_tags_dict)
+# inactive MySQL / VB instances are started, tagged and
+# stopped together at the end of each region, apply
+# keeps them inline so the journal follows each cycle
+orchestrator = StartStopOrchestrator(cmd.max_running) if not cmd.apply_file else None
 
-                    output_data = {
-                        'color': cyan,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
+def wait_active(ctx, compartment, obj_name, obj_id, client_name, get_method):
+    waiter.watch(
+                ctx.region.region_name,
+                compartment.name,
+                obj_name,
+                obj_id,
+                lambda: getattr(getattr(ctx, client_name), get_method)(obj_id).data,
+                lambda data: data.lifecycle_state == 'ACTIVE'
+                )
 
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
+# run start/stop cycles and reconcile transitions of a
+# region (all regions when None)
+def reconcile_transitions(region_name=None):
+    if orchestrator:
+        orchestrator.run(region_name)
+
+    for transition in waiter.wait(region_name):
+        print_resource_error(transition.region, transition.compartment, transition.obj_name, transition.obj_id, transition.error, progress.write)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# update the tags of a resource through its tagger
+# return (response, outcome, latency, error)
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def update_tags(ctx, client, tag_method, tag_args, resource_id, defined_tags_dict, current_tags, etag, ocid, service, tag_value):
+    tagger = ctx.tagger(client)
+    start = time.monotonic()
+    response = getattr(tagger, tag_method)(*tag_args, resource_id, defined_tags_dict, current_tags=current_tags, etag=etag)
+    latency = time.monotonic() - start
+
+    if state and response != '':
+        state.record(ocid, service, ctx.region.region_name, tag_value, defined_tags_dict)
+
+    outcome = 'skipped' if response is None else 'failed' if response == '' else 'tagged'
+    error = tagger.last_error if response == '' else None
+
+    return response, outcome, latency, error
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# metrics, run report and output line of a resource
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def report_tag(ctx, compartment, service, color, region_ad, obj_name, ocid, response, outcome, latency=None, error=None):
+    # queued resources are counted once their work request is reconciled
+    if metrics and outcome != 'queued':
+        metrics.resource(ctx.region.region_name, service, outcome)
+
+    record(ctx.region.region_name, region_ad, compartment.name, service, obj_name, ocid, outcome, latency, error)
+
+    if cmd.quiet:
+        return response
+
+    if response is None:
+        color = black
+    elif response == '':
+        color = red
+
+    output_data = {
+        'color': color,
+        'region': ctx.region.region_name,
+        'region_ad': region_ad or ' - ',
+        'compartment': compartment.name,
+        'service': service,
+        'obj_name': obj_name
+        }
+    print_output(output_data, progress.write)
+
+    return response
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# apply tag_namespace.tag_key = tag_value to a resource
+# unchanged resources are skipped by the tagger and
+# printed in grey, state store is updated when enabled.
+# with --bulk, resources are queued with a direct update
+# for the groups too small to be worth a work request
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def apply_tag(ctx, compartment, service, color, client, tag_method, resource_id, obj_name, current_tags, tag_value, region_ad=' - ', tag_args=(), ocid=None, etag=None, compartment_id=None):
+    progress.resource(tagging_status.format(service, ctx.region.region_name, obj_name[0:18]))
+
+    ocid = ocid or resource_id
+    defined_tags_dict = set_defined_tag(current_tags, cmd.tag_namespace, cmd.tag_key, tag_value)
+    latency = None
+    error = None
+
+    if state and state.is_current(ocid, tag_value, current_tags):
+        tagging_stats.count('skipped')
+        response = None
+        outcome = 'skipped'
+
+    elif plan_writer and defined_tags_dict != current_tags:
+        # planned, applied later with --apply: only the planned
+        # key is kept, set on the latest tags when applied
+        response = {
+            'ocid': ocid,
+            'resource_id': resource_id,
+            'service': service,
+            'region': ctx.region.region_name,
+            'compartment_id': compartment.id,
+            'compartment': compartment.name,
+            'name': obj_name,
+            'old_value': (current_tags or {}).get(cmd.tag_namespace, {}).get(cmd.tag_key),
+            'new_value': tag_value,
+            'client': client_name(client),
+            'tag_method': tag_method,
+            'tag_args': list(tag_args),
+            'changes': {cmd.tag_namespace: {cmd.tag_key: tag_value}}
+            }
+        plan_writer.write(response)
+        tagging_stats.count('planned')
+        outcome = 'planned'
+        color = blue
+
+    elif bulk_tagger and bulk_tagger.supports(service) and defined_tags_dict != current_tags:
+        # the client is resolved on the thread running the update
+        name = client_name(client)
+
+        def update(color=color):
+            return report_tag(ctx, compartment, service, color, region_ad, obj_name, ocid,
+                              *update_tags(ctx, getattr(ctx, name), tag_method, tag_args, resource_id, defined_tags_dict, current_tags, etag, ocid, service, tag_value))
+
+        # queued, result is reconciled once work requests complete
+        response = bulk_tagger.add(SimpleNamespace(
+                                                    compartment_id=compartment_id or compartment.id,
+                                                    compartment=compartment.name,
+                                                    region=ctx.region.region_name,
+                                                    service=service,
+                                                    ocid=ocid,
+                                                    obj_name=obj_name,
+                                                    tag_value=tag_value,
+                                                    defined_tags=defined_tags_dict,
+                                                    update=update
+                                                    ))
+        outcome = 'queued'
+        color = blue
+
+    else:
+        response, outcome, latency, error = update_tags(ctx, client, tag_method, tag_args, resource_id, defined_tags_dict, current_tags, etag, ocid, service, tag_value)
+
+    return report_tag(ctx, compartment, service, color, region_ad, obj_name, ocid, response, outcome, latency, error)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# skip a resource known by OCID only (attachments),
+# when the state store says it already carries tag_value.
+# its tags are not read, so the tags hash is not checked:
+# a volume whose tags changed since it was recorded is
+# skipped until its state entry is dropped. with --join
+# volumes are listed with their tags and always go
+# through the hash check of apply_tag instead
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def skip_current(ctx, compartment, service, ocid, obj_name, tag_value):
+    if not (state and state.is_current(ocid, tag_value)):
+        return False
+
+    tagging_stats.count('skipped')
+
+    if metrics:
+        metrics.resource(ctx.region.region_name, service, 'skipped')
+
+    progress.resource()
+    record(ctx.region.region_name, None, compartment.name, service, obj_name, ocid, 'skipped')
+
+    if cmd.quiet:
+        return True
+
+    output_data = {
+        'color': black,
+        'region': ctx.region.region_name,
+        'region_ad': ' - ',
+        'compartment': compartment.name,
+        'service': service,
+        'obj_name': obj_name
+        }
+    print_output(output_data, progress.write)
+
+    return True
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag instance and its volumes and backups
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_instance(ctx, compartment, instance, index=None):
+    core_client = ctx.core_client
+    blk_storage_client = ctx.blk_storage_client
+    finder = index or ResourcesFinder(compartment.id, custom_retry_strategy)
+
+    try:
+        apply_tag(ctx, compartment, 'instance', green, core_client, 'tag_instance_resource',
+                  instance.id, instance.display_name, instance.defined_tags, instance.display_name,
+                  region_ad=instance.availability_domain)
+
+        #-----------------------------------------
+        # get attached boot volume
+        #-----------------------------------------
+        instance_bootvolattach=finder.list_instances_bootvol(core_client, instance.availability_domain, instance.id)
+
+        for bootvolattach in instance_bootvolattach:
+            if index or not skip_current(ctx, compartment, 'bootvolume', bootvolattach.boot_volume_id, bootvolattach.display_name, instance.display_name):
+                bootvol, etag=finder.get_boot_volume(blk_storage_client, bootvolattach.boot_volume_id)
+
+                apply_tag(ctx, compartment, 'bootvolume', green, blk_storage_client, 'tag_bootvolume_resource',
+                          bootvol.id, bootvol.display_name, bootvol.defined_tags, instance.display_name,
+                          region_ad=bootvol.availability_domain, etag=etag, compartment_id=bootvol.compartment_id)
 
             #-----------------------------------------
-            # get data integration catalogs
-            #-----------------------------------------
-            resources=finder.list_workspaces(data_integration_client)
-
-            for resource in resources:
-                service='dataintegration'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-
-                    tagger = ResourcesTagger(data_integration_client)
-                    # submit 2 attributes as a workaround, crashs if only one submitted (oci v2.105.0)
-                    # see https://github.com/oracle/oci-python-sdk/issues/546
-                    tagger.tag_data_integration_resource(resource.display_name, resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': cyan,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
-
-        if cmd.development:
-            #-----------------------------------------
-            # get function applications
+            # get boot volume backups
             #-----------------------------------------
-            resources=finder.list_functions_app(function_client)
-
-            for resource in resources:
-                service='function_app'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                    
-                    tagger = ResourcesTagger(function_client)
-                    tagger.tag_function_app_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': red,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
+            for boot_volume_backup in finder.list_boot_volume_backups(blk_storage_client, bootvolattach.boot_volume_id):
+                apply_tag(ctx, compartment, 'boot_backup', green, blk_storage_client, 'tag_boot_backup_resource',
+                          boot_volume_backup.id, boot_volume_backup.display_name, boot_volume_backup.defined_tags, instance.display_name)
+
+        #-----------------------------------------
+        # get attached block volumes
+        #-----------------------------------------
+        try:
+            instance_vol_attach=finder.list_instances_volattach(core_client, instance.availability_domain, instance.id)
+
+            for vol_attach in instance_vol_attach:
+                if index or not skip_current(ctx, compartment, 'volume', vol_attach.volume_id, vol_attach.display_name, instance.display_name):
+                    volume, etag=finder.get_volume(blk_storage_client, vol_attach.volume_id)
+
+                    apply_tag(ctx, compartment, 'volume', green, blk_storage_client, 'tag_volume_resource',
+                              volume.id, volume.display_name, volume.defined_tags, instance.display_name,
+                              region_ad=volume.availability_domain, etag=etag, compartment_id=volume.compartment_id)
 
                 #-----------------------------------------
-                # get function instances
+                # get block volume backups
                 #-----------------------------------------
-                fn_apps=finder.list_functions(function_client, resource.id)
-
-                for fn_app in fn_apps:
-                    service='function'
-
-                    try:
-                        print(tagging_status.format(service, region.region_name, fn_app.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                        defined_tags_dict = copy.deepcopy(fn_app.defined_tags)
-                        try:
-                            defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                        except Exception:
-                            defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                        
-                        tagger = ResourcesTagger(function_client)
-                        tagger.tag_function_resource(fn_app.id, defined_tags_dict)
-
-                        output_data = {
-                            'color': red,
-                            'region': region.region_name,
-                            'region_ad': ' - ',
-                            'compartment': compartment.name,
-                            'service': service, 
-                            'obj_name': fn_app.display_name
-                            }
-                        print_output(output_data)
-
-                    except Exception as e:
-                        print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{fn_app.display_name}\n ocid:{fn_app.id}\n {e}\n'))
-                        
+                for volume_backup in finder.list_volume_backups(blk_storage_client, vol_attach.volume_id):
+                    apply_tag(ctx, compartment, 'volume_backup', green, blk_storage_client, 'tag_volume_backup_resource',
+                              volume_backup.id, volume_backup.display_name, volume_backup.defined_tags, instance.display_name)
 
-            #-----------------------------------------
-            # get container instances
-            #-----------------------------------------
-            resources=finder.list_container_instances(container_client)
-
-            for resource in resources:
-                service='container'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                    
-                    tagger = ResourcesTagger(container_client)
-                    tagger.tag_container_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': red,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
+        except Exception:
+            pass # pass if no block volumes or backups found
 
-            #-----------------------------------------
-            # get artifact repositories
-            #-----------------------------------------
-            resources=finder.list_repositories(artifact_client)
-
-            for resource in resources:
-                service='artifact'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                    
-                    tagger = ResourcesTagger(artifact_client)
-                    tagger.tag_artifact_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': red,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
+    except Exception as e:
+        resource_error(ctx, compartment, 'instance', instance.display_name, instance.id, e)
 
-            #-----------------------------------------
-            # get mesh instances
-            #-----------------------------------------
-            resources=finder.list_meshes(mesh_client)
-
-            for resource in resources:
-                service='mesh'
-
-                try:
-                    print(tagging_status.format(service, region.region_name, resource.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(resource.defined_tags)
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = resource.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: resource.display_name}})
-                    
-                    tagger = ResourcesTagger(mesh_client)
-                    tagger.tag_mesh_resource(resource.id, defined_tags_dict)
-
-                    output_data = {
-                        'color': red,
-                        'region': region.region_name,
-                        'region_ad': ' - ',
-                        'compartment': compartment.name,
-                        'service': service, 
-                        'obj_name': resource.display_name
-                        }
-                    print_output(output_data)
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{resource.display_name}\n ocid:{resource.id}\n {e}\n'))
-                    
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag bucket
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_bucket(ctx, compartment, resource):
+    object_client = ctx.object_client
+    namespace_name = ctx.namespace_name
+
+    try:
+        # listed buckets carry their tags (fields=['tags']) but no
+        # ocid, only search results need a get to read their tags.
+        # both are keyed region/namespace/name in state and reports
+        if getattr(resource, 'defined_tags', None) is None:
+            working_bucket=object_client.get_bucket(namespace_name, resource.name).data
+        else:
+            working_bucket=resource
+
+        ocid=f'{ctx.region.region_name}/{namespace_name}/{resource.name}'
+
+        apply_tag(ctx, compartment, 'bucket', yellow, object_client, 'tag_bucket_resource',
+                  working_bucket.name, working_bucket.name, working_bucket.defined_tags, resource.name,
+                  tag_args=(namespace_name,), ocid=ocid)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'bucket', resource.name, getattr(resource, 'id', ' - '), e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag file system
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_fss(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'fss', yellow, ctx.fss_client, 'tag_fss_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name,
+                  region_ad=resource.availability_domain)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'fss', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag load balancer
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_loadbalancer(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'loadbalancer', magenta, ctx.loadbalancer_client, 'tag_lb_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'loadbalancer', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag network load balancer
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_ntwloadbalancer(ctx, compartment, resource):
+    try:
+        response = apply_tag(ctx, compartment, 'ntwloadbalancer', magenta, ctx.networkloadbalancer_client, 'tag_nlb_resource',
+                             resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+        # updated: back to ACTIVE is checked in the background
+        if isinstance(response, oci.response.Response):
+            wait_active(ctx, compartment, resource.display_name, resource.id, 'networkloadbalancer_client', 'get_network_load_balancer')
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'ntwloadbalancer', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag network firewall
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_networkfw(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'networkfw', magenta, ctx.networkfw_client, 'tag_networkfw_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name,
+                  region_ad=resource.availability_domain)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'networkfw', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag database system and its databases
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_dbsystem(ctx, compartment, resource, index=None):
+    database_client = ctx.database_client
+    finder = index or ResourcesFinder(compartment.id, custom_retry_strategy)
+
+    try:
+        try:
+            apply_tag(ctx, compartment, 'dbsystem', cyan, database_client, 'tag_dbsystem_resource',
+                      resource.id, resource.display_name, resource.defined_tags, resource.display_name,
+                      region_ad=resource.availability_domain)
+
+        except Exception as e:
+            resource_error(ctx, compartment, 'dbsystem', resource.display_name, resource.id, e)
+
+        #-----------------------------------------
+        # get db_homes in database systems
+        #-----------------------------------------
+        for dbhome in finder.list_db_homes(database_client, resource.id):
 
             #-----------------------------------------
-            # get visual builder instances
+            # get databases in db_homes
             #-----------------------------------------
-            resources=finder.list_vb_instances(visual_builder_client)
-
-            # VB instances must be running to update tag
-            # script starts inactive/untagged instances, apply tags and stops
-            stop_after_tag = False
-
-            for resource in resources:
-                service='visual_builder'
-
-                vb_inst=visual_builder_client.get_vb_instance(resource.id).data
-
-                try:                
-                    print(tagging_status.format(service, region.region_name, vb_inst.display_name[0:18]),end=' '*15+'\r',flush=True)
-
-                    defined_tags_dict = copy.deepcopy(vb_inst.defined_tags)
-
-                    try:
-                        defined_tags_dict[cmd.tag_namespace][cmd.tag_key] = vb_inst.display_name
-                    except Exception:
-                        defined_tags_dict.update({cmd.tag_namespace: {cmd.tag_key: vb_inst.display_name}})
-
-                    # if != means tag is missing
-                    if defined_tags_dict != vb_inst.defined_tags:
-
-                        if (vb_inst.lifecycle_state == 'INACTIVE'):
-                            stop_after_tag = True
-
-                            print('   Starting Visual Builder: {}'.format(vb_inst.display_name),end=' '*40 +'\r',flush=True)
-
-                            visual_builder_client.start_vb_instance(
-                                                                    vb_inst.id, 
-                                                                    retry_strategy=custom_retry_strategy
-                                                                    )
-
-                            oci.wait_until(
-                                            visual_builder_client, 
-                                            visual_builder_client.get_vb_instance(vb_inst.id), 
-                                            'lifecycle_state', 
-                                            'ACTIVE', 
-                                            max_wait_seconds=600, 
-                                            retry_strategy=custom_retry_strategy
-                                            ).data
-
-                        tagger = ResourcesTagger(visual_builder_client)
-                        tagger.tag_visual_builder_resource(vb_inst.id, defined_tags_dict)
-
-                        oci.wait_until(
-                                        visual_builder_client, 
-                                        visual_builder_client.get_vb_instance(vb_inst.id), 
-                                        'lifecycle_state', 'ACTIVE', 
-                                        max_wait_seconds=600
-                                        ).data
-                        
-                        output_data = {
-                            'color': yellow,
-                            'region': region.region_name,
-                            'region_ad': ' - ',
-                            'compartment': compartment.name,
-                            'service': service, 
-                            'obj_name': vb_inst.display_name
-                            }
-                        print_output(output_data)
-
-                    else:                        
-                        output_data = {
-                            'color': magenta,
-                            'region': region.region_name,
-                            'region_ad': ' - ',
-                            'compartment': compartment.name,
-                            'service': service, 
-                            'obj_name': vb_inst.display_name
-                            }
-                        print_output(output_data)
-
-                    # stop instance previously stopped
-                    if stop_after_tag == True:
-                            print('   Stopping Visual Builder: {}'.format(vb_inst.display_name),end=' '*40 +'\r',flush=True)
-                            visual_builder_client.stop_vb_instance(
-                                                                   vb_inst.id, 
-                                                                   retry_strategy=custom_retry_strategy
-                                                                   )
-                            oci.wait_until(
-                                            visual_builder_client, 
-                                            visual_builder_client.get_vb_instance(vb_inst.id), 
-                                            'lifecycle_state', 
-                                            'UPDATING', 
-                                            max_wait_seconds=600
-                                            ).data
-
-                except Exception as e:
-                    print(red(f'\n region:{region.region_name}\n compartment:{compartment.name}\n name:{vb_inst.display_name}\n ocid:{vb_inst.id}\n {e}\n'))
-                    
+            try:
+                databases = list(finder.list_databases(database_client, dbhome.id))
+
+            except Exception as e:
+                resource_error(ctx, compartment, 'db_home', dbhome.display_name, dbhome.id, e)
+                continue
+
+            for database in databases:
+                tag_dbsys_db(ctx, compartment, database, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'dbsystem', resource.display_name, resource.id, e)
+
+def tag_dbsys_db(ctx, compartment, database, dbsystem_name):
+    try:
+        apply_tag(ctx, compartment, 'dbsys_db', cyan, ctx.database_client, 'tag_dbsys_db_resource',
+                  database.id, database.db_name, database.defined_tags, dbsystem_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'dbsys_db', database.db_name, database.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag autonomous database
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_autonomous(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'autonomous', cyan, ctx.database_client, 'tag_autonomous_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'autonomous', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag cloud exadata infrastructure and its vm clusters
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_exa_infra(ctx, compartment, resource, index=None):
+    database_client = ctx.database_client
+    finder = index or ResourcesFinder(compartment.id, custom_retry_strategy)
+
+    try:
+        try:
+            apply_tag(ctx, compartment, 'exa_infra', cyan, database_client, 'tag_exa_infra_resource',
+                      resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+        except Exception as e:
+            resource_error(ctx, compartment, 'exa_infra', resource.display_name, resource.id, e)
+
+        #-----------------------------------------
+        # get cloud_autonomous_vm_clusters
+        #-----------------------------------------
+        for cloud_autonomous_vm_cluster in finder.list_cloud_autonomous_vm_clusters(database_client, resource.id):
+            tag_auto_vm_cluster(ctx, compartment, cloud_autonomous_vm_cluster)
+
+        #-----------------------------------------
+        # get cloud_vm_clusters
+        #-----------------------------------------
+        for cloud_vm_cluster in finder.list_cloud_vm_clusters(database_client, resource.id):
+            tag_cloud_vm_cluster(ctx, compartment, cloud_vm_cluster)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'exa_infra', resource.display_name, resource.id, e)
+
+def tag_auto_vm_cluster(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'auto_vm_cluster', cyan, ctx.database_client, 'tag_auto_vm_cluster_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'auto_vm_cluster', resource.display_name, resource.id, e)
+
+def tag_cloud_vm_cluster(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'cloud_vm_cluster', cyan, ctx.database_client, 'tag_cloud_vm_cluster_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'cloud_vm_cluster', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag mysql database
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_mysql(ctx, compartment, resource):
+    mysql_client = ctx.mysql_client
+
+    try:
+        mysql_inst=mysql_client.get_db_system(resource.id).data
+        defined_tags_dict = set_defined_tag(mysql_inst.defined_tags, cmd.tag_namespace, cmd.tag_key, mysql_inst.display_name)
+
+        # MySQL instances must be running to update tag
+        # script starts inactive/untagged instances, apply tags and stops
+        stop_after_tag = defined_tags_dict != mysql_inst.defined_tags and mysql_inst.lifecycle_state == 'INACTIVE' and not plan_writer
+
+        if stop_after_tag and orchestrator:
+            orchestrator.add(ctx.region.region_name, mysql_inst.display_name, lambda: cycle_mysql(ctx, compartment, mysql_inst))
+            return None
+
+        if stop_after_tag:
+            return cycle_mysql(ctx, compartment, mysql_inst)
+
+        return apply_tag(ctx, compartment, 'mysql', cyan, mysql_client, 'tag_mysql_resource',
+                         mysql_inst.id, mysql_inst.display_name, mysql_inst.defined_tags, mysql_inst.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'mysql', resource.display_name, resource.id, e)
+        return ''
+
+# start an inactive MySQL instance, tag and stop it
+def cycle_mysql(ctx, compartment, mysql_inst):
+    mysql_client = ctx.mysql_client
+
+    try:
+        progress.status('Starting MySQL: {}'.format(mysql_inst.display_name))
 
+        mysql_client.start_db_system(
+                                    mysql_inst.id,
+                                    retry_strategy=custom_retry_strategy
+                                    )
+
+        oci.wait_until(
+                        mysql_client,
+                        mysql_client.get_db_system(mysql_inst.id),
+                        'lifecycle_state',
+                        'ACTIVE',
+                        max_wait_seconds=600,
+                        retry_strategy=custom_retry_strategy
+                        ).data
+
+        response = apply_tag(ctx, compartment, 'mysql', cyan, mysql_client, 'tag_mysql_resource',
+                             mysql_inst.id, mysql_inst.display_name, mysql_inst.defined_tags, mysql_inst.display_name)
+
+        # stop instance previously stopped
+        progress.status('Stopping MySQL: {}'.format(mysql_inst.display_name))
+        stop_db_system_details=oci.mysql.models.StopDbSystemDetails(shutdown_type="SLOW")
+        mysql_client.stop_db_system(mysql_inst.id, stop_db_system_details, retry_strategy=custom_retry_strategy)
+        oci.wait_until(mysql_client, mysql_client.get_db_system(mysql_inst.id), 'lifecycle_state', 'UPDATING', max_wait_seconds=600).data
+
+        return response
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'mysql', mysql_inst.display_name, mysql_inst.id, e)
+        return ''
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag nosql table
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_nosql(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'nosql', cyan, ctx.nosql_client, 'tag_nosql_resource',
+                  resource.id, resource.name, resource.defined_tags, resource.name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'nosql', resource.name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag opensearch cluster
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_opensearch(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'opensearch', cyan, ctx.opensearch_client, 'tag_opensearch_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'opensearch', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag analytics instance
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_analytics(ctx, compartment, resource):
+    analytics_client = ctx.analytics_client
+
+    try:
+        resource=analytics_client.get_analytics_instance(resource.id).data
+
+        apply_tag(ctx, compartment, 'analytics', cyan, analytics_client, 'tag_analytics_resource',
+                  resource.id, resource.name, resource.defined_tags, resource.name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'analytics', resource.name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag big data instance
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_bigdata(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'bigdata', cyan, ctx.bds_client, 'tag_bigdata_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'bigdata', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag data catalog
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_datacatalog(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'datacatalog', cyan, ctx.data_catalog_client, 'tag_data_catalog_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'datacatalog', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag data integration workspace
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_dataintegration(ctx, compartment, resource):
+    try:
+        # submit 2 attributes as a workaround, crashs if only one submitted (oci v2.105.0)
+        # see https://github.com/oracle/oci-python-sdk/issues/546
+        apply_tag(ctx, compartment, 'dataintegration', cyan, ctx.data_integration_client, 'tag_data_integration_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name,
+                  tag_args=(resource.display_name,))
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'dataintegration', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag function application and its functions
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_function_app(ctx, compartment, resource):
+    function_client = ctx.function_client
+    finder = ResourcesFinder(compartment.id, custom_retry_strategy)
+
+    try:
+        apply_tag(ctx, compartment, 'function_app', red, function_client, 'tag_function_app_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'function_app', resource.display_name, resource.id, e)
+
+    #-----------------------------------------
+    # get function instances
+    #-----------------------------------------
+    for fn_app in finder.list_functions(function_client, resource.id):
+        tag_function(ctx, compartment, fn_app, resource.display_name)
+
+def tag_function(ctx, compartment, fn_app, function_app_name):
+    try:
+        apply_tag(ctx, compartment, 'function', red, ctx.function_client, 'tag_function_resource',
+                  fn_app.id, fn_app.display_name, fn_app.defined_tags, function_app_name, compartment_id=fn_app.compartment_id)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'function', fn_app.display_name, fn_app.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag container instance
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_container(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'container', red, ctx.container_client, 'tag_container_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'container', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag artifact repository
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_artifact(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'artifact', red, ctx.artifact_client, 'tag_artifact_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'artifact', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag mesh
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_mesh(ctx, compartment, resource):
+    try:
+        apply_tag(ctx, compartment, 'mesh', red, ctx.mesh_client, 'tag_mesh_resource',
+                  resource.id, resource.display_name, resource.defined_tags, resource.display_name)
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'mesh', resource.display_name, resource.id, e)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# tag visual builder instance
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tag_visual_builder(ctx, compartment, resource):
+    visual_builder_client = ctx.visual_builder_client
+
+    try:
+        vb_inst=visual_builder_client.get_vb_instance(resource.id).data
+        defined_tags_dict = set_defined_tag(vb_inst.defined_tags, cmd.tag_namespace, cmd.tag_key, vb_inst.display_name)
+
+        # VB instances must be running to update tag
+        # script starts inactive/untagged instances, apply tags and stops
+        stop_after_tag = defined_tags_dict != vb_inst.defined_tags and vb_inst.lifecycle_state == 'INACTIVE' and not plan_writer
+
+        if stop_after_tag and orchestrator:
+            orchestrator.add(ctx.region.region_name, vb_inst.display_name, lambda: cycle_visual_builder(ctx, compartment, vb_inst))
+            return None
+
+        if stop_after_tag:
+            return cycle_visual_builder(ctx, compartment, vb_inst)
+
+        response = apply_tag(ctx, compartment, 'visual_builder', yellow, visual_builder_client, 'tag_visual_builder_resource',
+                             vb_inst.id, vb_inst.display_name, vb_inst.defined_tags, vb_inst.display_name)
+
+        # back to ACTIVE is checked in the background
+        if isinstance(response, oci.response.Response):
+            wait_active(ctx, compartment, vb_inst.display_name, vb_inst.id, 'visual_builder_client', 'get_vb_instance')
+
+        return response
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'visual_builder', resource.display_name, resource.id, e)
+        return ''
+
+# start an inactive VB instance, tag and stop it once updated
+def cycle_visual_builder(ctx, compartment, vb_inst):
+    visual_builder_client = ctx.visual_builder_client
+
+    try:
+        progress.status('Starting Visual Builder: {}'.format(vb_inst.display_name))
+
+        visual_builder_client.start_vb_instance(
+                                                vb_inst.id,
+                                                retry_strategy=custom_retry_strategy
+                                                )
+
+        oci.wait_until(
+                        visual_builder_client,
+                        visual_builder_client.get_vb_instance(vb_inst.id),
+                        'lifecycle_state',
+                        'ACTIVE',
+                        max_wait_seconds=600,
+                        retry_strategy=custom_retry_strategy
+                        ).data
+
+        response = apply_tag(ctx, compartment, 'visual_builder', yellow, visual_builder_client, 'tag_visual_builder_resource',
+                             vb_inst.id, vb_inst.display_name, vb_inst.defined_tags, vb_inst.display_name)
+
+        # the update must complete before the stop
+        if isinstance(response, oci.response.Response):
+            oci.wait_until(
+                            visual_builder_client,
+                            visual_builder_client.get_vb_instance(vb_inst.id),
+                            'lifecycle_state', 'ACTIVE',
+                            max_wait_seconds=600
+                            ).data
+
+        # stop instance previously stopped
+        progress.status('Stopping Visual Builder: {}'.format(vb_inst.display_name))
+        visual_builder_client.stop_vb_instance(
+                                               vb_inst.id,
+                                               retry_strategy=custom_retry_strategy
+                                               )
+        oci.wait_until(
+                        visual_builder_client,
+                        visual_builder_client.get_vb_instance(vb_inst.id),
+                        'lifecycle_state',
+                        'UPDATING',
+                        max_wait_seconds=600
+                        ).data
+
+        return response
+
+    except Exception as e:
+        resource_error(ctx, compartment, 'visual_builder', vb_inst.display_name, vb_inst.id, e)
+        return ''
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# hand a discovered resource to its tagger, queued on
+# the tagging workers when the pipeline is enabled
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def dispatch(handler, ctx, compartment, resource, *args):
+    if pipeline:
+        pipeline.emit(handler, ctx, compartment, resource, *args)
+    else:
+        handler(ctx, compartment, resource, *args)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# analyze compute resources of a compartment
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def analyze_compute(ctx, compartment):
+    finder = ResourcesFinder(compartment.id, custom_retry_strategy, since)
+    index = None
+
+    #-----------------------------------------
+    # get compute instances
+    # with --join, their volumes and backups are
+    # indexed once, when the first instance is found
+    #-----------------------------------------
+    for instance in finder.list_instances(ctx.core_client):
+        if cmd.join and index is None:
+            index = ComputeIndex(ResourcesFinder(compartment.id, custom_retry_strategy), ctx.core_client, ctx.blk_storage_client, ctx.all_ads)
+
+        dispatch(tag_instance, ctx, compartment, instance, index)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# analyze storage resources of a compartment
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def analyze_storage(ctx, compartment):
+    finder = ResourcesFinder(compartment.id, custom_retry_strategy, since)
+
+    #-----------------------------------------
+    # get buckets
+    #-----------------------------------------
+    for resource in finder.list_buckets(ctx.object_client, ctx.namespace_name):
+        dispatch(tag_bucket, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get fss
+    #-----------------------------------------
+    for ad in ctx.all_ads:
+        for resource in finder.list_fss(ctx.fss_client, ad):
+            dispatch(tag_fss, ctx, compartment, resource)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# analyze network resources of a compartment
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def analyze_network(ctx, compartment):
+    finder = ResourcesFinder(compartment.id, custom_retry_strategy, since)
+
+    #-----------------------------------------
+    # get load balancers
+    #-----------------------------------------
+    for resource in finder.list_load_balancers(ctx.loadbalancer_client):
+        dispatch(tag_loadbalancer, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get network load balancers
+    #-----------------------------------------
+    for resource in finder.list_network_load_balancers(ctx.networkloadbalancer_client):
+        dispatch(tag_ntwloadbalancer, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get network firewalls
+    #-----------------------------------------
+    for resource in finder.list_network_firewalls(ctx.networkfw_client):
+        dispatch(tag_networkfw, ctx, compartment, resource)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# analyze database resources of a compartment
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def analyze_database(ctx, compartment):
+    finder = ResourcesFinder(compartment.id, custom_retry_strategy, since)
+    index = None
+
+    # with --join, db homes, databases and vm clusters are
+    # indexed once, when the first parent resource is found
+    def database_index():
+        nonlocal index
+
+        if cmd.join and index is None:
+            index = DatabaseIndex(ResourcesFinder(compartment.id, custom_retry_strategy), lambda: ctx.database_client, join_executor)
+
+        return index
+
+    #-----------------------------------------
+    # get database systems
+    #-----------------------------------------
+    for resource in finder.list_dbsystems(ctx.database_client):
+        dispatch(tag_dbsystem, ctx, compartment, resource, database_index())
+
+    #-----------------------------------------
+    # get autonomous databases
+    #-----------------------------------------
+    for resource in finder.list_autonomous_db(ctx.database_client):
+        dispatch(tag_autonomous, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get cloud exadata infrastructures
+    #-----------------------------------------
+    for resource in finder.list_cloud_exadata_infrastructures(ctx.database_client):
+        dispatch(tag_exa_infra, ctx, compartment, resource, database_index())
+
+    #-----------------------------------------
+    # get MySQL databases
+    #-----------------------------------------
+    for resource in finder.list_mysql_db(ctx.mysql_client):
+        dispatch(tag_mysql, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get NoSQL databases
+    #-----------------------------------------
+    for resource in finder.list_nosql_db(ctx.nosql_client):
+        dispatch(tag_nosql, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get OpenSearch clusters
+    #-----------------------------------------
+    for resource in finder.list_opensearch_clusters(ctx.opensearch_client):
+        dispatch(tag_opensearch, ctx, compartment, resource)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# analyze analytics resources of a compartment
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def analyze_analytics(ctx, compartment):
+    finder = ResourcesFinder(compartment.id, custom_retry_strategy, since)
+
+    #-----------------------------------------
+    # get analytics instances
+    #-----------------------------------------
+    for resource in finder.list_analytics(ctx.analytics_client):
+        dispatch(tag_analytics, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get big data instances
+    #-----------------------------------------
+    for resource in finder.list_bds(ctx.bds_client):
+        dispatch(tag_bigdata, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get data catalogs
+    #-----------------------------------------
+    for resource in finder.list_catalogs(ctx.data_catalog_client):
+        dispatch(tag_datacatalog, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get data integration catalogs
+    #-----------------------------------------
+    for resource in finder.list_workspaces(ctx.data_integration_client):
+        dispatch(tag_dataintegration, ctx, compartment, resource)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# analyze development resources of a compartment
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def analyze_development(ctx, compartment):
+    finder = ResourcesFinder(compartment.id, custom_retry_strategy, since)
+
+    #-----------------------------------------
+    # get function applications
+    #-----------------------------------------
+    for resource in finder.list_functions_app(ctx.function_client):
+        dispatch(tag_function_app, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get container instances
+    #-----------------------------------------
+    for resource in finder.list_container_instances(ctx.container_client):
+        dispatch(tag_container, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get artifact repositories
+    #-----------------------------------------
+    for resource in finder.list_repositories(ctx.artifact_client):
+        dispatch(tag_artifact, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get mesh instances
+    #-----------------------------------------
+    for resource in finder.list_meshes(ctx.mesh_client):
+        dispatch(tag_mesh, ctx, compartment, resource)
+
+    #-----------------------------------------
+    # get visual builder instances
+    #-----------------------------------------
+    for resource in finder.list_vb_instances(ctx.visual_builder_client):
+        dispatch(tag_visual_builder, ctx, compartment, resource)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# service families selected on the command line
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+service_families = {
+    'compute': analyze_compute,
+    'storage': analyze_storage,
+    'network': analyze_network,
+    'database': analyze_database,
+    'analytics': analyze_analytics,
+    'development': analyze_development,
+    }
+
+selected_families = [family for family in service_families if getattr(cmd, family)]
+import_families(selected_families)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# run one (region, compartment, service family) unit
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def run_unit(unit):
+    region, compartment, family = unit
+    ctx = client_registry.context(region)
+
+    progress.status('{}: Analyzing compartment: {}'.format(region.region_name, compartment.name[0:18]))
+
+    with profile_phase(f'{region.region_name}.{family}'):
+        service_families[family](ctx, compartment)
+
+    progress.unit_done(region.region_name, compartment.id)
+
+def analyze_region(region):
+    for compartment in my_compartments:
+        for family in selected_families:
+            run_unit((region, compartment, family))
+
+    reconcile_transitions(region.region_name)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# search discovery: resource type -> (getter, handler)
+# getters return the object expected by each handler,
+# child resources (volumes, backups, databases,
+# functions) return their parent, tagged with them by
+# its handler; None when they have no parent to follow
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def search_stub(ctx, summary):
+    return SimpleNamespace(id=summary.identifier, name=summary.display_name, display_name=summary.display_name, compartment_id=summary.compartment_id)
+
+def attached_instance(ctx, attachments):
+    for attachment in attachments:
+        if attachment.lifecycle_state == 'ATTACHED':
+            return ctx.core_client.get_instance(attachment.instance_id).data
+
+    return None
+
+def boot_volume_instance(ctx, boot_volume_id):
+    boot_volume = ctx.blk_storage_client.get_boot_volume(boot_volume_id).data
+    attachments = ctx.core_client.list_boot_volume_attachments(boot_volume.availability_domain, boot_volume.compartment_id, boot_volume_id=boot_volume_id).data
+
+    return attached_instance(ctx, attachments)
+
+def volume_instance(ctx, volume_id):
+    volume = ctx.blk_storage_client.get_volume(volume_id).data
+    attachments = ctx.core_client.list_volume_attachments(compartment_id=volume.compartment_id, volume_id=volume_id).data
+
+    return attached_instance(ctx, attachments)
+
+def database_dbsystem(ctx, summary):
+    database = ctx.database_client.get_database(summary.identifier).data
+
+    return ctx.database_client.get_db_system(database.db_system_id).data if database.db_system_id else None
+
+search_handlers = {
+    'Instance': (lambda ctx, summary: ctx.core_client.get_instance(summary.identifier).data, tag_instance),
+    'BootVolume': (lambda ctx, summary: boot_volume_instance(ctx, summary.identifier), tag_instance),
+    'Volume': (lambda ctx, summary: volume_instance(ctx, summary.identifier), tag_instance),
+    'BootVolumeBackup': (lambda ctx, summary: boot_volume_instance(ctx, ctx.blk_storage_client.get_boot_volume_backup(summary.identifier).data.boot_volume_id), tag_instance),
+    'VolumeBackup': (lambda ctx, summary: volume_instance(ctx, ctx.blk_storage_client.get_volume_backup(summary.identifier).data.volume_id), tag_instance),
+    'Bucket': (search_stub, tag_bucket),
+    'FileSystem': (lambda ctx, summary: ctx.fss_client.get_file_system(summary.identifier).data, tag_fss),
+    'LoadBalancer': (lambda ctx, summary: ctx.loadbalancer_client.get_load_balancer(summary.identifier).data, tag_loadbalancer),
+    'NetworkLoadBalancer': (lambda ctx, summary: ctx.networkloadbalancer_client.get_network_load_balancer(summary.identifier).data, tag_ntwloadbalancer),
+    'NetworkFirewall': (lambda ctx, summary: ctx.networkfw_client.get_network_firewall(summary.identifier).data, tag_networkfw),
+    'DbSystem': (lambda ctx, summary: ctx.database_client.get_db_system(summary.identifier).data, tag_dbsystem),
+    'AutonomousDatabase': (lambda ctx, summary: ctx.database_client.get_autonomous_database(summary.identifier).data, tag_autonomous),
+    'CloudExadataInfrastructure': (lambda ctx, summary: ctx.database_client.get_cloud_exadata_infrastructure(summary.identifier).data, tag_exa_infra),
+    'CloudAutonomousVmCluster': (lambda ctx, summary: ctx.database_client.get_cloud_autonomous_vm_cluster(summary.identifier).data, tag_auto_vm_cluster),
+    'CloudVmCluster': (lambda ctx, summary: ctx.database_client.get_cloud_vm_cluster(summary.identifier).data, tag_cloud_vm_cluster),
+    'Database': (database_dbsystem, tag_dbsystem),
+    'MysqlDbSystem': (search_stub, tag_mysql),
+    'NoSQLTable': (lambda ctx, summary: ctx.nosql_client.get_table(summary.identifier).data, tag_nosql),
+    'OpensearchCluster': (lambda ctx, summary: ctx.opensearch_client.get_opensearch_cluster(summary.identifier).data, tag_opensearch),
+    'AnalyticsInstance': (search_stub, tag_analytics),
+    'BigDataService': (lambda ctx, summary: ctx.bds_client.get_bds_instance(summary.identifier).data, tag_bigdata),
+    'DataCatalog': (lambda ctx, summary: ctx.data_catalog_client.get_catalog(summary.identifier).data, tag_datacatalog),
+    'DISWorkspace': (lambda ctx, summary: ctx.data_integration_client.get_workspace(summary.identifier).data, tag_dataintegration),
+    'FunctionsApplication': (lambda ctx, summary: ctx.function_client.get_application(summary.identifier).data, tag_function_app),
+    'FunctionsFunction': (lambda ctx, summary: ctx.function_client.get_application(ctx.function_client.get_function(summary.identifier).data.application_id).data, tag_function_app),
+    'ContainerInstance': (lambda ctx, summary: ctx.container_client.get_container_instance(summary.identifier).data, tag_container),
+    'ArtifactRepository': (lambda ctx, summary: ctx.artifact_client.get_repository(summary.identifier).data, tag_artifact),
+    'ServiceMeshMesh': (lambda ctx, summary: ctx.mesh_client.get_mesh(summary.identifier).data, tag_mesh),
+    'VisualBuilderInstance': (search_stub, tag_visual_builder),
+    }
+
+compartments_by_id = {compartment.id: compartment for compartment in my_compartments}
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# analyze one region through resource search
+# only resources missing the tag reach the taggers,
+# each parent once however many children were found.
+# children_only runs after a --since listing run: new
+# children of parents created before since are only
+# found this way, their parent is tagged inline
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def search_region(region, children_only=False):
+    ctx = client_registry.context(region)
+    handled = set()
+    run = (lambda handler, *args: handler(*args)) if children_only else dispatch
+
+    progress.status('{}: Searching untagged {}resources'.format(region.region_name, 'child ' if children_only else ''))
+
+    with profile_phase(f'{region.region_name}.search'):
+        untagged_resources = find_untagged_resources(
+                                                    ctx.search_client, 
+                                                    selected_families, 
+                                                    cmd.tag_namespace, 
+                                                    cmd.tag_key, 
+                                                    compartments_by_id, 
+                                                    custom_retry_strategy,
+                                                    since,
+                                                    children_only
+                                                    )
+
+        for summary in untagged_resources:
+            if summary.resource_type not in search_handlers:
+                continue
+
+            getter, handler = search_handlers[summary.resource_type]
+            compartment = compartments_by_id[summary.compartment_id]
+
+            # a result failing for any reason is reported, the search goes on
+            try:
+                resource = getter(ctx, summary)
+
+            except Exception as e:
+                resource_error(ctx, compartment, summary.resource_type, summary.display_name, summary.identifier,
+                               f'{e.code} {e.message}' if isinstance(e, oci.exceptions.ServiceError) else e)
+                continue
+
+            # parents of children may live outside the analyzed compartments
+            if resource is None or resource.id in handled or resource.compartment_id not in compartments_by_id:
+                continue
+
+            handled.add(resource.id)
+            run(handler, ctx, compartments_by_id[resource.compartment_id], resource)
+
+    if children_only:
+        return
+
+    progress.region_done(region.region_name)
+
+    if not pipeline:
+        reconcile_transitions(region.region_name)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# apply one plan entry
+# tags are read again and only the planned key is set
+# on them, so tag changes made since planning are kept;
+# conditional (if-match) updates retry on a concurrent
+# change. mysql and visual builder go through their
+# handler, which starts inactive instances around the
+# update
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+start_stop_handlers = {
+    'mysql': tag_mysql,
+    'visual_builder': tag_visual_builder,
+    }
+
+def apply_entry(entry, journal):
+    # start/stop handlers count their resource through apply_tag
+    if entry.get('service') not in start_stop_handlers:
+        progress.resource(tagging_status.format(entry.get('service'), entry.get('region'), str(entry.get('name'))[0:18]))
+
+    # an entry failing for any reason is reported and left out
+    # of the journal, the rest of the plan is applied
+    try:
+        response = apply_change(entry)
+
+    except Exception as e:
+        tagging_stats.count('failed')
+
+        if metrics:
+            metrics.resource(entry.get('region'), entry.get('service'), 'failed')
+
+        print_resource_error(entry.get('region'), entry.get('compartment'), entry.get('name'), entry.get('ocid'), e, progress.write)
+        record(entry.get('region'), None, entry.get('compartment'), entry.get('service'), entry.get('name'), entry.get('ocid'), 'failed', error=e)
+        return
+
+    if response != '':
+        journal.mark_done(entry['ocid'])
+
+def apply_change(entry):
+    ctx = client_registry.context(SimpleNamespace(region_name=entry['region']))
+    compartment = SimpleNamespace(id=entry['compartment_id'], name=entry['compartment'])
+
+    with profile_phase(f"{entry['region']}.apply"):
+        if entry['service'] in start_stop_handlers:
+            resource = SimpleNamespace(id=entry['ocid'], display_name=entry['name'])
+            return start_stop_handlers[entry['service']](ctx, compartment, resource)
+
+        else:
+            tagger = ctx.tagger(getattr(ctx, entry['client']))
+            tag_method = entry['tag_method']
+            start = time.monotonic()
+
+            try:
+                current_tags, etag = tagger.latest_tags(tag_method, *entry['tag_args'], entry['resource_id'])
+                defined_tags_dict = merge_tags(current_tags, entry['changes'])
+                response = getattr(tagger, tag_method)(*entry['tag_args'], entry['resource_id'], defined_tags_dict,
+                                                       current_tags=current_tags or {},
+                                                       etag=etag if tag_method in conditional_tag_methods else None)
+            except Exception as e:
+                tagging_stats.count('failed')
+                response = tagger.failed(f'{e.code} {e.message}' if isinstance(e, oci.exceptions.ServiceError) else e)
+
+            outcome = 'skipped' if response is None else 'failed' if response == '' else 'tagged'
+
+            if metrics:
+                metrics.resource(entry['region'], entry['service'], outcome)
+
+            record(entry['region'], None, entry['compartment'], entry['service'], entry['name'], entry['ocid'],
+                   outcome, time.monotonic() - start, tagger.last_error if response == '' else None)
+
+            if not cmd.quiet:
+                output_data = {
+                    'color': red if response == '' else black if response is None else green,
+                    'region': entry['region'],
+                    'region_ad': ' - ',
+                    'compartment': entry['compartment'],
+                    'service': entry['service'],
+                    'obj_name': entry['name']
+                    }
+                print_output(output_data, progress.write)
+
+            if state and response != '':
+                state.record(entry['ocid'], entry['service'], entry['region'], entry['new_value'], defined_tags_dict)
+
+            return response
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# apply a plan file, streamed with at most 4 pending
+# entries per worker, already applied entries skipped
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def apply_plan(plan_path):
+    journal = ApplyJournal(plan_path)
+    pending = set()
+
+    with ThreadPoolExecutor(max_workers=cmd.workers) as executor:
+        for entry in read_plan(plan_path, shard):
+            if journal.is_done(entry.get('ocid')):
+                tagging_stats.count('skipped')
+                continue
+
+            if len(pending) >= cmd.workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    future.result()
+
+            pending.add(executor.submit(apply_entry, entry, journal))
+
+        for future in as_completed(pending):
+            future.result()
+
+    journal.close()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# start analysis
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# Split the run into (region, compartment, service family) units
+# and spread them over a work stealing pool, or iterate over
+# regions, one worker per region when requested
+
+analyze = search_region if cmd.search else analyze_region
+scheduler = None
+
+# counts and eta redrawn 4 times per second on a terminal,
+# logged every 30 seconds otherwise
+if cmd.apply_file:
+    progress = Progress(0, 0, 0, total_resources=count_plan(cmd.apply_file, shard))
+else:
+    progress = Progress(len(analyzed_regions), len(my_compartments), len(selected_families))
+
+progress.start_renderer()
+
+# stdout is given back and the renderer stopped whatever
+# ends the run, Ctrl-C or an uncaught exception included
+try:
+    if cmd.apply_file:
+        apply_plan(cmd.apply_file)
+
+    elif pipeline:
+        if cmd.search:
+            pipeline.run(analyzed_regions, search_region)
+        else:
+            pipeline.run([(region, compartment, family) for region in analyzed_regions for compartment in my_compartments for family in selected_families], run_unit)
+
+    elif cmd.workers > 1 and not cmd.search:
+        scheduler = WorkStealingScheduler(cmd.workers)
+        scheduler.submit([(region, compartment, family) for region in analyzed_regions for compartment in my_compartments for family in selected_families])
+        scheduler.run(run_unit)
+
+    elif cmd.region_workers > 1 and len(analyzed_regions) > 1:
+        with ThreadPoolExecutor(max_workers=min(cmd.region_workers, len(analyzed_regions))) as executor:
+            for future in as_completed([executor.submit(analyze, region) for region in analyzed_regions]):
+                future.result()
+    else:
+        for region in analyzed_regions:
+            analyze(region)
+
+    # listing with --since only reaches children through new
+    # parents, new children of older parents are searched
+    if since is not None and not cmd.search and not cmd.apply_file:
+        for region in analyzed_regions:
+            search_region(region, children_only=True)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # reconcile lifecycle transitions left, from the work
+    # stealing scheduler, the pipeline or an apply
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    reconcile_transitions()
+
+    if orchestrator:
+        orchestrator.close()
+
+    if join_executor:
+        join_executor.shutdown()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # reconcile bulk tagging work requests
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    if bulk_tagger:
+        progress.status('Waiting for tagging work requests...')
+
+        for item, error in bulk_tagger.wait():
+            if error:
+                tagging_stats.count('failed')
+
+                if metrics:
+                    metrics.resource(item.region, item.service, 'failed')
+
+                print_resource_error(item.region, item.compartment, item.obj_name, item.ocid, error, progress.write)
+                record(item.region, None, item.compartment, item.service, item.obj_name, item.ocid, 'failed', error=error)
+                continue
+
+            tagging_stats.count('tagged')
+
+            if metrics:
+                metrics.resource(item.region, item.service, 'tagged')
+
+            record(item.region, None, item.compartment, item.service, item.obj_name, item.ocid, 'tagged')
+
+            if state:
+                state.record(item.ocid, item.service, item.region, item.tag_value, item.defined_tags)
+
+finally:
+    progress.finish()
 
 print(' '*60)
 analysis_end = datetime.now()
 execution_time = analysis_end - analysis_start
-print(f"Execution time: {strfdelta(execution_time)}\n")
\ No newline at end of file
+print(f"Execution time: {strfdelta(execution_time)}")
+print(f"Resources: {tagging_stats.summary()}")
+print(f"Progress: {progress.summary()}")
+
+if rate_limiter:
+    print(f"Rate limiter: {rate_limiter.summary()}")
+
+if orchestrator and orchestrator.cycles:
+    print(f"Start/stop: {orchestrator.summary()}")
+
+if waiter.completed or waiter.failed:
+    print(f"Lifecycle transitions: {waiter.summary()}")
+
+if search_stats.counts['returned']:
+    print(f"Search: {search_stats.summary()}")
+
+if bulk_tagger:
+    print(f"Bulk tagging: {bulk_tagger.work_requests} work requests, {bulk_tagger.direct_updates} resources of small groups updated directly")
+
+if plan_writer:
+    plan_writer.close()
+    print(f"Plan: {plan_writer.count} tag changes written to {cmd.plan_file}")
+
+# record watermarks of this run when nothing failed, so the
+# next --since run retries failed units and resources. tags
+# are not written while planning and apply does not discover
+run_failed = (
+    tagging_stats.counts['failed'] or tagging_stats.counts['errors']
+    or (scheduler and scheduler.failed) or (pipeline and pipeline.failed)
+    or (orchestrator and orchestrator.failed) or waiter.failed
+    )
+
+if store and not (cmd.plan_file or cmd.apply_file):
+    if run_failed:
+        print(f"Watermark: not updated, {watermark_scope} will be analyzed again from {since or 'the start'}")
+    else:
+        store.set_watermark(f'last_run:{watermark_scope}', run_start)
+
+        if since is None:
+            store.set_watermark(f'last_full_run:{watermark_scope}', run_start)
+
+if pipeline:
+    print(f"Pipeline: {pipeline.summary()}")
+
+if scheduler:
+    print(f"Work units: {scheduler.done} done, {scheduler.failed} failed, {scheduler.stolen} stolen, {scheduler.units_per_second():.2f} units/sec")
+
+if profiler:
+    print(f"Profile: {profiler.write()}")
+
+if metrics:
+    metrics.finish()
+    print(f"Metrics: written to {cmd.metrics_file}")
+
+if report:
+    report.close()
+    print(f"Report: {report.count} resources written to {cmd.report_file}")
+
+print()
\ No newline at end of file
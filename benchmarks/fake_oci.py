@@ -0,0 +1,739 @@
+# coding: utf-8
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# in-process fake OCI backend
+#
+# fake sdk clients serving a synthetic tenancy from memory,
+# with configurable latency, pagination, 429/5xx injection
+# and lifecycle transitions. requests go through
+# base_client.call_api and base_client.session.request like
+# the real sdk, so rate limiter, metrics, retry strategies,
+# oci.pagination and oci.wait_until work unchanged.
+#
+# install(backend) swaps the sdk client classes used by
+# ResourcesFinder, ResourcesTagger, the client registry
+# and modules/identity, and stubs config file auth
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+import re
+import copy
+import time
+import random
+import importlib
+import itertools
+import threading
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+from collections import defaultdict
+
+import oci
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# resources served by each fake client
+# (module, class): {sdk resource name: kind}
+# list_<plural>, get_<name>, update_<name>, start_/stop_
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+client_resources = {
+    ('oci.core', 'ComputeClient'): {'instance': 'instance', 'boot_volume_attachment': 'boot_volume_attachment', 'volume_attachment': 'volume_attachment'},
+    ('oci.core', 'BlockstorageClient'): {'boot_volume': 'bootvolume', 'volume': 'volume', 'boot_volume_backup': 'boot_backup', 'volume_backup': 'volume_backup'},
+    ('oci.file_storage', 'FileStorageClient'): {'file_system': 'fss'},
+    ('oci.load_balancer', 'LoadBalancerClient'): {'load_balancer': 'loadbalancer'},
+    ('oci.network_load_balancer', 'NetworkLoadBalancerClient'): {'network_load_balancer': 'ntwloadbalancer'},
+    ('oci.network_firewall', 'NetworkFirewallClient'): {'network_firewall': 'networkfw'},
+    ('oci.database', 'DatabaseClient'): {
+        'db_system': 'dbsystem',
+        'db_home': 'db_home',
+        'database': 'dbsys_db',
+        'autonomous_database': 'autonomous',
+        'cloud_exadata_infrastructure': 'exa_infra',
+        'cloud_autonomous_vm_cluster': 'auto_vm_cluster',
+        'cloud_vm_cluster': 'cloud_vm_cluster',
+        },
+    ('oci.mysql', 'DbSystemClient'): {'db_system': 'mysql'},
+    ('oci.nosql', 'NosqlClient'): {'table': 'nosql'},
+    ('oci.opensearch', 'OpensearchClusterClient'): {'opensearch_cluster': 'opensearch'},
+    ('oci.analytics', 'AnalyticsClient'): {'analytics_instance': 'analytics'},
+    ('oci.bds', 'BdsClient'): {'bds_instance': 'bigdata'},
+    ('oci.data_catalog', 'DataCatalogClient'): {'catalog': 'datacatalog'},
+    ('oci.data_integration', 'DataIntegrationClient'): {'workspace': 'dataintegration'},
+    ('oci.functions', 'FunctionsManagementClient'): {'application': 'function_app', 'function': 'function'},
+    ('oci.container_instances', 'ContainerInstanceClient'): {'container_instance': 'container'},
+    ('oci.artifacts', 'ArtifactsClient'): {'repository': 'artifact'},
+    ('oci.service_mesh', 'ServiceMeshClient'): {'mesh': 'mesh'},
+    ('oci.visual_builder', 'VbInstanceClient'): {'vb_instance': 'visual_builder'},
+    }
+
+plurals = {'repository': 'repositories', 'mesh': 'meshes'}
+
+# sort_by values accepted by the sdk list operations,
+# anything else raises ValueError client side like the sdk
+sort_by_values = {
+    'instance': ['TIMECREATED', 'DISPLAYNAME'],
+    'fss': ['TIMECREATED', 'DISPLAYNAME'],
+    'loadbalancer': ['TIMECREATED', 'DISPLAYNAME'],
+    'ntwloadbalancer': ['timeCreated', 'displayName'],
+    'networkfw': ['timeCreated', 'displayName'],
+    'dbsystem': ['TIMECREATED', 'DISPLAYNAME'],
+    'autonomous': ['TIMECREATED', 'DISPLAYNAME'],
+    'exa_infra': ['TIMECREATED', 'DISPLAYNAME'],
+    'mysql': ['displayName', 'timeCreated'],
+    'nosql': ['timeCreated', 'name'],
+    'opensearch': ['timeCreated', 'displayName'],
+    'analytics': ['capacityType', 'capacityValue', 'featureSet', 'lifecycleState', 'name', 'timeCreated'],
+    'bigdata': ['timeCreated', 'displayName'],
+    'datacatalog': ['TIMECREATED', 'DISPLAYNAME'],
+    'dataintegration': ['TIME_CREATED', 'DISPLAY_NAME', 'TIME_UPDATED'],
+    'function_app': ['timeCreated', 'id', 'displayName'],
+    'container': ['timeCreated', 'displayName'],
+    'artifact': ['TIMECREATED', 'DISPLAYNAME'],
+    'mesh': ['id', 'timeCreated'],
+    'visual_builder': ['timeCreated', 'displayName'],
+    }
+
+# lifecycle state of a new resource of each kind
+default_states = {
+    'instance': 'RUNNING',
+    'boot_volume_attachment': 'ATTACHED',
+    'volume_attachment': 'ATTACHED',
+    'bootvolume': 'AVAILABLE',
+    'volume': 'AVAILABLE',
+    'boot_backup': 'AVAILABLE',
+    'volume_backup': 'AVAILABLE',
+    'dbsystem': 'AVAILABLE',
+    'db_home': 'AVAILABLE',
+    'dbsys_db': 'AVAILABLE',
+    'autonomous': 'AVAILABLE',
+    'exa_infra': 'AVAILABLE',
+    'auto_vm_cluster': 'AVAILABLE',
+    'cloud_vm_cluster': 'AVAILABLE',
+    'artifact': 'AVAILABLE',
+    'bucket': None,
+    }
+
+# resource search type -> kind
+search_kinds = {
+    'Instance': 'instance',
+    'BootVolume': 'bootvolume',
+    'Volume': 'volume',
+    'BootVolumeBackup': 'boot_backup',
+    'VolumeBackup': 'volume_backup',
+    'Bucket': 'bucket',
+    'FileSystem': 'fss',
+    'LoadBalancer': 'loadbalancer',
+    'NetworkLoadBalancer': 'ntwloadbalancer',
+    'NetworkFirewall': 'networkfw',
+    'DbSystem': 'dbsystem',
+    'AutonomousDatabase': 'autonomous',
+    'CloudExadataInfrastructure': 'exa_infra',
+    'CloudAutonomousVmCluster': 'auto_vm_cluster',
+    'CloudVmCluster': 'cloud_vm_cluster',
+    'Database': 'dbsys_db',
+    'MysqlDbSystem': 'mysql',
+    'NoSQLTable': 'nosql',
+    'OpensearchCluster': 'opensearch',
+    'AnalyticsInstance': 'analytics',
+    'BigDataService': 'bigdata',
+    'DataCatalog': 'datacatalog',
+    'DISWorkspace': 'dataintegration',
+    'FunctionsApplication': 'function_app',
+    'FunctionsFunction': 'function',
+    'ContainerInstance': 'container',
+    'ArtifactRepository': 'artifact',
+    'ServiceMeshMesh': 'mesh',
+    'VisualBuilderInstance': 'visual_builder',
+    }
+
+# kinds whose update goes through UPDATING before ACTIVE
+updating_kinds = ['ntwloadbalancer', 'visual_builder']
+
+# kinds that are not tagged themselves
+untagged_kinds = ['boot_volume_attachment', 'volume_attachment', 'db_home']
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# synthetic tenancy, resources indexed by id and by
+# (region, kind)
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class FakeTenancy:
+
+    def __init__(self, regions=('eu-paris-1',), ads=3, tag_namespace='FakeTags', tag_key='display_name', name='fake-tenancy'):
+        self.id = 'ocid1.tenancy.oc1..fake'
+        self.name = name
+        self.regions = list(regions)
+        self.ads = ads
+        self.tag_namespace = tag_namespace
+        self.tag_key = tag_key
+        self.namespace_name = 'fakenamespace'
+        self.sequence = itertools.count(1)
+        self.resources = {}
+        self.by_kind = defaultdict(list)
+        self.created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        self.root = SimpleNamespace(id=self.id, name=name, compartment_id=None, lifecycle_state='ACTIVE', description='root')
+        self.compartments = [self.root]
+
+    def ad_names(self, region):
+        return [f'FAKE:{region.upper()}-AD-{index + 1}' for index in range(self.ads)]
+
+    def add_compartment(self, name, parent_id=None):
+        compartment = SimpleNamespace(
+                                    id=f'ocid1.compartment.oc1..{next(self.sequence):010d}',
+                                    name=name,
+                                    compartment_id=parent_id or self.id,
+                                    lifecycle_state='ACTIVE',
+                                    description=name
+                                    )
+        self.compartments.append(compartment)
+
+        return compartment
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # add a resource, tag_value sets the tag as an earlier
+    # run would have (display name of the resource or of
+    # its parent instance / db system)
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def add(self, region, kind, compartment_id, display_name=None, tag_value=None, **attributes):
+        number = next(self.sequence)
+        display_name = display_name or f'{kind}-{number}'
+
+        resource = SimpleNamespace(
+                                kind=kind,
+                                region=region,
+                                id=f'ocid1.{kind}.oc1.{region}.{number:010d}',
+                                display_name=display_name,
+                                name=display_name,
+                                db_name=display_name,
+                                compartment_id=compartment_id,
+                                availability_domain=self.ad_names(region)[number % self.ads] if self.ads else None,
+                                lifecycle_state=default_states.get(kind, 'ACTIVE'),
+                                defined_tags={},
+                                freeform_tags={},
+                                time_created=self.created + timedelta(seconds=number),
+                                namespace=self.namespace_name,
+                                version=0,
+                                transition=None
+                                )
+
+        resource.etag = f'{resource.id}-0'
+        self.tag(resource, tag_value)
+
+        for name, value in attributes.items():
+            setattr(resource, name, value)
+
+        self.resources[resource.id] = resource
+        self.by_kind[(region, kind)].append(resource)
+
+        return resource
+
+    def tag(self, resource, tag_value):
+        resource.defined_tags = {self.tag_namespace: {self.tag_key: tag_value}} if tag_value is not None else {}
+
+    def taggable(self):
+        return [resource for resource in self.resources.values() if resource.kind not in untagged_kinds]
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# fake backend: latency, faults, call log and the
+# operations on the tenancy
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class FakeBackend:
+
+    def __init__(self, tenancy, latency=0.02, jitter=0.5, page_size=100, throttle_rate=0.0, error_rate=0.0, transition_seconds=2.0, seed=0):
+        self.tenancy = tenancy
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.transition_seconds = transition_seconds
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = []
+        self.updated = set()
+        self.work_requests = {}
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # one http attempt: sleep, maybe fail, log
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def http(self, operation):
+        with self.lock:
+            draw = self.random.random()
+            latency = self.latency * (1 + self.jitter * (2 * self.random.random() - 1))
+
+        status = 429 if draw < self.throttle_rate else 500 if draw < self.throttle_rate + self.error_rate else 200
+        time.sleep(max(0.0, latency))
+
+        with self.lock:
+            self.calls.append((operation, latency, status))
+
+        return status
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # resource snapshot, pending transitions applied
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def refresh(self, resource):
+        if resource.transition and time.monotonic() >= resource.transition[0]:
+            resource.lifecycle_state = resource.transition[1]
+            resource.transition = None
+
+    def snapshot(self, resource, tags=True):
+        self.refresh(resource)
+        data = copy.copy(resource)
+        data.defined_tags = copy.deepcopy(resource.defined_tags) if tags else None
+
+        return data
+
+    def find(self, resource_id, kind=None):
+        resource = self.tenancy.resources.get(resource_id)
+
+        if resource is None or (kind and resource.kind != kind):
+            raise oci.exceptions.ServiceError(404, 'NotAuthorizedOrNotFound', {}, f'{resource_id} not found')
+
+        return resource
+
+    def transition(self, resource, state, final_state):
+        resource.lifecycle_state = state
+        resource.transition = (time.monotonic() + self.transition_seconds, final_state)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # paginated list: filters are resource attributes,
+    # page is the offset of the next item
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def list(self, region, kind, filters, page=None, limit=None, sort_order=None, tags=True):
+        items = [resource for resource in self.tenancy.by_kind[(region, kind)] if all(getattr(resource, name, None) == value for name, value in filters.items())]
+
+        if sort_order == 'DESC':
+            items = items[::-1]
+
+        offset = int(page or 0)
+        limit = min(limit or self.page_size, self.page_size)
+
+        with self.lock:
+            data = [self.snapshot(resource, tags) for resource in items[offset:offset + limit]]
+
+        next_page = str(offset + limit) if offset + limit < len(items) else None
+
+        return data, next_page
+
+    def update(self, resource, details, if_match=None):
+        with self.lock:
+            if if_match is not None and if_match != resource.etag:
+                raise oci.exceptions.ServiceError(412, 'PreconditionFailed', {}, 'etag mismatch')
+
+            resource.defined_tags = copy.deepcopy(details.defined_tags)
+            resource.version += 1
+            resource.etag = f'{resource.id}-{resource.version}'
+            self.updated.add(resource.id)
+
+            if resource.kind in updating_kinds:
+                self.transition(resource, 'UPDATING', resource.lifecycle_state)
+
+            return self.snapshot(resource)
+
+    def start(self, resource):
+        with self.lock:
+            self.transition(resource, 'UPDATING', 'ACTIVE')
+
+    def stop(self, resource):
+        with self.lock:
+            self.transition(resource, 'UPDATING', 'INACTIVE')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # bulk edit tags: applied at once, work request
+    # succeeds after transition_seconds
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def bulk_edit(self, details):
+        with self.lock:
+            work_request_id = f'ocid1.taggingworkrequest.oc1..{len(self.work_requests) + 1:010d}'
+            self.work_requests[work_request_id] = time.monotonic() + self.transition_seconds
+
+        for item in details.resources:
+            resource = self.find(item.id)
+
+            with self.lock:
+                for operation in details.bulk_edit_operations:
+                    for namespace, keys in operation.defined_tags.items():
+                        resource.defined_tags.setdefault(namespace, {}).update(keys)
+
+                resource.version += 1
+                resource.etag = f'{resource.id}-{resource.version}'
+                self.updated.add(resource.id)
+
+        return work_request_id
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # run statistics
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def stats(self):
+        with self.lock:
+            calls = list(self.calls)
+
+        latencies = sorted(latency for _, latency, _ in calls)
+
+        def percentile(value):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(value * len(latencies)))]
+
+        return {
+            'calls': len(calls),
+            'throttled': sum(1 for _, _, status in calls if status == 429),
+            'errors': sum(1 for _, _, status in calls if status >= 500),
+            'p50_latency': percentile(0.50),
+            'p95_latency': percentile(0.95),
+            'updated': len(self.updated),
+            }
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# fake sdk plumbing: session.request and call_api, as
+# wrapped by the rate limiter and run metrics
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class FakeSession:
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def request(self, method, url, *args, **kwargs):
+        return SimpleNamespace(status_code=self.backend.http(url.rsplit('/', 1)[-1]))
+
+class FakeBaseClient:
+
+    def __init__(self, backend, service, region):
+        self.backend = backend
+        self.endpoint = f'https://{service}.{region}.oci.fake'
+        self.session = FakeSession(backend)
+
+    def call_api(self, resource_path, method, operation_name=None, **kwargs):
+        status = self.session.request(method, self.endpoint + resource_path).status_code
+
+        if status >= 400:
+            code = 'TooManyRequests' if status == 429 else 'InternalServerError'
+            raise oci.exceptions.ServiceError(status, code, {}, f'injected {status} on {operation_name}')
+
+        return status
+
+    # used by oci.wait_until to fetch the resource again
+    def request(self, request):
+        return request.client.invoke(request.operation, request.method, request.handler, request.args, request.kwargs)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# fake client base: list_/get_/update_/start_/stop_
+# of its resources, anything else is an AttributeError
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+backend = None
+
+class FakeClient:
+
+    resource_kinds = {}
+    service = 'fake'
+
+    def __init__(self, config=None, signer=None, **kwargs):
+        self.backend = backend
+        self.region = (config or {}).get('region') or backend.tenancy.regions[0]
+        self.base_client = FakeBaseClient(backend, self.service, self.region)
+
+    def invoke(self, operation, method, handler, args, kwargs):
+        kwargs = dict(kwargs)
+        retry_strategy = kwargs.pop('retry_strategy', None)
+
+        def call():
+            self.base_client.call_api(f'/{operation}', method, operation_name=operation)
+            data, headers = handler(*args, **kwargs)
+            request = SimpleNamespace(client=self, operation=operation, method=method, handler=handler, args=args, kwargs=kwargs)
+
+            return oci.response.Response(200, headers, data, request)
+
+        # like the sdk, the default retry strategy applies when none is given
+        retry_strategy = retry_strategy or oci.retry.DEFAULT_RETRY_STRATEGY
+
+        return retry_strategy.make_retrying_call(call)
+
+    def __getattr__(self, name):
+        verb, _, resource_name = name.partition('_')
+        singular = {plurals.get(singular, singular + 's'): singular for singular in self.resource_kinds}
+
+        if verb == 'list' and resource_name in singular:
+            kind = self.resource_kinds[singular[resource_name]]
+            handler = self.list_handler(kind)
+        elif verb in ('get', 'update', 'start', 'stop') and resource_name in self.resource_kinds:
+            handler = getattr(self, f'{verb}_handler')(self.resource_kinds[resource_name])
+        else:
+            raise AttributeError(name)
+
+        method = {'list': 'GET', 'get': 'GET', 'update': 'PUT'}.get(verb, 'POST')
+
+        def operation(*args, **kwargs):
+            sort_by = kwargs.get('sort_by')
+
+            if verb == 'list' and sort_by is not None and sort_by not in sort_by_values.get(kind, []):
+                raise ValueError(f"Invalid value for `sort_by`, must be one of {sort_by_values.get(kind, [])}")
+
+            return self.invoke(name, method, handler, args, kwargs)
+
+        return operation
+
+    def list_handler(self, kind):
+        def handler(*args, page=None, limit=None, sort_by=None, sort_order=None, lifecycle_state=None, **filters):
+            filters = {name: value for name, value in filters.items() if value is not None}
+
+            if lifecycle_state:
+                filters['lifecycle_state'] = lifecycle_state
+
+            data, next_page = self.backend.list(self.region, kind, filters, page, limit, sort_order)
+            return data, {'opc-next-page': next_page} if next_page else {}
+
+        return handler
+
+    def get_handler(self, kind):
+        def handler(resource_id, **kwargs):
+            with self.backend.lock:
+                data = self.backend.snapshot(self.backend.find(resource_id, kind))
+            return data, {'etag': data.etag}
+
+        return handler
+
+    # update_x(id, details) and update_load_balancer(details, id)
+    def update_handler(self, kind):
+        def handler(*args, if_match=None, **kwargs):
+            resource_id = next(arg for arg in args if isinstance(arg, str) and arg in self.backend.tenancy.resources)
+            details = next(arg for arg in args if hasattr(arg, 'defined_tags'))
+            data = self.backend.update(self.backend.find(resource_id, kind), details, if_match)
+            return data, {'etag': data.etag}
+
+        return handler
+
+    def start_handler(self, kind):
+        def handler(resource_id, *args, **kwargs):
+            self.backend.start(self.backend.find(resource_id, kind))
+            return None, {}
+
+        return handler
+
+    def stop_handler(self, kind):
+        def handler(resource_id, *args, **kwargs):
+            self.backend.stop(self.backend.find(resource_id, kind))
+            return None, {}
+
+        return handler
+
+    def call(self, operation, method, handler, args, kwargs):
+        return self.invoke(operation, method, handler, args, kwargs)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# identity: tenancy, compartments, regions, ADs, tags
+# and bulk edit tags
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class FakeIdentityClient(FakeClient):
+
+    service = 'identity'
+
+    def get_tenancy(self, tenancy_id, **kwargs):
+        tenancy = self.backend.tenancy
+        return self.call('get_tenancy', 'GET', lambda: (SimpleNamespace(id=tenancy.id, name=tenancy.name, home_region_key='FAKE'), {}), (), kwargs)
+
+    def get_compartment(self, compartment_id, **kwargs):
+        def handler():
+            for compartment in self.backend.tenancy.compartments:
+                if compartment.id == compartment_id:
+                    return compartment, {}
+            raise oci.exceptions.ServiceError(404, 'NotAuthorizedOrNotFound', {}, f'{compartment_id} not found')
+
+        return self.call('get_compartment', 'GET', handler, (), kwargs)
+
+    def list_compartments(self, compartment_id, **kwargs):
+        def handler(page=None, limit=None, compartment_id_in_subtree=False, access_level=None):
+            compartments = self.backend.tenancy.compartments[1:]
+
+            if not compartment_id_in_subtree:
+                compartments = [compartment for compartment in compartments if compartment.compartment_id == compartment_id]
+
+            offset = int(page or 0)
+            size = min(limit or self.backend.page_size, self.backend.page_size)
+            next_page = str(offset + size) if offset + size < len(compartments) else None
+
+            return compartments[offset:offset + size], {'opc-next-page': next_page} if next_page else {}
+
+        return self.call('list_compartments', 'GET', handler, (), kwargs)
+
+    def list_region_subscriptions(self, tenancy_id, **kwargs):
+        regions = [
+            SimpleNamespace(region_name=name, region_key=name[:3].upper(), is_home_region=index == 0, status='READY')
+            for index, name in enumerate(self.backend.tenancy.regions)
+            ]
+        return self.call('list_region_subscriptions', 'GET', lambda: (regions, {}), (), kwargs)
+
+    def list_availability_domains(self, compartment_id, **kwargs):
+        ads = [SimpleNamespace(name=name) for name in self.backend.tenancy.ad_names(self.region)]
+        return self.call('list_availability_domains', 'GET', lambda: (ads, {}), (), kwargs)
+
+    def get_tag_namespace(self, tag_namespace_id, **kwargs):
+        namespace = SimpleNamespace(id=tag_namespace_id, name=self.backend.tenancy.tag_namespace, is_retired=False, lifecycle_state='ACTIVE')
+        return self.call('get_tag_namespace', 'GET', lambda: (namespace, {}), (), kwargs)
+
+    def list_tags(self, tag_namespace_id, **kwargs):
+        tags = [SimpleNamespace(name=self.backend.tenancy.tag_key, is_retired=False, lifecycle_state='ACTIVE')]
+        return self.call('list_tags', 'GET', lambda: (tags, {}), (), kwargs)
+
+    def get_tag(self, tag_namespace_id, tag_name, **kwargs):
+        tag = SimpleNamespace(name=tag_name, validator=None, is_retired=False, lifecycle_state='ACTIVE')
+        return self.call('get_tag', 'GET', lambda: (tag, {}), (), kwargs)
+
+    def list_bulk_editable_resource_types(self, **kwargs):
+        def handler(page=None, limit=None):
+            return [SimpleNamespace(resource_type=resource_type) for resource_type in search_kinds], {}
+
+        return self.call('list_bulk_editable_resource_types', 'GET', handler, (), kwargs)
+
+    def bulk_edit_tags(self, bulk_edit_tags_details=None, **kwargs):
+        def handler():
+            return None, {'opc-work-request-id': self.backend.bulk_edit(bulk_edit_tags_details)}
+
+        return self.call('bulk_edit_tags', 'POST', handler, (), kwargs)
+
+    def get_tagging_work_request(self, work_request_id, **kwargs):
+        def handler():
+            done = time.monotonic() >= self.backend.work_requests[work_request_id]
+            return SimpleNamespace(id=work_request_id, status='SUCCEEDED' if done else 'IN_PROGRESS'), {}
+
+        return self.call('get_tagging_work_request', 'GET', handler, (), kwargs)
+
+    def list_tagging_work_request_errors(self, work_request_id, **kwargs):
+        return self.call('list_tagging_work_request_errors', 'GET', lambda page=None, limit=None: ([], {}), (), kwargs)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# resource search: compartments, tag namespaces and
+# structured queries on resource types
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class FakeResourceSearchClient(FakeClient):
+
+    service = 'query'
+
+    def search_resources(self, search_details, **kwargs):
+        def handler(page=None, limit=None):
+            tenancy = self.backend.tenancy
+            query = search_details.query
+
+            if query.startswith('query tagnamespace'):
+                items = [SimpleNamespace(display_name=tenancy.tag_namespace, identifier='ocid1.tagnamespace.oc1..fake')]
+
+            elif query.startswith('query compartment'):
+                items = [
+                    SimpleNamespace(display_name=compartment.name, identifier=compartment.id, compartment_id=compartment.compartment_id)
+                    for compartment in tenancy.compartments[1:]
+                    ]
+
+            else:
+                resource_types = [name.strip() for name in query[len('query '):].split(' resources')[0].split(',')]
+                since = query.split("timeCreated >= '")[1][:20] if 'timeCreated >=' in query else None
+                excluded_states = re.findall(r"lifecycleState != '(\w+)'", query)
+
+                items = [
+                    SimpleNamespace(
+                                    resource_type=resource_type,
+                                    identifier=resource.id,
+                                    display_name=resource.display_name,
+                                    compartment_id=resource.compartment_id,
+                                    lifecycle_state=resource.lifecycle_state,
+                                    defined_tags=copy.deepcopy(resource.defined_tags),
+                                    time_created=resource.time_created
+                                    )
+                    for resource_type in resource_types
+                    for resource in tenancy.by_kind[(self.region, search_kinds[resource_type])]
+                    if since is None or resource.time_created.strftime('%Y-%m-%dT%H:%M:%SZ') >= since
+                    if resource.lifecycle_state not in excluded_states
+                    ]
+
+            offset = int(page or 0)
+            size = min(limit or self.backend.page_size, 1000)
+            next_page = str(offset + size) if offset + size < len(items) else None
+
+            return items[offset:offset + size], {'opc-next-page': next_page} if next_page else {}
+
+        return self.call('search_resources', 'POST', handler, (), kwargs)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# object storage: buckets are addressed by name, tags
+# are listed only with fields=['tags']
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class FakeObjectStorageClient(FakeClient):
+
+    service = 'objectstorage'
+
+    def get_namespace(self, **kwargs):
+        return self.call('get_namespace', 'GET', lambda: (self.backend.tenancy.namespace_name, {}), (), kwargs)
+
+    def bucket(self, bucket_name):
+        for resource in self.backend.tenancy.by_kind[(self.region, 'bucket')]:
+            if resource.name == bucket_name:
+                return resource
+
+        raise oci.exceptions.ServiceError(404, 'BucketNotFound', {}, f'{bucket_name} not found')
+
+    def list_buckets(self, namespace_name, compartment_id, **kwargs):
+        def handler(page=None, limit=None, fields=None):
+            data, next_page = self.backend.list(self.region, 'bucket', {'compartment_id': compartment_id}, page, limit, tags='tags' in (fields or []))
+            return data, {'opc-next-page': next_page} if next_page else {}
+
+        return self.call('list_buckets', 'GET', handler, (), kwargs)
+
+    def get_bucket(self, namespace_name, bucket_name, **kwargs):
+        def handler():
+            with self.backend.lock:
+                data = self.backend.snapshot(self.bucket(bucket_name))
+            return data, {'etag': data.etag}
+
+        return self.call('get_bucket', 'GET', handler, (), kwargs)
+
+    def update_bucket(self, namespace_name, bucket_name, update_bucket_details, **kwargs):
+        def handler(if_match=None):
+            data = self.backend.update(self.bucket(bucket_name), update_bucket_details, if_match)
+            return data, {'etag': data.etag}
+
+        return self.call('update_bucket', 'POST', handler, (), kwargs)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# swap the sdk clients for fakes serving fake_backend
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class FakeSigner:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+def install(fake_backend):
+    global backend
+    backend = fake_backend
+
+    fake_classes = {
+        ('oci.identity', 'IdentityClient'): FakeIdentityClient,
+        ('oci.resource_search', 'ResourceSearchClient'): FakeResourceSearchClient,
+        ('oci.object_storage', 'ObjectStorageClient'): FakeObjectStorageClient,
+        }
+
+    for (module_name, class_name), resource_kinds in client_resources.items():
+        fake_classes[(module_name, class_name)] = type(class_name, (FakeClient,), {
+            'resource_kinds': resource_kinds,
+            'service': module_name.split('.')[-1],
+            })
+
+    # fakes keep the sdk class name, client_name() relies on it
+    for (module_name, class_name), fake_class in fake_classes.items():
+        setattr(importlib.import_module(module_name), class_name, type(class_name, (fake_class,), {}))
+
+    # config file authentication without a config file
+    config = {'tenancy': fake_backend.tenancy.id, 'user': 'ocid1.user.oc1..fake', 'fingerprint': 'fake', 'key_file': None, 'region': fake_backend.tenancy.regions[0]}
+    oci.config.from_file = lambda *args, **kwargs: dict(config)
+    oci.config.validate_config = lambda *args, **kwargs: None
+    oci.signer.Signer = FakeSigner
@@ -0,0 +1,133 @@
+# coding: utf-8
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# import time benchmark
+#
+# measures with python -X importtime how long the oci sdk
+# and the script modules take to import, for the full sdk
+# and for the lazy imports used by OCI-TagByName.py.
+# both runs import the same code, the selected families
+# included; the full run forces the sdk to load every
+# service package eagerly (OCI_PYTHON_SDK_LAZY_IMPORTS_DISABLED),
+# as sdk versions with lazy imports would otherwise defer
+# them and hide the cost
+#
+# usage:
+#   python3 benchmarks/import_time.py
+#   python3 benchmarks/import_time.py -f compute storage -b 800
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+import os
+import sys
+import argparse
+import subprocess
+
+repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repo_path)
+
+families = ['compute', 'storage', 'network', 'database', 'analytics', 'development']
+
+script_modules = [
+    'modules.identity',
+    'modules.resources',
+    'modules.tagging',
+    'modules.scheduler',
+    'modules.discovery',
+    'modules.state',
+    'modules.clients',
+    ]
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# get command line arguments
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('-f', '--families', nargs='+', default=families, choices=families, dest='families',
+                        help='service families imported by the lazy run, default: all')
+    parser.add_argument('-b', '--budget', type=float, default=0, dest='budget',
+                        help='fail when the lazy import time exceeds BUDGET milliseconds, default: no budget')
+    parser.add_argument('-t', '--top', type=int, default=10, dest='top',
+                        help='number of slowest packages to print, default: 10')
+    parser.add_argument('-r', '--repeat', type=int, default=3, dest='repeat',
+                        help='runs per scenario, best run is kept, default: 3')
+
+    return parser.parse_args()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# run code in a fresh interpreter with -X importtime
+# return total import time (ms) and cumulative time
+# per top-level package (ms)
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+sdk_variables = ['OCI_PYTHON_SDK_NO_SERVICE_IMPORTS', 'OCI_PYTHON_SDK_LAZY_IMPORTS_DISABLED']
+
+def measure(code, lazy):
+    env = {name: value for name, value in os.environ.items() if name not in sdk_variables}
+
+    if lazy:
+        env['OCI_PYTHON_SDK_NO_SERVICE_IMPORTS'] = 'true'
+    else:
+        env['OCI_PYTHON_SDK_LAZY_IMPORTS_DISABLED'] = 'true'
+
+    result = subprocess.run(
+                            [sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=repo_path, env=env, capture_output=True, text=True
+                            )
+
+    if result.returncode != 0:
+        raise SystemExit(result.stderr.strip().splitlines()[-1])
+
+    total = 0
+    packages = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        total += int(self_us)
+
+        # top-level entries are not indented
+        if not name.startswith('  ', 1):
+            packages[name.strip()] = int(cumulative_us) / 1000
+
+    return total / 1000, packages
+
+def best_of(code, lazy, repeat):
+    return min((measure(code, lazy) for _ in range(repeat)), key=lambda run: run[0])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# run benchmark
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+cmd = parse_arguments()
+
+code = 'import oci; ' + '; '.join(f'import {module}' for module in script_modules)
+code += f'; from modules.clients import import_families; import_families({cmd.families!r})'
+
+scenarios = [
+    ('full sdk (eager)', code, False),
+    ('lazy (' + ', '.join(cmd.families) + ')', code, True),
+    ]
+
+results = []
+
+for name, code, lazy in scenarios:
+    total, packages = best_of(code, lazy, cmd.repeat)
+    results.append((name, total, packages))
+
+    print(f"\n{name}: {total:.0f} ms")
+    for package, cumulative in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:cmd.top]:
+        print(f"   {package:40} {cumulative:10.1f} ms")
+
+full_total, lazy_total = results[0][1], results[1][1]
+print(f"\nstartup saved: {full_total - lazy_total:.0f} ms ({(1 - lazy_total / full_total) * 100:.0f}%)")
+
+if cmd.budget:
+    status = 'OK' if lazy_total <= cmd.budget else 'OVER BUDGET'
+    print(f"budget: {lazy_total:.0f} / {cmd.budget:.0f} ms {status}")
+
+    if lazy_total > cmd.budget:
+        raise SystemExit(1)
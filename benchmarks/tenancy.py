@@ -0,0 +1,276 @@
+# coding: utf-8
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# synthetic tenancy generator
+#
+# builds seeded FakeTenancy objects of a given shape for
+# the fake oci backend: compartment tree (depth, fan-out),
+# regions, ADs, instances per compartment with volumes and
+# backups, db homes, exadata infrastructures with their
+# vm clusters, buckets, other services, the fraction of
+# MySQL / Visual Builder instances left inactive, the
+# fraction of resources already tagged and the fraction
+# of tagged parents whose children are left untagged.
+# the same seed and shape always give the same tenancy
+#
+# usage:
+#   python3 benchmarks/tenancy.py --depth 3 --fan-out 4 -i 20
+#   python3 benchmarks/tenancy.py --resources 10 1000 100000
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+import os
+import sys
+import random
+import argparse
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_oci import FakeTenancy, untagged_kinds
+
+# other services, services=N adds N of each per
+# compartment and region
+service_kinds = [
+    'fss', 'loadbalancer', 'ntwloadbalancer', 'networkfw',
+    'autonomous', 'mysql', 'nosql', 'opensearch',
+    'analytics', 'bigdata', 'datacatalog', 'dataintegration',
+    'container', 'artifact', 'mesh', 'visual_builder',
+    ]
+
+# started to be tagged when inactive
+inactive_kinds = ['mysql', 'visual_builder']
+
+# vm clusters of each exadata infrastructure
+vm_cluster_kinds = ['auto_vm_cluster', 'cloud_vm_cluster']
+
+# tagged with the display name of their parent
+child_kinds = ['bootvolume', 'boot_backup', 'volume', 'volume_backup', 'dbsys_db', 'function']
+
+default_shape = {
+    'depth': 2,
+    'fan_out': 3,
+    'regions': 2,
+    'ads': 3,
+    'instances': 5,
+    'volumes': 1,
+    'backups': 1,
+    'db_homes': 1,
+    'exa_infras': 0,
+    'vm_clusters': 1,
+    'buckets': 2,
+    'services': 1,
+    'inactive': 0.0,
+    'tagged': 0.0,
+    'untagged_children': 0.0,
+    }
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# resource counts of a shape
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def compartment_count(shape):
+    return sum(shape['fan_out'] ** level for level in range(1, shape['depth'] + 1))
+
+def instance_resources(shape):
+    # instance, boot volume and its backups, volumes and their backups
+    return 2 + shape['backups'] + shape['volumes'] * (1 + shape['backups'])
+
+def fixed_resources(shape):
+    # buckets, db system and one database per db home, exadata infrastructures and
+    # their vm clusters of each kind, services and one function per application
+    return (
+        shape['buckets'] + (1 + shape['db_homes'] if shape['db_homes'] else 0)
+        + shape['exa_infras'] * (1 + len(vm_cluster_kinds) * shape['vm_clusters'])
+        + shape['services'] * (len(service_kinds) + 2)
+        )
+
+def resource_count(shape):
+    return compartment_count(shape) * shape['regions'] * (shape['instances'] * instance_resources(shape) + fixed_resources(shape))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# shape with instances per compartment set to reach
+# about resources taggable resources; small targets
+# also shrink the tree and drop the other services
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def shape_for(resources, **shape):
+    shape = {**default_shape, **shape}
+
+    while shape['depth'] > 1 and resource_count({**shape, 'instances': 0}) > resources:
+        shape['depth'] -= 1
+
+    if resource_count({**shape, 'instances': 0}) > resources:
+        shape.update(fan_out=1, regions=1, services=0, db_homes=0, exa_infras=0, buckets=min(shape['buckets'], 1))
+
+    per_compartment = resources / (compartment_count(shape) * shape['regions'])
+    shape['instances'] = max(0, round((per_compartment - fixed_resources(shape)) / instance_resources(shape)))
+
+    return shape
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# generate a tenancy
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def generate(seed=0, **shape):
+    shape = {**default_shape, **shape}
+    rng = random.Random(seed)
+    tenancy = FakeTenancy(regions=[f'fake-region-{index + 1}' for index in range(shape['regions'])], ads=shape['ads'])
+
+    def tag_value(name):
+        return name if rng.random() < shape['tagged'] else None
+
+    # children of a tagged parent, untagged for a fraction
+    def child_value(value):
+        if value is not None and shape['untagged_children'] and rng.random() < shape['untagged_children']:
+            return None
+
+        return value
+
+    # compartment tree, breadth first
+    parents = [tenancy.root]
+
+    for level in range(1, shape['depth'] + 1):
+        parents = [
+            tenancy.add_compartment(f'{parent.name}-{index + 1}' if level > 1 else f'compartment-{index + 1}', parent.id)
+            for parent in parents
+            for index in range(shape['fan_out'])
+            ]
+
+    for compartment in tenancy.compartments[1:]:
+        for region in tenancy.regions:
+            ads = tenancy.ad_names(region)
+
+            for _ in range(shape['instances']):
+                ad = rng.choice(ads)
+                instance = tenancy.add(region, 'instance', compartment.id, availability_domain=ad)
+                value = tag_value(instance.display_name)
+                tenancy.tag(instance, value)
+                value = child_value(value)
+
+                boot_volume = tenancy.add(region, 'bootvolume', compartment.id, tag_value=value, availability_domain=ad)
+                tenancy.add(region, 'boot_volume_attachment', compartment.id, availability_domain=ad,
+                            instance_id=instance.id, boot_volume_id=boot_volume.id)
+
+                for _ in range(shape['backups']):
+                    tenancy.add(region, 'boot_backup', compartment.id, tag_value=value, boot_volume_id=boot_volume.id)
+
+                for _ in range(shape['volumes']):
+                    volume = tenancy.add(region, 'volume', compartment.id, tag_value=value, availability_domain=ad)
+                    tenancy.add(region, 'volume_attachment', compartment.id, availability_domain=ad,
+                                instance_id=instance.id, volume_id=volume.id)
+
+                    for _ in range(shape['backups']):
+                        tenancy.add(region, 'volume_backup', compartment.id, tag_value=value, volume_id=volume.id)
+
+            for _ in range(shape['buckets']):
+                bucket = tenancy.add(region, 'bucket', compartment.id)
+                tenancy.tag(bucket, tag_value(bucket.name))
+
+            if shape['db_homes']:
+                dbsystem = tenancy.add(region, 'dbsystem', compartment.id, availability_domain=rng.choice(ads))
+                value = tag_value(dbsystem.display_name)
+                tenancy.tag(dbsystem, value)
+                value = child_value(value)
+
+                for _ in range(shape['db_homes']):
+                    db_home = tenancy.add(region, 'db_home', compartment.id, db_system_id=dbsystem.id)
+                    tenancy.add(region, 'dbsys_db', compartment.id, tag_value=value, db_home_id=db_home.id, db_system_id=dbsystem.id)
+
+            for _ in range(shape['exa_infras']):
+                infrastructure = tenancy.add(region, 'exa_infra', compartment.id, availability_domain=rng.choice(ads))
+                tenancy.tag(infrastructure, tag_value(infrastructure.display_name))
+
+                for kind in vm_cluster_kinds:
+                    for _ in range(shape['vm_clusters']):
+                        cluster = tenancy.add(region, kind, compartment.id, cloud_exadata_infrastructure_id=infrastructure.id)
+                        tenancy.tag(cluster, tag_value(cluster.display_name))
+
+            for _ in range(shape['services']):
+                for kind in service_kinds:
+                    resource = tenancy.add(region, kind, compartment.id, availability_domain=rng.choice(ads))
+                    tenancy.tag(resource, tag_value(resource.display_name))
+
+                    if kind in inactive_kinds and shape['inactive'] and rng.random() < shape['inactive']:
+                        resource.lifecycle_state = 'INACTIVE'
+
+                application = tenancy.add(region, 'function_app', compartment.id)
+                value = tag_value(application.display_name)
+                tenancy.tag(application, value)
+                value = child_value(value)
+                tenancy.add(region, 'function', compartment.id, tag_value=value, application_id=application.id)
+
+    return tenancy
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# taggable resources per kind
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def describe(tenancy):
+    kinds = Counter(resource.kind for resource in tenancy.resources.values() if resource.kind not in untagged_kinds)
+    tagged = sum(1 for resource in tenancy.taggable() if resource.defined_tags)
+
+    return kinds, tagged
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# get command line arguments
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def add_shape_arguments(parser):
+    parser.add_argument('--seed', type=int, default=0, dest='seed',
+                        help='random seed of the tenancy, default: 0')
+    parser.add_argument('--depth', type=int, default=default_shape['depth'], dest='depth',
+                        help=f"compartment tree depth, default: {default_shape['depth']}")
+    parser.add_argument('--fan-out', type=int, default=default_shape['fan_out'], dest='fan_out',
+                        help=f"child compartments per compartment, default: {default_shape['fan_out']}")
+    parser.add_argument('-r', '--regions', type=int, default=default_shape['regions'], dest='regions',
+                        help=f"number of regions, default: {default_shape['regions']}")
+    parser.add_argument('--ads', type=int, default=default_shape['ads'], dest='ads',
+                        help=f"availability domains per region, default: {default_shape['ads']}")
+    parser.add_argument('-i', '--instances', type=int, default=default_shape['instances'], dest='instances',
+                        help=f"instances per compartment and region, default: {default_shape['instances']}")
+    parser.add_argument('--volumes', type=int, default=default_shape['volumes'], dest='volumes',
+                        help=f"block volumes per instance, default: {default_shape['volumes']}")
+    parser.add_argument('--backups', type=int, default=default_shape['backups'], dest='backups',
+                        help=f"backups per boot / block volume, default: {default_shape['backups']}")
+    parser.add_argument('--db-homes', type=int, default=default_shape['db_homes'], dest='db_homes',
+                        help=f"db homes of the db system of each compartment and region, 0: no db system, default: {default_shape['db_homes']}")
+    parser.add_argument('--exa-infras', type=int, default=default_shape['exa_infras'], dest='exa_infras',
+                        help=f"exadata infrastructures per compartment and region, default: {default_shape['exa_infras']}")
+    parser.add_argument('--vm-clusters', type=int, default=default_shape['vm_clusters'], dest='vm_clusters',
+                        help=f"cloud vm clusters and autonomous vm clusters per exadata infrastructure, default: {default_shape['vm_clusters']}")
+    parser.add_argument('--buckets', type=int, default=default_shape['buckets'], dest='buckets',
+                        help=f"buckets per compartment and region, default: {default_shape['buckets']}")
+    parser.add_argument('--services', type=int, default=default_shape['services'], dest='services',
+                        help=f"resources of each other service per compartment and region, default: {default_shape['services']}")
+    parser.add_argument('--inactive', type=float, default=default_shape['inactive'], dest='inactive',
+                        help=f"fraction of MySQL and Visual Builder instances left inactive, started to be tagged, default: {default_shape['inactive']}")
+    parser.add_argument('--tagged', type=float, default=default_shape['tagged'], dest='tagged',
+                        help=f"fraction of resources already tagged, default: {default_shape['tagged']}")
+    parser.add_argument('--untagged-children', type=float, default=default_shape['untagged_children'], dest='untagged_children',
+                        help=f"fraction of tagged parents (instances, db systems, function applications) whose children are untagged, default: {default_shape['untagged_children']}")
+
+def shape_arguments(cmd):
+    return {name: getattr(cmd, name) for name in default_shape}
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# print the shape and resource counts of tenancies
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    add_shape_arguments(parser)
+    parser.add_argument('-n', '--resources', type=int, nargs='+', default=[], dest='resources',
+                        help='target taggable resources, instances per compartment (and tree size) adjusted to each target')
+    cmd = parser.parse_args()
+
+    shapes = [shape_for(resources, **shape_arguments(cmd)) for resources in cmd.resources] or [shape_arguments(cmd)]
+
+    for shape in shapes:
+        tenancy = generate(cmd.seed, **shape)
+        kinds, tagged = describe(tenancy)
+
+        print(f"\n{', '.join(f'{name}={value}' for name, value in shape.items())}")
+        print(f"   {len(tenancy.compartments) - 1} compartments, {sum(kinds.values())} resources, {tagged} already tagged")
+
+        for kind, count in sorted(kinds.items()):
+            print(f"   {kind:30} {count:10}")
@@ -0,0 +1,161 @@
+# coding: utf-8
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# throughput benchmark
+#
+# runs OCI-TagByName.py end to end against the in-process
+# fake oci backend (benchmarks/fake_oci.py), once per
+# concurrency mode, and reports resources/sec, api calls
+# per resource and api latency. each mode runs in a fresh
+# interpreter on the same seeded synthetic tenancy
+# (benchmarks/tenancy.py), offline
+#
+# usage:
+#   python3 benchmarks/throughput.py
+#   python3 benchmarks/throughput.py -m '' '-w 8 --join' -l 0.05 --throttle 0.02
+#   python3 benchmarks/throughput.py -m '-w 8 --join' -n 10 1000 100000 --tagged 0.5
+#   python3 benchmarks/throughput.py -m '--search' --tagged 0.9 --untagged-children 0.3
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+import os
+import sys
+import json
+import time
+import shlex
+import runpy
+import argparse
+import tempfile
+import itertools
+import subprocess
+
+repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+script_path = os.path.join(repo_path, 'OCI-TagByName.py')
+sys.path.insert(0, repo_path)
+
+from benchmarks import fake_oci
+from benchmarks.tenancy import generate, shape_for, add_shape_arguments, shape_arguments, child_kinds
+
+modes = ['', '-w 8', '-w 8 --join', '--pipeline --join', '--search -rw 2']
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# get command line arguments
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('-m', '--modes', nargs='+', default=modes, dest='modes',
+                        help='OCI-TagByName.py options of each mode, default: ' + ', '.join(repr(mode) for mode in modes))
+    parser.add_argument('-n', '--resources', type=int, nargs='+', default=[], dest='resources',
+                        help='run every mode on tenancies of about N taggable resources each (10 1000 100000), default: the tenancy shape')
+    parser.add_argument('-l', '--latency', type=float, default=0.02, dest='latency',
+                        help='mean api latency in seconds, default: 0.02')
+    parser.add_argument('-p', '--page-size', type=int, default=100, dest='page_size',
+                        help='items per list page, default: 100')
+    parser.add_argument('--throttle', type=float, default=0.0, dest='throttle_rate',
+                        help='fraction of requests answered 429, default: 0')
+    parser.add_argument('--errors', type=float, default=0.0, dest='error_rate',
+                        help='fraction of requests answered 500, default: 0')
+    parser.add_argument('--transition', type=float, default=2.0, dest='transition_seconds',
+                        help='seconds of lifecycle transitions (start, stop, update), default: 2')
+    parser.add_argument('--single', default='', dest='single', metavar='RESULT_FILE',
+                        help=argparse.SUPPRESS)
+
+    add_shape_arguments(parser)
+
+    return parser.parse_args()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# run one mode in this interpreter, write the result
+# search modes must leave no untagged child behind
+# when no server errors are injected
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def run_single(cmd, mode):
+    tenancy = generate(cmd.seed, **shape_arguments(cmd))
+    backend = fake_oci.FakeBackend(
+                                   tenancy,
+                                   latency=cmd.latency,
+                                   page_size=cmd.page_size,
+                                   throttle_rate=cmd.throttle_rate,
+                                   error_rate=cmd.error_rate,
+                                   transition_seconds=cmd.transition_seconds,
+                                   seed=cmd.seed
+                                   )
+    fake_oci.install(backend)
+
+    sys.argv = [script_path, '-cf', '-tn', tenancy.tag_namespace, '-tk', tenancy.tag_key, '-all'] + shlex.split(mode)
+
+    start = time.monotonic()
+
+    try:
+        runpy.run_path(script_path, run_name='__main__')
+    except SystemExit as e:
+        if e.code:
+            raise
+
+    result = backend.stats()
+    result['wall'] = time.monotonic() - start
+    result['resources'] = len(tenancy.taggable())
+
+    untagged_children = sum(1 for resource in tenancy.taggable() if resource.kind in child_kinds and not resource.defined_tags)
+
+    if '--search' in shlex.split(mode) and not cmd.error_rate and untagged_children:
+        raise SystemExit(f'{untagged_children} child resources left untagged by --search')
+
+    with open(cmd.single, 'w', encoding='utf-8') as result_file:
+        json.dump(result, result_file)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# run a mode in a fresh interpreter, script output
+# discarded
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def run_mode(mode, shape):
+    with tempfile.TemporaryDirectory() as directory:
+        result_path = os.path.join(directory, 'result.json')
+        arguments = [
+            f'--latency={cmd.latency}',
+            f'--page-size={cmd.page_size}',
+            f'--throttle={cmd.throttle_rate}',
+            f'--errors={cmd.error_rate}',
+            f'--transition={cmd.transition_seconds}',
+            f'--seed={cmd.seed}',
+            f'--single={result_path}',
+            f'--modes={mode}',
+            ]
+        arguments += [f"--{name.replace('_', '-')}={value}" for name, value in shape.items()]
+
+        process = subprocess.run(
+                                 [sys.executable, os.path.abspath(__file__), *arguments],
+                                 cwd=repo_path, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+                                 )
+
+        if process.returncode != 0:
+            raise SystemExit(f"mode '{mode}' failed:\n{process.stderr.strip()}")
+
+        with open(result_path, encoding='utf-8') as result_file:
+            return json.load(result_file)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# run benchmark
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+cmd = parse_arguments()
+
+if cmd.single:
+    run_single(cmd, cmd.modes[0])
+    raise SystemExit(0)
+
+shapes = [shape_for(resources, **shape_arguments(cmd)) for resources in cmd.resources] or [shape_arguments(cmd)]
+
+print(f"\n{'resources':>10} {'mode':30} {'wall s':>8} {'res/s':>8} {'calls/res':>10} {'p50 ms':>8} {'p95 ms':>8} {'429':>6} {'5xx':>6} {'updated':>8}")
+
+for shape, mode in itertools.product(shapes, cmd.modes):
+    result = run_mode(mode, shape)
+
+    print(
+          f"{result['resources']:10} {mode or '(sequential)':30} {result['wall']:8.1f} {result['resources'] / result['wall']:8.1f} "
+          f"{result['calls'] / result['resources']:10.2f} {result['p50_latency'] * 1000:8.1f} {result['p95_latency'] * 1000:8.1f} "
+          f"{result['throttled']:6} {result['errors']:6} {result['updated']:8}"
+          )
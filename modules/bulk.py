@@ -0,0 +1,204 @@
+# coding: utf-8
+
+import oci
+import oci.identity
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# bulk edit resource types by tagged service
+# mysql and visual builder are left out: they must be
+# started before and stopped after a synchronous update
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+bulk_resource_types = {
+    'instance': 'Instance',
+    'bootvolume': 'BootVolume',
+    'boot_backup': 'BootVolumeBackup',
+    'volume': 'Volume',
+    'volume_backup': 'VolumeBackup',
+    'fss': 'FileSystem',
+    'loadbalancer': 'LoadBalancer',
+    'ntwloadbalancer': 'NetworkLoadBalancer',
+    'networkfw': 'NetworkFirewall',
+    'dbsystem': 'DbSystem',
+    'dbsys_db': 'Database',
+    'autonomous': 'AutonomousDatabase',
+    'exa_infra': 'CloudExadataInfrastructure',
+    'auto_vm_cluster': 'CloudAutonomousVmCluster',
+    'cloud_vm_cluster': 'CloudVmCluster',
+    'nosql': 'NoSQLTable',
+    'opensearch': 'OpensearchCluster',
+    'analytics': 'AnalyticsInstance',
+    'bigdata': 'BigDataService',
+    'datacatalog': 'DataCatalog',
+    'dataintegration': 'DISWorkspace',
+    'function_app': 'FunctionsApplication',
+    'function': 'FunctionsFunction',
+    'container': 'ContainerInstance',
+    'artifact': 'ArtifactRepository',
+    'mesh': 'ServiceMeshMesh',
+    }
+
+work_request_done = ['SUCCEEDED', 'FAILED', 'PARTIALLY_SUCCEEDED', 'CANCELED']
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# bulk tagger
+# a bulk edit request sets one tag value on up to
+# batch_size resources of a single compartment, so
+# resources are grouped by (their own compartment,
+# region, tag value): instance volumes and backups,
+# db homes databases and functions share their parent
+# name and batch together. a work request costs a
+# submit and several polls, so groups of less than
+# min_group_size resources (with display names as tag
+# values, most groups: a parent and its children) are
+# updated directly by item.update() instead
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class BulkTagger:
+
+    def __init__(self, identity_client_factory, tag_namespace, tag_key, retry_strategy=None, batch_size=100, min_group_size=10, workers=8):
+        self.identity_client_factory = identity_client_factory
+        self.tag_namespace = tag_namespace
+        self.tag_key = tag_key
+        self.retry_strategy = retry_strategy
+        self.batch_size = batch_size
+        self.min_group_size = min_group_size
+        self.groups = defaultdict(list)
+        self.futures = []
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.work_requests = 0
+        self.direct_updates = 0
+
+        editable_types = oci.pagination.list_call_get_all_results(
+                                                                identity_client_factory().list_bulk_editable_resource_types,
+                                                                retry_strategy=retry_strategy
+                                                                ).data
+        editable_types = {item.resource_type for item in editable_types}
+
+        self.resource_types = {service: resource_type for service, resource_type in bulk_resource_types.items() if resource_type in editable_types}
+
+    def supports(self, service):
+        return service in self.resource_types
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # queue a resource, a full group is submitted at once
+    # item must provide compartment_id (of the resource),
+    # region, service, ocid, tag_value and update(), the
+    # direct update reporting its own result
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def add(self, item):
+        key = (item.compartment_id, item.region, item.tag_value)
+
+        with self.lock:
+            self.groups[key].append(item)
+
+            if len(self.groups[key]) < self.batch_size:
+                return item
+
+            batch = self.groups.pop(key)
+            self.futures.append(self.executor.submit(self.run_batch, batch))
+
+        return item
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # submit a batch and wait for its work request
+    # return [(item, error or None)]
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def run_batch(self, batch):
+        identity_client = self.identity_client_factory()
+
+        details = oci.identity.models.BulkEditTagsDetails(
+            compartment_id=batch[0].compartment_id,
+            resources=[
+                oci.identity.models.BulkEditResource(id=item.ocid, resource_type=self.resource_types[item.service])
+                for item in batch
+                ],
+            bulk_edit_operations=[
+                oci.identity.models.BulkEditOperationDetails(
+                    operation_type='ADD_OR_SET',
+                    defined_tags={self.tag_namespace: {self.tag_key: batch[0].tag_value}}
+                    )
+                ]
+            )
+
+        try:
+            response = identity_client.bulk_edit_tags(bulk_edit_tags_details=details, retry_strategy=self.retry_strategy)
+            work_request_id = response.headers['opc-work-request-id']
+
+            with self.lock:
+                self.work_requests += 1
+
+            work_request = oci.wait_until(
+                                        identity_client,
+                                        identity_client.get_tagging_work_request(work_request_id),
+                                        evaluate_response=lambda r: r.data.status in work_request_done,
+                                        max_interval_seconds=10,
+                                        max_wait_seconds=3600
+                                        ).data
+
+        except Exception as e:
+            return [(item, e) for item in batch]
+
+        if work_request.status == 'SUCCEEDED':
+            return [(item, None) for item in batch]
+
+        try:
+            errors = oci.pagination.list_call_get_all_results(
+                                                            identity_client.list_tagging_work_request_errors,
+                                                            work_request_id,
+                                                            retry_strategy=self.retry_strategy
+                                                            ).data
+            message = ' / '.join(f'{error.code}: {error.message}' for error in errors) or work_request.status
+
+        except Exception as e:
+            message = f'{work_request.status}: {e}'
+
+        # work request errors do not name the failed resources,
+        # on partial success the whole group is reported failed
+        # and applied again by the next run
+        return [(item, message) for item in batch]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # update the resources of a small group one by one
+    # only errors escaping item.update() are returned
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def run_direct(self, batch):
+        results = []
+
+        for item in batch:
+            try:
+                item.update()
+
+            except Exception as e:
+                results.append((item, e))
+
+        with self.lock:
+            self.direct_updates += len(batch)
+
+        return results
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # submit remaining groups, wait for all work requests
+    # and reconcile per resource results
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def wait(self):
+        with self.lock:
+            for batch in self.groups.values():
+                run = self.run_batch if len(batch) >= self.min_group_size else self.run_direct
+                self.futures.append(self.executor.submit(run, batch))
+            self.groups.clear()
+            futures, self.futures = self.futures, []
+
+        for future in futures:
+            for item, error in future.result():
+                yield item, error
+
+        self.executor.shutdown()
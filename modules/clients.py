@@ -0,0 +1,192 @@
+# coding: utf-8
+
+import copy
+import importlib
+import threading
+from functools import cached_property
+
+from modules.identity import list_ads
+from modules.tagging import ResourcesTagger
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# oci service clients by region context attribute
+# name: (module, class)
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+client_classes = {
+    'identity_client': ('oci.identity', 'IdentityClient'),
+    'search_client': ('oci.resource_search', 'ResourceSearchClient'),
+    'core_client': ('oci.core', 'ComputeClient'),
+    'blk_storage_client': ('oci.core', 'BlockstorageClient'),
+    'object_client': ('oci.object_storage', 'ObjectStorageClient'),
+    'fss_client': ('oci.file_storage', 'FileStorageClient'),
+    'loadbalancer_client': ('oci.load_balancer', 'LoadBalancerClient'),
+    'networkloadbalancer_client': ('oci.network_load_balancer', 'NetworkLoadBalancerClient'),
+    'networkfw_client': ('oci.network_firewall', 'NetworkFirewallClient'),
+    'database_client': ('oci.database', 'DatabaseClient'),
+    'mysql_client': ('oci.mysql', 'DbSystemClient'),
+    'nosql_client': ('oci.nosql', 'NosqlClient'),
+    'opensearch_client': ('oci.opensearch', 'OpensearchClusterClient'),
+    'analytics_client': ('oci.analytics', 'AnalyticsClient'),
+    'bds_client': ('oci.bds', 'BdsClient'),
+    'data_catalog_client': ('oci.data_catalog', 'DataCatalogClient'),
+    'data_integration_client': ('oci.data_integration', 'DataIntegrationClient'),
+    'function_client': ('oci.functions', 'FunctionsManagementClient'),
+    'container_client': ('oci.container_instances', 'ContainerInstanceClient'),
+    'artifact_client': ('oci.artifacts', 'ArtifactsClient'),
+    'mesh_client': ('oci.service_mesh', 'ServiceMeshClient'),
+    'visual_builder_client': ('oci.visual_builder', 'VbInstanceClient'),
+    }
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# region context attribute name of a client
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def client_name(client):
+    for name, (module_name, class_name) in client_classes.items():
+        if type(client).__name__ == class_name:
+            return name
+
+    return None
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# service clients used by each service family
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+family_clients = {
+    'compute': ['core_client', 'blk_storage_client'],
+    'storage': ['object_client', 'fss_client', 'identity_client'],
+    'network': ['loadbalancer_client', 'networkloadbalancer_client', 'networkfw_client'],
+    'database': ['database_client', 'mysql_client', 'nosql_client', 'opensearch_client'],
+    'analytics': ['analytics_client', 'bds_client', 'data_catalog_client', 'data_integration_client'],
+    'development': ['function_client', 'container_client', 'artifact_client', 'mesh_client', 'visual_builder_client'],
+    }
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# import the oci service packages of selected families
+# done once from the main thread, before workers start,
+# so threads never contend on the import lock
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def import_families(families):
+    modules = {client_classes[name][0] for family in families for name in family_clients[family]}
+
+    for module_name in sorted(modules):
+        importlib.import_module(module_name)
+
+    return sorted(modules)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# lazy client registry
+# a client is built the first time it is requested and
+# cached per (region, thread): sdk clients wrap a
+# requests session and must not be shared across threads
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class ClientRegistry:
+
+    def __init__(self, config, signer, limiter=None, metrics=None, printer=print):
+        self.config = config
+        self.signer = signer
+        self.limiter = limiter
+        self.metrics = metrics
+        self.printer = printer
+        self.local = threading.local()
+        self.contexts = {}
+        self.contexts_lock = threading.Lock()
+        self.namespace = None
+        self.namespace_lock = threading.Lock()
+        self.created = 0
+        self.created_lock = threading.Lock()
+
+    def cache(self):
+        if not hasattr(self.local, 'clients'):
+            self.local.clients = {}
+            self.local.taggers = {}
+
+        return self.local
+
+    def get(self, region_name, name):
+        clients = self.cache().clients
+        key = (region_name, name)
+
+        if key not in clients:
+            module_name, class_name = client_classes[name]
+            client_class = getattr(importlib.import_module(module_name), class_name)
+
+            region_config = copy.deepcopy(self.config)
+            region_config['region'] = region_name
+
+            clients[key] = client_class(config=region_config, signer=self.signer)
+
+            # metrics wrap the raw request, limiter wait excluded
+            if self.metrics:
+                self.metrics.install(clients[key], region_name, name)
+
+            if self.limiter:
+                self.limiter.install(clients[key], region_name)
+
+            with self.created_lock:
+                self.created += 1
+
+        return clients[key]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # one ResourcesTagger per client, printing its errors
+    # through printer
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def tagger(self, client):
+        taggers = self.cache().taggers
+
+        if id(client) not in taggers:
+            taggers[id(client)] = ResourcesTagger(client, self.printer)
+
+        return taggers[id(client)]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # object storage namespace, one per tenancy, looked
+    # up once per run whatever the number of regions
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def namespace_name(self, region_name):
+        with self.namespace_lock:
+            if self.namespace is None:
+                self.namespace = self.get(region_name, 'object_client').get_namespace().data
+
+            return self.namespace
+
+    def context(self, region):
+        with self.contexts_lock:
+            if region.region_name not in self.contexts:
+                self.contexts[region.region_name] = RegionContext(region, self)
+
+            return self.contexts[region.region_name]
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# region context, exposes clients as attributes
+# ctx.core_client, ctx.object_client, ...
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class RegionContext:
+
+    def __init__(self, region, registry):
+        self.region = region
+        self.registry = registry
+
+    def __getattr__(self, name):
+        if name in client_classes:
+            return self.registry.get(self.region.region_name, name)
+
+        raise AttributeError(name)
+
+    def tagger(self, client):
+        return self.registry.tagger(client)
+
+    @cached_property
+    def all_ads(self):
+        return list_ads(self.identity_client, self.registry.config['tenancy'])
+
+    @property
+    def namespace_name(self):
+        return self.registry.namespace_name(self.region.region_name)
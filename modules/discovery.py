@@ -0,0 +1,114 @@
+# coding: utf-8
+
+import threading
+from collections import Counter
+
+import oci
+import oci.resource_search
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# resource search types handled by search discovery,
+# grouped by service family
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+search_resource_types = {
+    'compute': ['Instance', 'BootVolume', 'Volume', 'BootVolumeBackup', 'VolumeBackup'],
+    'storage': ['Bucket', 'FileSystem'],
+    'network': ['LoadBalancer', 'NetworkLoadBalancer', 'NetworkFirewall'],
+    'database': ['DbSystem', 'AutonomousDatabase', 'CloudExadataInfrastructure', 'CloudAutonomousVmCluster',
+                 'CloudVmCluster', 'Database', 'MysqlDbSystem', 'NoSQLTable', 'OpensearchCluster'],
+    'analytics': ['AnalyticsInstance', 'BigDataService', 'DataCatalog', 'DISWorkspace'],
+    'development': ['FunctionsApplication', 'FunctionsFunction', 'ContainerInstance', 'ArtifactRepository', 'ServiceMeshMesh', 'VisualBuilderInstance'],
+    }
+
+# child resources are tagged with the display name of
+# their parent, only untagged ones are searched for
+child_resource_types = ['BootVolume', 'Volume', 'BootVolumeBackup', 'VolumeBackup', 'Database', 'FunctionsFunction']
+
+ignored_states = ['TERMINATED', 'TERMINATING', 'DELETED', 'DELETING', 'FAILED']
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# count search records returned by the service and
+# kept as untagged, the tag comparison being client side
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class SearchStats:
+
+    def __init__(self):
+        self.counts = Counter()
+        self.lock = threading.Lock()
+
+    def count(self, action):
+        with self.lock:
+            self.counts[action] += 1
+
+    def summary(self):
+        with self.lock:
+            returned = self.counts['returned']
+            untagged = self.counts['untagged']
+            ratio = untagged / returned * 100 if returned else 0
+
+            return f"{returned} records returned, {untagged} untagged ({ratio:.0f}%)"
+
+search_stats = SearchStats()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# find resources whose tag is missing or outdated
+# one paginated structured query per region, filtered
+# by the service on lifecycle state (and timeCreated
+# with since). the tag is compared client side, the
+# query language has no condition for a tag missing or
+# different from displayName (definedTags conditions
+# match any tag of a resource, a negated one would
+# drop untagged resources), so every live resource of
+# the selected types is returned, see search_stats.
+# resources are kept when tag_namespace.tag_key !=
+# display_name (child resources when it is unset),
+# children_only restricts the query to child types
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def find_untagged_resources(search_client, families, tag_namespace, tag_key, compartment_ids, retry_strategy=None, since=None, children_only=False):
+
+    resource_types = [
+        resource_type for family in families for resource_type in search_resource_types[family]
+        if not children_only or resource_type in child_resource_types
+        ]
+
+    if not resource_types:
+        return
+
+    conditions = [f"lifecycleState != '{state}'" for state in ignored_states]
+
+    if since is not None:
+        conditions.append(f"timeCreated >= '{since.strftime('%Y-%m-%dT%H:%M:%SZ')}'")
+
+    query = f"query {', '.join(resource_types)} resources where {' && '.join(conditions)}"
+
+    search = oci.resource_search.models.StructuredSearchDetails(
+        query=query,
+        type='Structured',
+        matching_context_type=oci.resource_search.models.SearchDetails.MATCHING_CONTEXT_TYPE_NONE)
+
+    kwargs = {'retry_strategy': retry_strategy} if retry_strategy else {}
+    items = oci.pagination.list_call_get_all_results_generator(search_client.search_resources, 'record', search, limit=1000, **kwargs)
+
+    for item in items:
+        search_stats.count('returned')
+
+        if item.compartment_id not in compartment_ids:
+            continue
+
+        # states changed since the search index was updated
+        if item.lifecycle_state in ignored_states:
+            continue
+
+        tag_value = (item.defined_tags or {}).get(tag_namespace, {}).get(tag_key)
+
+        if item.resource_type in child_resource_types and tag_value is not None:
+            continue
+
+        if item.resource_type not in child_resource_types and tag_value == item.display_name:
+            continue
+
+        search_stats.count('untagged')
+        yield item
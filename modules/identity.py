@@ -1,8 +1,12 @@
 # coding: utf-8
 
 import oci
+import oci.identity
+import oci.object_storage
+import oci.resource_search
 import os 
 import json
+from collections import defaultdict, deque
 
 from modules.utils import red, green, print_error, print_info
 
@@ -199,6 +203,21 @@ def get_region_subscription_list(identity_client, tenancy_id, target_region):
 
     return subscribed_regions
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# get tenancy home region
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def get_home_region(identity_client, tenancy_id):
+
+    try:
+        subscribed_regions = identity_client.list_region_subscriptions(tenancy_id).data
+
+    except oci.exceptions.ServiceError as e:
+        print_error("Region error:", tenancy_id, e.code, e.message)
+        raise SystemExit(1)
+
+    return next(region for region in subscribed_regions if region.is_home_region)
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 # get all compartments in the tenancy using OCI search (not used hereby)
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -227,34 +246,46 @@ def get_compartments(search_client):
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 # get all compartments in the tenancy
+# one paginated call lists the whole tenancy tree, the
+# hierarchy below compartment_id is rebuilt in memory
+# and excluded_comp subtree is pruned locally
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-def get_compartment_list(identity_client, compartment_id, excluded_comp):
+def get_compartment_list(identity_client, compartment_id, excluded_comp, tenancy_id=None):
     
     print('   Retrieving compartments...',end=' '*15+'\r',flush=True)
-    target_compartments = []
-    all_compartments = []
 
     try:
-        top_level_compartment_response = identity_client.get_compartment(compartment_id)
-        target_compartments.append(top_level_compartment_response.data)
-        all_compartments.append(top_level_compartment_response.data)
+        top_level_compartment = identity_client.get_compartment(compartment_id).data
+
+        # compartment_id_in_subtree is only allowed on the root compartment
+        subtree_compartments = oci.pagination.list_call_get_all_results(
+            identity_client.list_compartments,
+            tenancy_id or compartment_id,
+            compartment_id_in_subtree=True,
+            access_level='ANY'
+        ).data
     
     except oci.exceptions.ServiceError as response:
         print_error("Error compartment_id: ", {compartment_id}, {response.code}, {response.message})
         raise SystemExit(1)
 
-    while len(target_compartments) > 0:
-        target = target_compartments.pop(0)
+    # parent index: parent compartment_id -> child compartments
+    children = defaultdict(list)
+
+    for compartment in subtree_compartments:
+        children[compartment.compartment_id].append(compartment)
+
+    target_compartments = deque([top_level_compartment])
+    all_compartments = [top_level_compartment]
+
+    while target_compartments:
+        target = target_compartments.popleft()
 
         # remove excluded_comp child compartments 
         if target.id != excluded_comp:
-            child_compartment_response = oci.pagination.list_call_get_all_results(
-                identity_client.list_compartments,
-                target.id
-            )
-            target_compartments.extend(child_compartment_response.data)
-            all_compartments.extend(child_compartment_response.data)
+            target_compartments.extend(children[target.id])
+            all_compartments.extend(children[target.id])
 
     active_compartments = []
 
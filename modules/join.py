@@ -0,0 +1,122 @@
+# coding: utf-8
+
+from collections import defaultdict
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# group items by one of their attributes
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def index_by(items, attribute):
+    index = defaultdict(list)
+
+    for item in items:
+        index[getattr(item, attribute)].append(item)
+
+    return index
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# compute hierarchy of a compartment
+# attachments, volumes and backups are listed once per
+# compartment (attachments and boot volumes per AD) and
+# joined in memory, instead of a few calls per instance.
+# same interface as ResourcesFinder, so tag_instance
+# uses either; listed volumes come without etag, the
+# tagger reads them again before its conditional update.
+# volumes living in another compartment fall back to a
+# get call
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class ComputeIndex:
+
+    def __init__(self, finder, core_client, blk_storage_client, ads):
+        self.finder = finder
+        self.boot_volume_attachments = defaultdict(list)
+        self.boot_volumes = {}
+
+        for ad in ads:
+            for attachment in finder.list_instances_bootvol(core_client, ad):
+                self.boot_volume_attachments[attachment.instance_id].append(attachment)
+
+            for boot_volume in finder.list_boot_volumes(blk_storage_client, ad):
+                self.boot_volumes[boot_volume.id] = boot_volume
+
+        self.volume_attachments = index_by(finder.list_instances_volattach(core_client), 'instance_id')
+        self.volumes = {volume.id: volume for volume in finder.list_volumes(blk_storage_client)}
+        self.boot_volume_backups = index_by(finder.list_boot_volume_backups(blk_storage_client), 'boot_volume_id')
+        self.volume_backups = index_by(finder.list_volume_backups(blk_storage_client), 'volume_id')
+
+    def list_instances_bootvol(self, core_client, availability_domain, instance_id):
+        return self.boot_volume_attachments.get(instance_id, [])
+
+    def list_instances_volattach(self, core_client, availability_domain, instance_id):
+        return self.volume_attachments.get(instance_id, [])
+
+    def list_boot_volume_backups(self, blk_storage_client, boot_volume_id):
+        return self.boot_volume_backups.get(boot_volume_id, [])
+
+    def list_volume_backups(self, blk_storage_client, volume_id):
+        return self.volume_backups.get(volume_id, [])
+
+    def get_boot_volume(self, blk_storage_client, boot_volume_id):
+        if boot_volume_id in self.boot_volumes:
+            return self.boot_volumes[boot_volume_id], None
+
+        return self.finder.get_boot_volume(blk_storage_client, boot_volume_id)
+
+    def get_volume(self, blk_storage_client, volume_id):
+        if volume_id in self.volumes:
+            return self.volumes[volume_id], None
+
+        return self.finder.get_volume(blk_storage_client, volume_id)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# database hierarchy of a compartment
+# db homes and exadata vm clusters are listed once per
+# compartment and indexed by parent, databases of all
+# db system homes are listed concurrently on executor,
+# shared by the whole run so its long-lived workers
+# keep their client from client_factory. a db home
+# failing to list raises its error when its databases
+# are read, other homes are not affected
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class DatabaseIndex:
+
+    def __init__(self, finder, client_factory, executor):
+        database_client = client_factory()
+
+        self.db_homes = index_by(
+                                [home for home in finder.list_db_homes(database_client) if home.db_system_id],
+                                'db_system_id'
+                                )
+        self.auto_vm_clusters = index_by(finder.list_cloud_autonomous_vm_clusters(database_client), 'cloud_exadata_infrastructure_id')
+        self.vm_clusters = index_by(finder.list_cloud_vm_clusters(database_client), 'cloud_exadata_infrastructure_id')
+        self.databases = {}
+        self.errors = {}
+
+        futures = {
+            home.id: executor.submit(lambda home_id: list(finder.list_databases(client_factory(), home_id)), home.id)
+            for homes in self.db_homes.values() for home in homes
+            }
+
+        for home_id, future in futures.items():
+            try:
+                self.databases[home_id] = future.result()
+
+            except Exception as e:
+                self.errors[home_id] = e
+
+    def list_db_homes(self, database_client, db_system_id):
+        return self.db_homes.get(db_system_id, [])
+
+    def list_databases(self, database_client, db_home_id):
+        if db_home_id in self.errors:
+            raise self.errors[db_home_id]
+
+        return self.databases.get(db_home_id, [])
+
+    def list_cloud_autonomous_vm_clusters(self, database_client, cloud_exadata_infrastructure_id):
+        return self.auto_vm_clusters.get(cloud_exadata_infrastructure_id, [])
+
+    def list_cloud_vm_clusters(self, database_client, cloud_exadata_infrastructure_id):
+        return self.vm_clusters.get(cloud_exadata_infrastructure_id, [])
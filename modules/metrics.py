@@ -0,0 +1,196 @@
+# coding: utf-8
+
+import os
+import time
+import threading
+from collections import defaultdict
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# latency histogram buckets (seconds)
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+latency_buckets = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def retryable_status(status):
+    return status == 429 or status >= 500
+
+def label_string(labels):
+    return ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in labels)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# run metrics
+# api calls, retries, 429s, errors and latency by
+# (region, service, operation), resources by
+# (region, service, outcome), written as a
+# node_exporter textfile collector .prom file
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class RunMetrics:
+
+    def __init__(self, path, interval=60):
+        self.path = path
+        self.interval = interval
+        self.calls = defaultdict(int)
+        self.retries = defaultdict(int)
+        self.throttled = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.latency_counts = defaultdict(lambda: [0] * (len(latency_buckets) + 1))
+        self.latency_sums = defaultdict(float)
+        self.resources = defaultdict(int)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.start = time.time()
+        self.finished = None
+        self.stopped = threading.Event()
+        self.write_lock = threading.Lock()
+        self.thread = None
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # wrap an sdk client: call_api gives the operation
+    # name, session.request sees every http attempt
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def install(self, client, region, service):
+        base_client = client.base_client
+        call_api = base_client.call_api
+        session = base_client.session
+        session_request = session.request
+
+        # older sdks don't pass operation_name: method and path
+        def measured_call_api(*args, **kwargs):
+            operation = kwargs.get('operation_name')
+
+            if not operation:
+                resource_path = args[0] if args else kwargs.get('resource_path')
+                method = args[1] if len(args) > 1 else kwargs.get('method')
+                operation = f'{method} {resource_path}'
+
+            self.local.operation = operation
+            return call_api(*args, **kwargs)
+
+        def measured_request(method, url, *args, **kwargs):
+            operation = getattr(self.local, 'operation', None) or method
+            start = time.monotonic()
+
+            try:
+                response = session_request(method, url, *args, **kwargs)
+            except Exception:
+                self.observe(region, service, operation, 599, time.monotonic() - start)
+                raise
+
+            self.observe(region, service, operation, response.status_code, time.monotonic() - start)
+            return response
+
+        base_client.call_api = measured_call_api
+        session.request = measured_request
+
+        return client
+
+    def observe(self, region, service, operation, status, latency):
+        key = (region, service, operation)
+
+        # a request following a retryable response of the same
+        # operation on the same thread is an sdk retry
+        retry = getattr(self.local, 'retryable', None) == key
+        self.local.retryable = key if retryable_status(status) else None
+
+        bucket = next((index for index, bound in enumerate(latency_buckets) if latency <= bound), len(latency_buckets))
+
+        with self.lock:
+            self.calls[key] += 1
+            self.retries[key] += retry
+            self.throttled[key] += status == 429
+            self.errors[key] += status >= 400 and status != 429
+            self.latency_counts[key][bucket] += 1
+            self.latency_sums[key] += latency
+
+    def resource(self, region, service, outcome):
+        with self.lock:
+            self.resources[(region, service, outcome)] += 1
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # render prometheus text format
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def render(self):
+        lines = []
+        operation_labels = lambda key: label_string(zip(('region', 'service', 'operation'), key))
+
+        with self.lock:
+            counters = [
+                ('oci_tagbyname_api_calls_total', 'API requests sent, retries included', self.calls),
+                ('oci_tagbyname_api_retries_total', 'API requests retried after a 429 or 5xx', self.retries),
+                ('oci_tagbyname_api_throttled_total', 'API requests throttled (429)', self.throttled),
+                ('oci_tagbyname_api_errors_total', 'API requests failed (4xx but 429, 5xx, network)', self.errors),
+                ]
+
+            for name, help_text, values in counters:
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                lines += [f'{name}{{{operation_labels(key)}}} {value}' for key, value in sorted(values.items())]
+
+            name = 'oci_tagbyname_api_latency_seconds'
+            lines += [f'# HELP {name} API request latency', f'# TYPE {name} histogram']
+
+            for key, counts in sorted(self.latency_counts.items()):
+                cumulative = 0
+
+                for bound, count in zip(latency_buckets + ('+Inf',), counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{operation_labels(key)},le="{bound}"}} {cumulative}')
+
+                lines.append(f'{name}_sum{{{operation_labels(key)}}} {self.latency_sums[key]:.6f}')
+                lines.append(f'{name}_count{{{operation_labels(key)}}} {cumulative}')
+
+            name = 'oci_tagbyname_resources_total'
+            lines += [f'# HELP {name} Resources by outcome (tagged, skipped, failed, planned)', f'# TYPE {name} counter']
+            lines += [
+                f'{name}{{{label_string(zip(("region", "service", "outcome"), key))}}} {value}'
+                for key, value in sorted(self.resources.items())
+                ]
+
+        end = self.finished or time.time()
+        lines += [
+            '# HELP oci_tagbyname_run_start_timestamp_seconds Start of the run',
+            '# TYPE oci_tagbyname_run_start_timestamp_seconds gauge',
+            f'oci_tagbyname_run_start_timestamp_seconds {self.start:.3f}',
+            '# HELP oci_tagbyname_run_duration_seconds Duration of the run so far',
+            '# TYPE oci_tagbyname_run_duration_seconds gauge',
+            f'oci_tagbyname_run_duration_seconds {end - self.start:.3f}',
+            '# HELP oci_tagbyname_run_in_progress 1 while the run is in progress',
+            '# TYPE oci_tagbyname_run_in_progress gauge',
+            f'oci_tagbyname_run_in_progress {0 if self.finished else 1}',
+            ]
+
+        return '\n'.join(lines) + '\n'
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # write atomically, node_exporter must never read a
+    # partial file
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def write(self, final=False):
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+
+        with self.write_lock:
+            # a periodic write never follows the final one
+            if self.stopped.is_set() and not final:
+                return
+
+            with open(temp_path, 'w', encoding='utf-8') as metrics_file:
+                metrics_file.write(self.render())
+
+            os.replace(temp_path, self.path)
+
+    def writer(self):
+        while not self.stopped.wait(self.interval):
+            self.write()
+
+    def start_writer(self):
+        if self.interval > 0:
+            self.thread = threading.Thread(target=self.writer, daemon=True)
+            self.thread.start()
+
+    def finish(self):
+        self.stopped.set()
+        self.finished = time.time()
+        self.write(final=True)
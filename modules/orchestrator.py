@@ -0,0 +1,69 @@
+# coding: utf-8
+
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from modules.utils import red
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# start -> tag -> stop orchestrator
+# inactive instances (mysql, visual builder) must run
+# to be tagged: their start/tag/stop cycles are queued
+# per region and run together, at most max_running
+# instances started at once to respect cost and limits.
+# one executor runs the cycles of all regions, so the
+# cap holds when regions are analyzed in parallel
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class StartStopOrchestrator:
+
+    def __init__(self, max_running=4):
+        self.max_running = max(1, max_running)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_running)
+        self.jobs = defaultdict(list)
+        self.lock = threading.Lock()
+        self.cycles = 0
+        self.failed = 0
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # queue a cycle, job() starts, tags and stops one
+    # instance and returns '' on failure
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def add(self, region, name, job):
+        with self.lock:
+            self.jobs[region].append((name, job))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # run queued cycles of a region (all regions when None)
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def run(self, region=None):
+        with self.lock:
+            regions = [region] if region is not None else list(self.jobs)
+            jobs = [job for name in regions for job in self.jobs.pop(name, [])]
+
+        if not jobs:
+            return
+
+        futures = {self.executor.submit(job): name for name, job in jobs}
+
+        for future in as_completed(futures):
+            try:
+                failed = future.result() == ''
+
+            except Exception as e:
+                print(red(f'\n start/stop cycle:{futures[future]}\n {e}\n'))
+                failed = True
+
+            with self.lock:
+                self.cycles += 1
+                self.failed += failed
+
+    def close(self):
+        self.executor.shutdown()
+
+    def summary(self):
+        with self.lock:
+            return f"{self.cycles} start/stop cycles, {self.failed} failed, up to {self.max_running} running"
@@ -0,0 +1,94 @@
+# coding: utf-8
+
+import queue
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.utils import red
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# discovery / tagging pipeline
+# discovery workers list resources and push tagging
+# tasks onto a bounded queue drained by tagging workers,
+# a full queue blocks discovery (backpressure) so memory
+# stays bounded and list and update calls overlap
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class Pipeline:
+
+    def __init__(self, discovery_workers=4, tagging_workers=8, queue_size=1000):
+        self.discovery_workers = max(1, discovery_workers)
+        self.tagging_workers = max(1, tagging_workers)
+        self.tasks = queue.Queue(maxsize=max(1, queue_size))
+        self.discovered = 0
+        self.processed = 0
+        self.failed = 0
+        self.peak_depth = 0
+        self.elapsed = 0
+        self.stats_lock = threading.Lock()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # queue a tagging task, blocks while the queue is full
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def emit(self, handler, *args):
+        self.tasks.put((handler, args))
+
+        with self.stats_lock:
+            self.discovered += 1
+            self.peak_depth = max(self.peak_depth, self.tasks.qsize())
+
+    def consumer(self):
+        while True:
+            task = self.tasks.get()
+
+            if task is None:
+                return
+
+            handler, args = task
+
+            try:
+                handler(*args)
+                with self.stats_lock:
+                    self.processed += 1
+
+            except Exception as e:
+                print(red(f'\n tagging task:{handler.__name__}\n {e}\n'))
+                with self.stats_lock:
+                    self.failed += 1
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # run discover(unit) for every unit on the discovery
+    # workers, return once every emitted task is processed
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def run(self, units, discover):
+        start = datetime.now()
+        consumers = [threading.Thread(target=self.consumer, daemon=True) for _ in range(self.tagging_workers)]
+
+        for thread in consumers:
+            thread.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.discovery_workers) as executor:
+                for future in [executor.submit(discover, unit) for unit in units]:
+                    try:
+                        future.result()
+
+                    except Exception as e:
+                        print(red(f'\n discovery unit failed\n {e}\n'))
+                        with self.stats_lock:
+                            self.failed += 1
+
+        finally:
+            for _ in consumers:
+                self.tasks.put(None)
+
+            for thread in consumers:
+                thread.join()
+
+        self.elapsed = (datetime.now() - start).total_seconds()
+
+    def summary(self):
+        return f"{self.discovered} discovered, {self.processed} processed, {self.failed} failed, peak queue {self.peak_depth}/{self.tasks.maxsize}"
@@ -0,0 +1,96 @@
+# coding: utf-8
+
+import os
+import json
+import threading
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# plan writer
+# one json line per pending tag change, flushed as
+# soon as it is discovered so large plans stream to disk
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class PlanWriter:
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w', encoding='utf-8')
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def write(self, entry):
+        line = json.dumps(entry, sort_keys=True, default=str)
+
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+            self.count += 1
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# read a plan as a stream of entries
+# shard (index, count) keeps every count-th line so
+# several hosts can apply the same plan
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def read_plan(path, shard=(0, 1)):
+    index, count = shard
+
+    with open(path, 'r', encoding='utf-8') as plan_file:
+        for line_number, line in enumerate(plan_file):
+            if line_number % count != index or not line.strip():
+                continue
+
+            yield json.loads(line)
+
+def count_plan(path, shard=(0, 1)):
+    index, count = shard
+
+    with open(path, 'r', encoding='utf-8') as plan_file:
+        return sum(1 for line_number, line in enumerate(plan_file) if line_number % count == index and line.strip())
+
+def parse_shard(value):
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        return None
+
+    if count < 1 or not 0 <= index < count:
+        return None
+
+    return index, count
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# apply journal
+# ocids applied so far, appended next to the plan
+# (<plan>.done) so an interrupted apply can resume
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class ApplyJournal:
+
+    def __init__(self, plan_path):
+        self.path = plan_path + '.done'
+        self.done = set()
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as journal_file:
+                self.done = {line.strip() for line in journal_file if line.strip()}
+
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.lock = threading.Lock()
+
+    def is_done(self, ocid):
+        return ocid in self.done
+
+    def mark_done(self, ocid):
+        with self.lock:
+            self.done.add(ocid)
+            self.file.write(ocid + '\n')
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
@@ -0,0 +1,78 @@
+# coding: utf-8
+
+import os
+import io
+import re
+import time
+import pstats
+import cProfile
+import threading
+from contextlib import contextmanager
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# phase profiler
+# one cProfile profile per phase (auth, compartments,
+# check_tags, region.family...), timed on process cpu
+# time so network waits don't hide the hot spots.
+# a phase entered again (one per compartment) adds to
+# the same profile
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class PhaseProfiler:
+
+    def __init__(self, directory, top=25):
+        self.directory = directory
+        self.top = top
+        self.profiles = {}
+        self.lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def phase(self, name):
+        with self.lock:
+            if name not in self.profiles:
+                self.profiles[name] = cProfile.Profile(time.process_time)
+
+            profile = self.profiles[name]
+
+        profile.enable()
+
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def path(self, name):
+        return os.path.join(self.directory, re.sub(r'[^\w.-]', '_', name) + '.pstats')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # write one .pstats per phase and summary.txt: cpu
+    # time per phase, then top cumulative functions of
+    # all phases together
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def write(self):
+        phases = []
+
+        for name, profile in self.profiles.items():
+            profile.dump_stats(self.path(name))
+            phases.append((name, pstats.Stats(profile).total_tt))
+
+        report = io.StringIO()
+        report.write('cpu time per phase (s)\n\n')
+
+        for name, total in sorted(phases, key=lambda phase: phase[1], reverse=True):
+            report.write(f'   {name:50} {total:10.3f}\n')
+
+        if phases:
+            report.write(f'\ntop {self.top} cumulative, all phases\n')
+            stats = pstats.Stats(*(self.path(name) for name, _ in phases), stream=report)
+            stats.sort_stats('cumulative').print_stats(self.top)
+
+        summary_path = os.path.join(self.directory, 'summary.txt')
+
+        with open(summary_path, 'w', encoding='utf-8') as summary_file:
+            summary_file.write(report.getvalue())
+
+        return summary_path
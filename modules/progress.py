@@ -0,0 +1,209 @@
+# coding: utf-8
+
+import sys
+import time
+import shutil
+import threading
+from datetime import datetime, timedelta
+from collections import Counter
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# format seconds as h:mm:ss
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def format_duration(seconds):
+    if seconds is None:
+        return '--:--:--'
+
+    return str(timedelta(seconds=int(seconds)))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# stdout while progress renders: complete lines of any
+# thread go through Progress.write, lines ended by \r
+# (in place messages) become the status text
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class ProgressOutput:
+
+    def __init__(self, progress):
+        self.progress = progress
+        self.local = threading.local()
+
+    def write(self, text):
+        lines, newline, buffer = (getattr(self.local, 'buffer', '') + text).rpartition('\n')
+
+        if newline:
+            self.progress.write(lines)
+
+        if '\r' in buffer:
+            status, _, buffer = buffer.rpartition('\r')
+
+            if status.strip():
+                self.progress.status(status.rpartition('\r')[2].strip())
+
+        self.local.buffer = buffer
+
+        return len(text)
+
+    def flush(self):
+        pass
+
+    # a line left without newline by the calling thread
+    def drain(self):
+        buffer = getattr(self.local, 'buffer', '')
+
+        if buffer:
+            self.local.buffer = ''
+            self.progress.write(buffer)
+
+    def isatty(self):
+        return self.progress.is_tty
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# run progress
+# workers only update counters, one background thread
+# renders them: a status line redrawn every interval
+# seconds on a terminal, a log line every log_interval
+# seconds otherwise (cron, redirected output).
+# units are (region, compartment, family), the eta
+# comes from units (or plan entries) done per second.
+# stdout is routed through write() until finish()
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class Progress:
+
+    def __init__(self, regions, compartments, families, total_resources=None, interval=0.25, log_interval=30, stream=None):
+        self.stream = stream or sys.stdout
+        self.is_tty = self.stream.isatty()
+        self.interval = interval if self.is_tty else log_interval
+        self.regions = regions
+        self.compartments = compartments
+        self.families = families
+        self.total_units = regions * compartments * families
+        self.total_resources = total_resources
+        self.region_units = Counter()
+        self.compartment_units = Counter()
+        self.regions_done = 0
+        self.compartments_done = 0
+        self.resources = 0
+        self.current = ''
+        self.width = 0
+        self.start = time.monotonic()
+        self.lock = threading.Lock()
+        self.output_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.stdout = None
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # counters, updated by any worker
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def unit_done(self, region_name, compartment_id):
+        with self.lock:
+            self.region_units[region_name] += 1
+            self.compartment_units[(region_name, compartment_id)] += 1
+
+            if self.compartment_units[(region_name, compartment_id)] == self.families:
+                self.compartments_done += 1
+
+            if self.region_units[region_name] == self.compartments * self.families:
+                self.regions_done += 1
+
+    # search discovery covers a whole region at once
+    def region_done(self, region_name):
+        with self.lock:
+            if self.region_units[region_name] < self.compartments * self.families:
+                self.region_units[region_name] = self.compartments * self.families
+                self.compartments_done += self.compartments
+                self.regions_done += 1
+
+    def resource(self, status=None):
+        with self.lock:
+            self.resources += 1
+
+            if status is not None:
+                self.current = status
+
+    def status(self, text):
+        self.current = text
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # counts, rate and eta
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def line(self):
+        with self.lock:
+            elapsed = max(time.monotonic() - self.start, 1e-6)
+            resources = self.resources
+
+            if self.total_resources:
+                fraction = resources / self.total_resources
+                counts = f'resources {resources}/{self.total_resources}'
+            else:
+                fraction = sum(self.region_units.values()) / self.total_units if self.total_units else 0
+                counts = f'regions {self.regions_done}/{self.regions}  compartments {self.compartments_done}/{self.regions * self.compartments}  resources {resources}'
+
+        fraction = min(fraction, 1)
+        eta = elapsed * (1 - fraction) / fraction if fraction else None
+
+        return f'{counts}  {resources / elapsed:.1f}/s  ETA {format_duration(eta)}'
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # render, output lines of workers go through write()
+    # so they never mix with the status line
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def render(self):
+        line = self.line()
+
+        with self.output_lock:
+            if self.is_tty:
+                text = f'   {line}  {self.current}'[:shutil.get_terminal_size((95, 24)).columns - 1]
+                self.stream.write('\r' + text.ljust(self.width) + '\r')
+                self.width = len(text)
+            else:
+                self.stream.write(f"{datetime.now().isoformat(timespec='seconds')} progress: {line}\n")
+
+            self.stream.flush()
+
+    def clear_line(self):
+        if self.is_tty and self.width:
+            self.stream.write('\r' + ' ' * self.width + '\r')
+            self.width = 0
+
+    def write(self, text):
+        with self.output_lock:
+            self.clear_line()
+            print(text, file=self.stream)
+
+    def renderer(self):
+        while not self.stopped.wait(self.interval):
+            self.render()
+
+    def start_renderer(self):
+        if self.stream is sys.stdout:
+            self.stdout, sys.stdout = sys.stdout, ProgressOutput(self)
+
+        self.thread = threading.Thread(target=self.renderer, daemon=True)
+        self.thread.start()
+
+    def finish(self):
+        self.stopped.set()
+
+        if self.thread:
+            self.thread.join()
+
+        if self.stdout:
+            sys.stdout.drain()
+            sys.stdout, self.stdout = self.stdout, None
+
+        with self.output_lock:
+            self.clear_line()
+            self.stream.flush()
+
+    def summary(self):
+        elapsed = time.monotonic() - self.start
+
+        with self.lock:
+            return f"{self.resources} resources in {format_duration(elapsed)}, {self.resources / max(elapsed, 1e-6):.1f}/s"
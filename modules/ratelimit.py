@@ -0,0 +1,124 @@
+# coding: utf-8
+
+import time
+import threading
+from urllib.parse import urlparse
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# adaptive token bucket
+# rate grows additively while calls succeed fast and
+# is cut multiplicatively on 429 or latency spikes (AIMD)
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class AdaptiveTokenBucket:
+
+    def __init__(self, rate=10.0, min_rate=0.5, max_rate=50.0, increase=1.0, decrease=0.5, latency_factor=3.0, min_latency=1.0):
+        self.rate = min(rate, max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.min_latency = min_latency
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.latency = None
+        self.base_latency = None
+        self.throttled = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # block until a token is available
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                self.refill()
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.requests += 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # feedback from a completed request
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def on_response(self, status, latency):
+        with self.lock:
+            self.refill()
+
+            if status == 429:
+                self.throttled += 1
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.tokens = min(self.tokens, 0.0)
+                return
+
+            # exponentially weighted latency, base is the best seen
+            # spikes under min_latency seconds are ignored as noise
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self.base_latency = self.latency if self.base_latency is None else min(self.base_latency, self.latency)
+
+            if self.latency > max(self.base_latency * self.latency_factor, self.min_latency):
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase / max(self.rate, 1.0))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# rate limiter, one bucket per (region, endpoint)
+# installed on sdk clients so every http request,
+# pagination and retries included, goes through it
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class RateLimiter:
+
+    def __init__(self, rate=10.0, max_rate=50.0):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, region, endpoint):
+        with self.lock:
+            if (region, endpoint) not in self.buckets:
+                self.buckets[(region, endpoint)] = AdaptiveTokenBucket(rate=self.rate, max_rate=self.max_rate)
+
+            return self.buckets[(region, endpoint)]
+
+    def install(self, client, region):
+        session = client.base_client.session
+        session_request = session.request
+
+        def limited_request(method, url, *args, **kwargs):
+            bucket = self.bucket(region, urlparse(url).netloc)
+            bucket.acquire()
+
+            start = time.monotonic()
+            response = session_request(method, url, *args, **kwargs)
+            bucket.on_response(response.status_code, time.monotonic() - start)
+
+            return response
+
+        session.request = limited_request
+
+        return client
+
+    def summary(self):
+        with self.lock:
+            buckets = list(self.buckets.values())
+
+        requests = sum(bucket.requests for bucket in buckets)
+        throttled = sum(bucket.throttled for bucket in buckets)
+
+        return f"{requests} requests, {throttled} throttled, {len(buckets)} endpoints"
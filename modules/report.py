@@ -0,0 +1,75 @@
+# coding: utf-8
+
+import io
+import csv
+import gzip
+import json
+import threading
+from datetime import datetime, timezone
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# report fields, one line per resource
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+report_fields = ['time', 'region', 'ad', 'compartment', 'service', 'name', 'ocid', 'action', 'latency_ms', 'error']
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# run report
+# streamed as JSON lines, or CSV when the path ends
+# with .csv (.csv.gz), gzip compressed when it ends
+# with .gz. lines are buffered and flushed every
+# flush_every lines so the report follows the run
+# without a syscall per resource
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class RunReport:
+
+    def __init__(self, path, flush_every=500):
+        self.path = path
+        self.flush_every = flush_every
+        self.is_csv = (path[:-3] if path.endswith('.gz') else path).endswith('.csv')
+        self.lock = threading.Lock()
+        self.count = 0
+        self.pending = 0
+
+        if path.endswith('.gz'):
+            self.file = io.TextIOWrapper(gzip.open(path, 'wb'), encoding='utf-8', newline='')
+        else:
+            self.file = open(path, 'w', encoding='utf-8', newline='', buffering=1024 * 1024)
+
+        if self.is_csv:
+            self.writer = csv.DictWriter(self.file, fieldnames=report_fields)
+            self.writer.writeheader()
+
+    def write(self, region, ad, compartment, service, name, ocid, action, latency=None, error=None):
+        entry = {
+            'time': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'region': region,
+            'ad': ad if ad and ad.strip() != '-' else None,
+            'compartment': compartment,
+            'service': service,
+            'name': name,
+            'ocid': ocid,
+            'action': action,
+            'latency_ms': round(latency * 1000, 1) if latency is not None else None,
+            'error': str(error) if error else None,
+            }
+
+        line = None if self.is_csv else json.dumps(entry, default=str) + '\n'
+
+        with self.lock:
+            if self.is_csv:
+                self.writer.writerow(entry)
+            else:
+                self.file.write(line)
+
+            self.count += 1
+            self.pending += 1
+
+            if self.pending >= self.flush_every:
+                self.file.flush()
+                self.pending = 0
+
+    def close(self):
+        with self.lock:
+            self.file.close()
@@ -8,9 +8,41 @@ import oci
 
 class ResourcesFinder:
 
-    def __init__(self, compartment_id, custom_retry_strategy):
+    def __init__(self, compartment_id, custom_retry_strategy, since=None):
         self.compartment_id = compartment_id
         self.custom_retry_strategy = custom_retry_strategy
+        self.since = since
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # list all results of a list call, or when since is
+    # set, newest first and stop paginating at the first
+    # resource created before since
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def list_items(self, list_method, sort_by, **kwargs):
+
+        if self.since is None:
+            yield from oci.pagination.list_call_get_all_results_generator(
+                                                                        list_method,
+                                                                        'record',
+                                                                        retry_strategy=self.custom_retry_strategy,
+                                                                        **kwargs
+                                                                        )
+            return
+
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                list_method,
+                                                                'record',
+                                                                sort_by=sort_by,
+                                                                sort_order='DESC',
+                                                                retry_strategy=self.custom_retry_strategy,
+                                                                **kwargs
+                                                                )
+
+        for item in items:
+            if item.time_created < self.since:
+                break
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active instances
@@ -19,97 +51,137 @@ class ResourcesFinder:
     def list_instances(self, core_client):
 
         desired_states=['RUNNING', 'STOPPED']
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        core_client.list_instances, 
-                                                        compartment_id=self.compartment_id, 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              core_client.list_instances,
+                              'TIMECREATED',
+                              compartment_id=self.compartment_id
+                              )
 
         for item in items:
             if (item.lifecycle_state in desired_states):
-                resources.append(item)
-
-        return resources
+                yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # get boot volume for each instance
+    # instance_id=None lists all attachments of the AD
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-    def list_instances_bootvol(self, core_client, availability_domain, instance_id):
+    def list_instances_bootvol(self, core_client, availability_domain, instance_id=None):
         
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        core_client.list_boot_volume_attachments,
-                                                        availability_domain=availability_domain, 
-                                                        compartment_id=self.compartment_id, 
-                                                        instance_id=instance_id, 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 core_client.list_boot_volume_attachments,
+                                                                 'record',
+                                                                 availability_domain=availability_domain,
+                                                                 compartment_id=self.compartment_id,
+                                                                 instance_id=instance_id,
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all boot volume backups
+    # boot_volume_id=None lists backups of all boot volumes
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-    def list_boot_volume_backups(self, blk_storage_client, boot_volume_id):
+    def list_boot_volume_backups(self, blk_storage_client, boot_volume_id=None):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        blk_storage_client.list_boot_volume_backups, 
-                                                        compartment_id=self.compartment_id, 
-                                                        boot_volume_id=boot_volume_id, 
-                                                        lifecycle_state='AVAILABLE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 blk_storage_client.list_boot_volume_backups,
+                                                                 'record',
+                                                                 compartment_id=self.compartment_id,
+                                                                 boot_volume_id=boot_volume_id,
+                                                                 lifecycle_state='AVAILABLE',
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
         
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all block volume attachement for each instance
+    # instance_id=None lists all attachments of the AD,
+    # availability_domain=None of the compartment
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-    def list_instances_volattach(self, core_client, availability_domain, instance_id):
+    def list_instances_volattach(self, core_client, availability_domain=None, instance_id=None):
         
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        core_client.list_volume_attachments,
-                                                        availability_domain=availability_domain, 
-                                                        compartment_id=self.compartment_id, 
-                                                        instance_id=instance_id, 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 core_client.list_volume_attachments,
+                                                                 'record',
+                                                                 availability_domain=availability_domain,
+                                                                 compartment_id=self.compartment_id,
+                                                                 instance_id=instance_id,
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all block volume backups
+    # volume_id=None lists backups of all volumes
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-    def list_volume_backups(self, blk_storage_client, volume_id):
+    def list_volume_backups(self, blk_storage_client, volume_id=None):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        blk_storage_client.list_volume_backups,
-                                                        compartment_id=self.compartment_id, volume_id=volume_id, 
-                                                        lifecycle_state='AVAILABLE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 blk_storage_client.list_volume_backups,
+                                                                 'record',
+                                                                 compartment_id=self.compartment_id, volume_id=volume_id,
+                                                                 lifecycle_state='AVAILABLE',
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
                 
         for item in items:
-            resources.append(item)
+            yield item
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # list all boot volumes
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def list_boot_volumes(self, blk_storage_client, availability_domain):
+
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 blk_storage_client.list_boot_volumes,
+                                                                 'record',
+                                                                 availability_domain=availability_domain,
+                                                                 compartment_id=self.compartment_id,
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
+
+        for item in items:
+            yield item
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # list all block volumes
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def list_volumes(self, blk_storage_client):
 
-        return resources
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 blk_storage_client.list_volumes,
+                                                                 'record',
+                                                                 compartment_id=self.compartment_id,
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
+
+        for item in items:
+            yield item
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # get boot volume / block volume by id
+    # return (volume, etag)
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def get_boot_volume(self, blk_storage_client, boot_volume_id):
+        response = blk_storage_client.get_boot_volume(boot_volume_id, retry_strategy=self.custom_retry_strategy)
+        return response.data, response.headers.get('etag')
+
+    def get_volume(self, blk_storage_client, volume_id):
+        response = blk_storage_client.get_volume(volume_id, retry_strategy=self.custom_retry_strategy)
+        return response.data, response.headers.get('etag')
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active buckets
@@ -117,18 +189,19 @@ class ResourcesFinder:
 
     def list_buckets(self, object_client,namespace_name):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        object_client.list_buckets, 
-                                                        namespace_name=namespace_name, 
-                                                        compartment_id=self.compartment_id, 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 object_client.list_buckets,
+                                                                 'record',
+                                                                 namespace_name=namespace_name,
+                                                                 compartment_id=self.compartment_id,
+                                                                 fields=['tags'],
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
 
+        # list_buckets can't be sorted, filter on creation time
         for item in items:
-            resources.append(item)
-        
-        return resources
+            if self.since is None or item.time_created >= self.since:
+                yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active fss
@@ -136,19 +209,16 @@ class ResourcesFinder:
 
     def list_fss(self, fss_client, ad):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        fss_client.list_file_systems, 
-                                                        compartment_id=self.compartment_id, 
-                                                        availability_domain=ad, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              fss_client.list_file_systems,
+                              'TIMECREATED',
+                              compartment_id=self.compartment_id,
+                              availability_domain=ad,
+                              lifecycle_state='ACTIVE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active load balancers
@@ -156,18 +226,15 @@ class ResourcesFinder:
 
     def list_load_balancers(self, loadbalancer_client):
         
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        loadbalancer_client.list_load_balancers, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              loadbalancer_client.list_load_balancers,
+                              'TIMECREATED',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='ACTIVE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active network load balancers
@@ -175,18 +242,15 @@ class ResourcesFinder:
 
     def list_network_load_balancers(self, networkloadbalancer_client):
         
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        networkloadbalancer_client.list_network_load_balancers, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              networkloadbalancer_client.list_network_load_balancers,
+                              'timeCreated',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='ACTIVE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active network firewalls
@@ -194,18 +258,15 @@ class ResourcesFinder:
 
     def list_network_firewalls(self, networkfw_client):
         
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        networkfw_client.list_network_firewalls, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              networkfw_client.list_network_firewalls,
+                              'timeCreated',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='ACTIVE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active database systems
@@ -213,38 +274,34 @@ class ResourcesFinder:
 
     def list_dbsystems(self, database_client):
         
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        database_client.list_db_systems, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='AVAILABLE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              database_client.list_db_systems,
+                              'TIMECREATED',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='AVAILABLE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active db_homes in database systems
+    # db_system_id=None lists all db_homes of the compartment
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-    def list_db_homes(self, database_client, db_system_id):
+    def list_db_homes(self, database_client, db_system_id=None):
         
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        database_client.list_db_homes, 
-                                                        db_system_id=db_system_id, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='AVAILABLE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 database_client.list_db_homes,
+                                                                 'record',
+                                                                 db_system_id=db_system_id,
+                                                                 compartment_id=self.compartment_id,
+                                                                 lifecycle_state='AVAILABLE',
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active databases in systems databases db_home
@@ -252,19 +309,17 @@ class ResourcesFinder:
 
     def list_databases(self, database_client, db_home_id):
         
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        database_client.list_databases, 
-                                                        db_home_id=db_home_id, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='AVAILABLE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 database_client.list_databases,
+                                                                 'record',
+                                                                 db_home_id=db_home_id,
+                                                                 compartment_id=self.compartment_id,
+                                                                 lifecycle_state='AVAILABLE',
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active autonomous databases
@@ -273,18 +328,15 @@ class ResourcesFinder:
     def list_autonomous_db(self, database_client):
 
         desired_states=['AVAILABLE','STOPPED']
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        database_client.list_autonomous_databases, 
-                                                        compartment_id=self.compartment_id, 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              database_client.list_autonomous_databases,
+                              'TIMECREATED',
+                              compartment_id=self.compartment_id
+                              )
 
         for item in items:
             if (item.lifecycle_state in desired_states):
-                resources.append(item)
-
-        return resources
+                yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active mysql databases
@@ -293,19 +345,16 @@ class ResourcesFinder:
     def list_mysql_db(self, mysql_client):
 
         desired_states=['ACTIVE','INACTIVE']
-        resources=[]
 
-        items=oci.pagination.list_call_get_all_results(
-                                                        mysql_client.list_db_systems, 
-                                                        compartment_id=self.compartment_id, 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              mysql_client.list_db_systems,
+                              'timeCreated',
+                              compartment_id=self.compartment_id
+                              )
 
         for item in items:
             if (item.lifecycle_state in desired_states):
-                resources.append(item)
-
-        return resources
+                yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active nosql databases
@@ -313,18 +362,15 @@ class ResourcesFinder:
 
     def list_nosql_db(self, nosql_client):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        nosql_client.list_tables, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              nosql_client.list_tables,
+                              'timeCreated',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='ACTIVE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active opensearch clusters
@@ -332,18 +378,15 @@ class ResourcesFinder:
 
     def list_opensearch_clusters(self, opensearch_client):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        opensearch_client.list_opensearch_clusters, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              opensearch_client.list_opensearch_clusters,
+                              'timeCreated',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='ACTIVE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active cloud Exadata infrastructure on dedicated Exadata
@@ -351,58 +394,53 @@ class ResourcesFinder:
 
     def list_cloud_exadata_infrastructures(self, database_client):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        database_client.list_cloud_exadata_infrastructures, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='AVAILABLE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              database_client.list_cloud_exadata_infrastructures,
+                              'TIMECREATED',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='AVAILABLE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active Autonomous Exadata VM clusters in the Oracle cloud
+    # cloud_exadata_infrastructure_id=None lists all of the compartment
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-    def list_cloud_autonomous_vm_clusters(self, database_client, cloud_exadata_infrastructure_id):
+    def list_cloud_autonomous_vm_clusters(self, database_client, cloud_exadata_infrastructure_id=None):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        database_client.list_cloud_autonomous_vm_clusters, 
-                                                        compartment_id=self.compartment_id, 
-                                                        cloud_exadata_infrastructure_id=cloud_exadata_infrastructure_id, 
-                                                        lifecycle_state='AVAILABLE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 database_client.list_cloud_autonomous_vm_clusters,
+                                                                 'record',
+                                                                 compartment_id=self.compartment_id,
+                                                                 cloud_exadata_infrastructure_id=cloud_exadata_infrastructure_id,
+                                                                 lifecycle_state='AVAILABLE',
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active Exadata VM clusters in the Oracle cloud
+    # cloud_exadata_infrastructure_id=None lists all of the compartment
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-    def list_cloud_vm_clusters(self, database_client, cloud_exadata_infrastructure_id):
+    def list_cloud_vm_clusters(self, database_client, cloud_exadata_infrastructure_id=None):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        database_client.list_cloud_vm_clusters, 
-                                                        compartment_id=self.compartment_id, 
-                                                        cloud_exadata_infrastructure_id=cloud_exadata_infrastructure_id, 
-                                                        lifecycle_state='AVAILABLE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 database_client.list_cloud_vm_clusters,
+                                                                 'record',
+                                                                 compartment_id=self.compartment_id,
+                                                                 cloud_exadata_infrastructure_id=cloud_exadata_infrastructure_id,
+                                                                 lifecycle_state='AVAILABLE',
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active analytics instances
@@ -411,18 +449,15 @@ class ResourcesFinder:
     def list_analytics(self, analytics_client):
 
         desired_states=['ACTIVE', 'INACTIVE']
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        analytics_client.list_analytics_instances,
-                                                        compartment_id=self.compartment_id, 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              analytics_client.list_analytics_instances,
+                              'timeCreated',
+                              compartment_id=self.compartment_id
+                              )
 
         for item in items:
             if (item.lifecycle_state in desired_states):
-                resources.append(item)
-
-        return resources
+                yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active bigdata instances
@@ -430,18 +465,15 @@ class ResourcesFinder:
 
     def list_bds(self, bds_client):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        bds_client.list_bds_instances, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              bds_client.list_bds_instances,
+                              'timeCreated',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='ACTIVE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active data catalogs
@@ -449,18 +481,15 @@ class ResourcesFinder:
 
     def list_catalogs(self, data_catalog_client):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        data_catalog_client.list_catalogs, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              data_catalog_client.list_catalogs,
+                              'TIMECREATED',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='ACTIVE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active data integration workspaces
@@ -469,18 +498,15 @@ class ResourcesFinder:
     def list_workspaces(self, data_integration_client):
 
         desired_states=['ACTIVE', 'STOPPED']
-        resources=[]
-        items=oci.pagination.list_call_get_all_results( 
-                                                        data_integration_client.list_workspaces, 
-                                                        compartment_id=self.compartment_id, 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              data_integration_client.list_workspaces,
+                              'TIME_CREATED',
+                              compartment_id=self.compartment_id
+                              )
 
         for item in items:
             if (item.lifecycle_state in desired_states):
-                resources.append(item)
-
-        return resources
+                yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active function applications
@@ -488,18 +514,15 @@ class ResourcesFinder:
 
     def list_functions_app(self, function_client):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        function_client.list_applications, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              function_client.list_applications,
+                              'timeCreated',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='ACTIVE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active functions
@@ -507,18 +530,16 @@ class ResourcesFinder:
 
     def list_functions(self, function_client, function_app_id):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        function_client.list_functions, 
-                                                        application_id=function_app_id, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=oci.pagination.list_call_get_all_results_generator(
+                                                                 function_client.list_functions,
+                                                                 'record',
+                                                                 application_id=function_app_id,
+                                                                 lifecycle_state='ACTIVE',
+                                                                 retry_strategy=self.custom_retry_strategy
+                                                                 )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active container instances
@@ -527,18 +548,15 @@ class ResourcesFinder:
     def list_container_instances(self, container_client):
 
         desired_states=['ACTIVE', 'INACTIVE']
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        container_client.list_container_instances, 
-                                                        compartment_id=self.compartment_id, 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              container_client.list_container_instances,
+                              'timeCreated',
+                              compartment_id=self.compartment_id
+                              )
 
         for item in items:
             if (item.lifecycle_state in desired_states):
-                resources.append(item)
-
-        return resources
+                yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active artifacts
@@ -546,18 +564,15 @@ class ResourcesFinder:
 
     def list_repositories(self, artifact_client):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        artifact_client.list_repositories, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='AVAILABLE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              artifact_client.list_repositories,
+                              'TIMECREATED',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='AVAILABLE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active meshes
@@ -565,18 +580,15 @@ class ResourcesFinder:
 
     def list_meshes(self, mesh_client):
 
-        resources=[]
-        items=oci.pagination.list_call_get_all_results(
-                                                        mesh_client.list_meshes, 
-                                                        compartment_id=self.compartment_id, 
-                                                        lifecycle_state='ACTIVE', 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              mesh_client.list_meshes,
+                              'timeCreated',
+                              compartment_id=self.compartment_id,
+                              lifecycle_state='ACTIVE'
+                              )
 
         for item in items:
-            resources.append(item)
-
-        return resources
+            yield item
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - -
     # list all active visual builder instances
@@ -585,17 +597,14 @@ class ResourcesFinder:
     def list_vb_instances(self, visual_builder_client):
 
         # vb instances must be running to update tags
-        resources=[]
         desired_states=['ACTIVE', 'INACTIVE']
 
-        items=oci.pagination.list_call_get_all_results(
-                                                        visual_builder_client.list_vb_instances, 
-                                                        compartment_id=self.compartment_id, 
-                                                        retry_strategy=self.custom_retry_strategy
-                                                        ).data
+        items=self.list_items(
+                              visual_builder_client.list_vb_instances,
+                              'timeCreated',
+                              compartment_id=self.compartment_id
+                              )
 
         for item in items:
             if (item.lifecycle_state in desired_states):
-                resources.append(item)
-
-        return resources
\ No newline at end of file
+                yield item
\ No newline at end of file
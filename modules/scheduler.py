@@ -0,0 +1,97 @@
+# coding: utf-8
+
+import threading
+from collections import deque
+from datetime import datetime
+
+from modules.utils import red
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# work stealing scheduler
+# each worker owns a deque of work units, pops from
+# its head and, once empty, steals from the tail of
+# the busiest other worker
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class WorkStealingScheduler:
+
+    def __init__(self, workers):
+        self.workers = max(1, workers)
+        self.queues = [deque() for _ in range(self.workers)]
+        self.locks = [threading.Lock() for _ in range(self.workers)]
+        self.done = 0
+        self.failed = 0
+        self.stolen = 0
+        self.elapsed = 0
+        self.stats_lock = threading.Lock()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # spread units round robin over worker queues
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def submit(self, units):
+        for index, unit in enumerate(units):
+            self.queues[index % self.workers].append(unit)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # get next unit: own queue first, then steal
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def next_unit(self, worker_id):
+        with self.locks[worker_id]:
+            if self.queues[worker_id]:
+                return self.queues[worker_id].popleft()
+
+        victims = sorted(
+                        (index for index in range(self.workers) if index != worker_id),
+                        key=lambda index: len(self.queues[index]),
+                        reverse=True
+                        )
+
+        for victim in victims:
+            with self.locks[victim]:
+                if self.queues[victim]:
+                    with self.stats_lock:
+                        self.stolen += 1
+                    return self.queues[victim].pop()
+
+        return None
+
+    def worker(self, worker_id, handler):
+        while True:
+            unit = self.next_unit(worker_id)
+
+            if unit is None:
+                return
+
+            try:
+                handler(unit)
+                with self.stats_lock:
+                    self.done += 1
+
+            except Exception as e:
+                print(red(f'\n work unit:{unit}\n {e}\n'))
+                with self.stats_lock:
+                    self.failed += 1
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # run all submitted units, return when queues are empty
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def run(self, handler):
+        start = datetime.now()
+        threads = [threading.Thread(target=self.worker, args=(worker_id, handler), daemon=True) for worker_id in range(self.workers)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.elapsed = (datetime.now() - start).total_seconds()
+
+    def units_per_second(self):
+        if not self.elapsed:
+            return 0.0
+
+        return (self.done + self.failed) / self.elapsed
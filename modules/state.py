@@ -0,0 +1,125 @@
+# coding: utf-8
+
+import json
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# hash defined tags, key order independent
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def tags_hash(defined_tags):
+    payload = json.dumps(defined_tags or {}, sort_keys=True, default=str)
+
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# local state of applied tags per OCID
+# sqlite in WAL mode, one connection per thread so
+# region/unit workers can read and write concurrently
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class StateStore:
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+        self.connection().executescript('''
+            CREATE TABLE IF NOT EXISTS applied_tags (
+                ocid TEXT PRIMARY KEY,
+                resource_type TEXT,
+                region TEXT,
+                tag_value TEXT,
+                tags_hash TEXT,
+                updated TEXT,
+                last_seen TEXT
+            );
+            CREATE TABLE IF NOT EXISTS watermarks (
+                name TEXT PRIMARY KEY,
+                value TEXT
+            );
+            ''')
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=30000')
+            self.local.conn = conn
+
+        return conn
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # True when ocid was tagged with tag_value and, if
+    # given, its defined tags did not change since
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def is_current(self, ocid, tag_value, defined_tags=None):
+        row = self.connection().execute(
+                    'SELECT tag_value, tags_hash FROM applied_tags WHERE ocid = ?',
+                    (ocid,)
+                    ).fetchone()
+
+        if row is None or row[0] != tag_value:
+            return False
+
+        if defined_tags is not None and row[1] != tags_hash(defined_tags):
+            return False
+
+        self.connection().execute(
+                    'UPDATE applied_tags SET last_seen = ? WHERE ocid = ?',
+                    (datetime.now(timezone.utc).isoformat(), ocid)
+                    )
+
+        return True
+
+    def record(self, ocid, resource_type, region, tag_value, defined_tags):
+        now = datetime.now(timezone.utc).isoformat()
+
+        self.connection().execute(
+                    'INSERT OR REPLACE INTO applied_tags VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (ocid, resource_type, region, tag_value, tags_hash(defined_tags), now, now)
+                    )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # run watermarks, stored as ISO 8601 timestamps
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def get_watermark(self, name):
+        row = self.connection().execute('SELECT value FROM watermarks WHERE name = ?', (name,)).fetchone()
+
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def set_watermark(self, name, value):
+        self.connection().execute('INSERT OR REPLACE INTO watermarks VALUES (?, ?)', (name, value.isoformat()))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # drop entries not seen for max_age_days, then
+    # checkpoint the WAL and vacuum the database file
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def compact(self, max_age_days=30):
+        conn = self.connection()
+        limit = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).isoformat()
+
+        deleted = conn.execute('DELETE FROM applied_tags WHERE last_seen < ?', (limit,)).rowcount
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        conn.execute('VACUUM')
+
+        return deleted
+
+    def count(self):
+        return self.connection().execute('SELECT COUNT(*) FROM applied_tags').fetchone()[0]
+
+    def close(self):
+        conn = getattr(self.local, 'conn', None)
+
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
@@ -1,6 +1,10 @@
 # coding: utf-8
 
 import oci
+import copy
+import functools
+import threading
+from collections import Counter
 from modules.utils import red
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -24,14 +28,203 @@ custom_retry_strategy = oci.retry.RetryStrategyBuilder(
     backoff_type=oci.retry.BACKOFF_FULL_JITTER_EQUAL_ON_THROTTLE_VALUE
     ).get_retry_strategy()
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# build desired defined tags from the current ones
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def set_defined_tag(defined_tags, tag_namespace, tag_key, tag_value):
+    defined_tags_dict = copy.deepcopy(defined_tags or {})
+    defined_tags_dict.setdefault(tag_namespace, {})[tag_key] = tag_value
+
+    return defined_tags_dict
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# keys of desired tags that differ from current ones,
+# set again on the latest tags after a concurrent update
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def changed_tags(current_tags, defined_tags_dict):
+    current_tags = current_tags or {}
+
+    return {
+        namespace: {key: value for key, value in keys.items() if current_tags.get(namespace, {}).get(key) != value}
+        for namespace, keys in defined_tags_dict.items()
+        }
+
+def merge_tags(defined_tags, changes):
+    defined_tags_dict = copy.deepcopy(defined_tags or {})
+
+    for namespace, keys in changes.items():
+        defined_tags_dict.setdefault(namespace, {}).update(keys)
+
+    return defined_tags_dict
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# count tagged, skipped and failed resources of a run
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class TaggingStats:
+
+    def __init__(self):
+        self.counts = Counter()
+        self.lock = threading.Lock()
+
+    def count(self, action):
+        with self.lock:
+            self.counts[action] += 1
+
+    def summary(self):
+        with self.lock:
+            summary = f"{self.counts['tagged']} tagged, {self.counts['skipped']} skipped, {self.counts['failed']} failed"
+
+            if self.counts['planned']:
+                summary += f", {self.counts['planned']} planned"
+
+            return summary
+
+tagging_stats = TaggingStats()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# compare desired vs current tags before any update
+# tag methods accept current_tags=, return None when
+# the resource already carries the desired tags.
+# etag= (from discovery) and current_tags are given to
+# the conditional tag methods only
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def skip_unchanged(tag_method):
+
+    @functools.wraps(tag_method)
+    def wrapper(self, *args, current_tags=None, etag=None):
+        defined_tags_dict = args[-1]
+
+        if current_tags is not None and defined_tags_dict == current_tags:
+            tagging_stats.count('skipped')
+            return None
+
+        self.last_error = None
+
+        if tag_method.__name__ in conditional_tag_methods:
+            response = tag_method(self, *args, etag=etag, current_tags=current_tags)
+        else:
+            response = tag_method(self, *args)
+        tagging_stats.count('failed' if response == '' else 'tagged')
+
+        return response
+
+    return wrapper
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# client method reading the latest tags of a resource
+# updated by a tag method, used when applying a plan
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+tag_getters = {
+    'tag_instance_resource': 'get_instance',
+    'tag_bootvolume_resource': 'get_boot_volume',
+    'tag_volume_resource': 'get_volume',
+    'tag_boot_backup_resource': 'get_boot_volume_backup',
+    'tag_volume_backup_resource': 'get_volume_backup',
+    'tag_fss_resource': 'get_file_system',
+    'tag_bucket_resource': 'get_bucket',
+    'tag_lb_resource': 'get_load_balancer',
+    'tag_nlb_resource': 'get_network_load_balancer',
+    'tag_networkfw_resource': 'get_network_firewall',
+    'tag_dbsystem_resource': 'get_db_system',
+    'tag_dbsys_db_resource': 'get_database',
+    'tag_autonomous_resource': 'get_autonomous_database',
+    'tag_mysql_resource': 'get_db_system',
+    'tag_nosql_resource': 'get_table',
+    'tag_opensearch_resource': 'get_opensearch_cluster',
+    'tag_exa_infra_resource': 'get_cloud_exadata_infrastructure',
+    'tag_auto_vm_cluster_resource': 'get_cloud_autonomous_vm_cluster',
+    'tag_cloud_vm_cluster_resource': 'get_cloud_vm_cluster',
+    'tag_analytics_resource': 'get_analytics_instance',
+    'tag_bigdata_resource': 'get_bds_instance',
+    'tag_data_catalog_resource': 'get_catalog',
+    'tag_data_integration_resource': 'get_workspace',
+    'tag_function_app_resource': 'get_application',
+    'tag_function_resource': 'get_function',
+    'tag_container_resource': 'get_container_instance',
+    'tag_artifact_resource': 'get_repository',
+    'tag_mesh_resource': 'get_mesh',
+    'tag_visual_builder_resource': 'get_vb_instance',
+    }
+
+# tag methods updating through update_if_match
+conditional_tag_methods = {'tag_bootvolume_resource', 'tag_volume_resource', 'tag_nosql_resource'}
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 # OCI tag resources class
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 class ResourcesTagger:
-    def __init__(self, oci_client):
+    def __init__(self, oci_client, printer=print):
         self.oci_client = oci_client
+        self.printer = printer
+        self.last_error = None
+
+    # failed update: '' is returned, the error is kept for
+    # the run report (one tagger per thread and client)
+    def failed(self, error):
+        self.printer(red(error))
+        self.last_error = error
+
+        return ''
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # single tag update, conditional (if-match) on the
+    # etag from discovery. without etag (listed volumes,
+    # nosql tables) the resource is read first; on 412 it
+    # changed since, it is read again. after a read, the
+    # keys defined_tags_dict changes on current_tags (the
+    # tags it was built from) are set on the latest tags
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def update_if_match(self, update_method, get_method, details_model, resource_id, defined_tags_dict, etag, current_tags):
+        changes = changed_tags(current_tags, defined_tags_dict)
+
+        if etag is not None:
+            try:
+                return update_method(
+                                    resource_id,
+                                    details_model(defined_tags=defined_tags_dict),
+                                    if_match=etag,
+                                    retry_strategy=custom_retry_strategy
+                                    )
+            except oci.exceptions.ServiceError as e:
+                if e.status != 412:
+                    raise
+
+        for attempt in range(2):
+            latest = get_method(resource_id, retry_strategy=custom_retry_strategy)
 
+            try:
+                return update_method(
+                                    resource_id,
+                                    details_model(defined_tags=merge_tags(latest.data.defined_tags, changes)),
+                                    if_match=latest.headers.get('etag'),
+                                    retry_strategy=custom_retry_strategy
+                                    )
+            except oci.exceptions.ServiceError as e:
+                if e.status != 412 or attempt:
+                    raise
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # latest (defined_tags, etag) of a resource, tag_args
+    # and resource id as given to tag_method
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def latest_tags(self, tag_method, *args):
+        # workspaces are read by id, their name is only an update argument
+        if tag_method == 'tag_data_integration_resource':
+            args = args[-1:]
+
+        response = getattr(self.oci_client, tag_getters[tag_method])(*args, retry_strategy=custom_retry_strategy)
+
+        return response.data.defined_tags, response.headers.get('etag')
+
+    @skip_unchanged
     def tag_instance_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.core.models.UpdateInstanceDetails(defined_tags=defined_tags_dict)
@@ -40,59 +233,45 @@ class ResourcesTagger:
                                                        details, 
                                                        retry_strategy=custom_retry_strategy)
         except Exception as e:
-            print(red(e))
-            response = ''
+            response = self.failed(e)
 
         return response
 
-    def tag_bootvolume_resource(self, resource_id, defined_tags_dict):
+    @skip_unchanged
+    def tag_bootvolume_resource(self, resource_id, defined_tags_dict, etag=None, current_tags=None):
         try:
-            # remove tags before update, if any
-            try:
-                details = oci.core.models.UpdateBootVolumeDetails(defined_tags={})
-                response = self.oci_client.update_boot_volume(
-                                                                resource_id, 
-                                                                details, 
-                                                                retry_strategy=custom_retry_strategy)
-            except Exception:
-                pass
-
-            details = oci.core.models.UpdateBootVolumeDetails(defined_tags=defined_tags_dict)
-            response = self.oci_client.update_boot_volume(
-                                                            resource_id, 
-                                                            details, 
-                                                            retry_strategy=custom_retry_strategy)
+            response = self.update_if_match(
+                                            self.oci_client.update_boot_volume,
+                                            self.oci_client.get_boot_volume,
+                                            oci.core.models.UpdateBootVolumeDetails,
+                                            resource_id,
+                                            defined_tags_dict,
+                                            etag,
+                                            current_tags
+                                            )
         except Exception as e:
-            print(red(e))
-            response = ''
+            response = self.failed(e)
 
         return response
 
-    def tag_volume_resource(self, resource_id, defined_tags_dict):
+    @skip_unchanged
+    def tag_volume_resource(self, resource_id, defined_tags_dict, etag=None, current_tags=None):
         try:
-            # remove tags before update, if any
-            try:
-                details = oci.core.models.UpdateVolumeDetails(defined_tags={})
-                response = self.oci_client.update_volume(
-                                                    resource_id, 
-                                                    details, 
-                                                    retry_strategy=custom_retry_strategy
-                                                    )
-            except Exception:
-                pass
-
-            details = oci.core.models.UpdateVolumeDetails(defined_tags=defined_tags_dict)
-            response = self.oci_client.update_volume(
-                                                resource_id, 
-                                                details, 
-                                                retry_strategy=custom_retry_strategy
-                                                )
+            response = self.update_if_match(
+                                            self.oci_client.update_volume,
+                                            self.oci_client.get_volume,
+                                            oci.core.models.UpdateVolumeDetails,
+                                            resource_id,
+                                            defined_tags_dict,
+                                            etag,
+                                            current_tags
+                                            )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_boot_backup_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.core.models.UpdateBootVolumeBackupDetails(defined_tags=defined_tags_dict)
@@ -102,11 +281,11 @@ class ResourcesTagger:
                                                             retry_strategy=custom_retry_strategy
                                                             )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_volume_backup_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.core.models.UpdateVolumeBackupDetails(defined_tags=defined_tags_dict)
@@ -116,11 +295,11 @@ class ResourcesTagger:
                                                        retry_strategy=custom_retry_strategy
                                                        )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_fss_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.file_storage.models.UpdateFileSystemDetails(defined_tags=defined_tags_dict)
@@ -129,14 +308,12 @@ class ResourcesTagger:
                                                     retry_strategy=custom_retry_strategy
                                                     )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
-    def tag_bucket_resource(self, resource_name, defined_tags_dict):
-        namespace_name=self.oci_client.get_namespace().data
-
+    @skip_unchanged
+    def tag_bucket_resource(self, namespace_name, resource_name, defined_tags_dict):
         try:
             details = oci.object_storage.models.UpdateBucketDetails(defined_tags=defined_tags_dict)
             response = self.oci_client.update_bucket(
@@ -146,11 +323,11 @@ class ResourcesTagger:
                                                 retry_strategy=custom_retry_strategy
                                                 )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_lb_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.load_balancer.models.UpdateLoadBalancerDetails(defined_tags=defined_tags_dict)
@@ -159,11 +336,11 @@ class ResourcesTagger:
                                                        resource_id
                                                        )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_nlb_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.network_load_balancer.models.UpdateNetworkLoadBalancerDetails(defined_tags=defined_tags_dict)
@@ -172,19 +349,12 @@ class ResourcesTagger:
                                                                     details, 
                                                                     retry_strategy=custom_retry_strategy
                                                                     )
-            oci.wait_until(
-                            self.oci_client, 
-                            self.oci_client.get_network_load_balancer(resource_id), 
-                            'lifecycle_state', 
-                            'ACTIVE', 
-                            max_wait_seconds=600
-                            ).data
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_networkfw_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.network_firewall.models.UpdateNetworkFirewallDetails(defined_tags=defined_tags_dict)
@@ -194,11 +364,11 @@ class ResourcesTagger:
                                                           retry_strategy=custom_retry_strategy
                                                           )
         except Exception as e:
-            print(red(e.message))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_dbsystem_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.database.models.UpdateDbSystemDetails(defined_tags=defined_tags_dict)
@@ -208,11 +378,11 @@ class ResourcesTagger:
                                                    retry_strategy=custom_retry_strategy
                                                    )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_dbsys_db_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.database.models.UpdateDatabaseDetails(defined_tags=defined_tags_dict)
@@ -222,11 +392,11 @@ class ResourcesTagger:
                                                   retry_strategy=custom_retry_strategy
                                                   )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_autonomous_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.database.models.UpdateAutonomousDatabaseDetails(defined_tags=defined_tags_dict)
@@ -236,11 +406,11 @@ class ResourcesTagger:
                                                              retry_strategy=custom_retry_strategy
                                                              )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_mysql_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.mysql.models.UpdateDbSystemDetails(defined_tags=defined_tags_dict)
@@ -250,36 +420,28 @@ class ResourcesTagger:
                                                    retry_strategy=custom_retry_strategy
                                                    )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
-    def tag_nosql_resource(self, resource_id, defined_tags_dict):
+    @skip_unchanged
+    def tag_nosql_resource(self, resource_id, defined_tags_dict, etag=None, current_tags=None):
         try:
-            # remove tags before update, if any
-            try:
-                details = oci.nosql.models.UpdateTableDetails(defined_tags={})
-                response = self.oci_client.update_table(
-                                                resource_id, 
-                                                details, 
-                                                retry_strategy=custom_retry_strategy
-                                                )
-            except Exception:
-                pass
-        
-            details = oci.nosql.models.UpdateTableDetails(defined_tags=defined_tags_dict)
-            response = self.oci_client.update_table(
-                                                resource_id, 
-                                                details, 
-                                                retry_strategy=custom_retry_strategy
-                                                )
+            response = self.update_if_match(
+                                            self.oci_client.update_table,
+                                            self.oci_client.get_table,
+                                            oci.nosql.models.UpdateTableDetails,
+                                            resource_id,
+                                            defined_tags_dict,
+                                            etag,
+                                            current_tags
+                                            )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_opensearch_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.opensearch.models.UpdateOpensearchClusterDetails(defined_tags=defined_tags_dict)
@@ -289,11 +451,11 @@ class ResourcesTagger:
                                                             retry_strategy=custom_retry_strategy
                                                             )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_exa_infra_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.database.models.UpdateCloudExadataInfrastructureDetails(defined_tags=defined_tags_dict)
@@ -303,11 +465,11 @@ class ResourcesTagger:
                                                                       retry_strategy=custom_retry_strategy
                                                                       )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_auto_vm_cluster_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.database.models.UpdateCloudAutonomousVmClusterDetails(defined_tags=defined_tags_dict)
@@ -317,11 +479,11 @@ class ResourcesTagger:
                                                                      retry_strategy=custom_retry_strategy
                                                                      )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_cloud_vm_cluster_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.database.models.UpdateCloudVmClusterDetails(defined_tags=defined_tags_dict)
@@ -331,11 +493,11 @@ class ResourcesTagger:
                                                           retry_strategy=custom_retry_strategy
                                                           )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_analytics_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.analytics.models.UpdateAnalyticsInstanceDetails(defined_tags=defined_tags_dict)
@@ -345,11 +507,11 @@ class ResourcesTagger:
                                                             retry_strategy=custom_retry_strategy
                                                             )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_bigdata_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.bds.models.UpdateBdsInstanceDetails(defined_tags=defined_tags_dict)
@@ -359,11 +521,11 @@ class ResourcesTagger:
                                                       retry_strategy=custom_retry_strategy
                                                       )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_data_catalog_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.data_catalog.models.UpdateCatalogDetails(defined_tags=defined_tags_dict)
@@ -373,11 +535,11 @@ class ResourcesTagger:
                                                  retry_strategy=custom_retry_strategy
                                                  )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
        
+    @skip_unchanged
     def tag_data_integration_resource(self, resource_name, resource_id, defined_tags_dict):
 
         # submit 2 attributes as a workaround, crashs if only one submitted (oci v2.105.0)
@@ -389,11 +551,11 @@ class ResourcesTagger:
                                                    details
                                                    )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_function_app_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.functions.models.UpdateApplicationDetails(defined_tags=defined_tags_dict)
@@ -403,11 +565,11 @@ class ResourcesTagger:
                                                      retry_strategy=custom_retry_strategy
                                                      )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_function_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.functions.models.UpdateFunctionDetails(defined_tags=defined_tags_dict)
@@ -417,11 +579,11 @@ class ResourcesTagger:
                                                   retry_strategy=custom_retry_strategy
                                                   )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_container_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.container_instances.models.UpdateContainerInstanceDetails(defined_tags=defined_tags_dict)
@@ -431,11 +593,11 @@ class ResourcesTagger:
                                                             retry_strategy=custom_retry_strategy
                                                             )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_artifact_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.artifacts.models.UpdateRepositoryDetails(defined_tags=defined_tags_dict)
@@ -445,11 +607,11 @@ class ResourcesTagger:
                                                     retry_strategy=custom_retry_strategy
                                                     )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_mesh_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.service_mesh.models.UpdateMeshDetails(defined_tags=defined_tags_dict)
@@ -459,11 +621,11 @@ class ResourcesTagger:
                                                retry_strategy=custom_retry_strategy
                                                )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
+    @skip_unchanged
     def tag_visual_builder_resource(self, resource_id, defined_tags_dict):
         try:
             details = oci.visual_builder.models.UpdateVbInstanceDetails(defined_tags=defined_tags_dict)
@@ -473,8 +635,7 @@ class ResourcesTagger:
                                                      retry_strategy=custom_retry_strategy
                                                     )
         except Exception as e:
-            print(red(e))
-            response=''
+            response = self.failed(e)
 
         return response
 
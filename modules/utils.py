@@ -107,7 +107,7 @@ def print_error(*args, color=red, level='ERROR'):
 # print formated output 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-def print_output(data):
+def print_output(data, printer=print):
 
     color = data.get('color')
     region = data.get('region')
@@ -123,7 +123,14 @@ def print_output(data):
         f'{service:20}'
         f'{obj_name[0:18]:20}'
     )
-    print(formatted_string)
+    printer(formatted_string)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# print resource error
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def print_resource_error(region, compartment, obj_name, obj_id, error, printer=print):
+    printer(red(f'\n region:{region}\n compartment:{compartment}\n name:{obj_name}\n ocid:{obj_id}\n {error}\n'))
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 # calculate time delta
@@ -0,0 +1,117 @@
+# coding: utf-8
+
+import time
+import heapq
+import itertools
+import threading
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# pending lifecycle transition of a resource
+# poll() returns the latest resource (or work request),
+# done(data) tells whether the transition completed
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class Transition:
+
+    def __init__(self, region, compartment, obj_name, obj_id, poll, done, max_wait_seconds, interval):
+        self.region = region
+        self.compartment = compartment
+        self.obj_name = obj_name
+        self.obj_id = obj_id
+        self.poll = poll
+        self.done = done
+        self.deadline = time.monotonic() + max_wait_seconds
+        self.interval = interval
+        self.error = None
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# lifecycle waiter
+# transitions are polled by one background thread with
+# exponential backoff, so taggers move on right after
+# the update; each region is reconciled once analyzed
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class LifecycleWaiter:
+
+    def __init__(self, base_interval=2.0, max_interval=30.0):
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.queue = []
+        self.sequence = itertools.count()
+        self.pending = {}
+        self.finished = []
+        self.completed = 0
+        self.failed = 0
+        self.condition = threading.Condition()
+        self.thread = None
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # track a transition, return immediately
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def watch(self, region, compartment, obj_name, obj_id, poll, done, max_wait_seconds=600):
+        transition = Transition(region, compartment, obj_name, obj_id, poll, done, max_wait_seconds, self.base_interval)
+
+        with self.condition:
+            heapq.heappush(self.queue, (time.monotonic() + transition.interval, next(self.sequence), transition))
+            self.pending[region] = self.pending.get(region, 0) + 1
+
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.poller, daemon=True)
+                self.thread.start()
+
+            self.condition.notify_all()
+
+    def poller(self):
+        while True:
+            with self.condition:
+                while not self.queue or self.queue[0][0] > time.monotonic():
+                    self.condition.wait(timeout=self.queue[0][0] - time.monotonic() if self.queue else None)
+
+                _, _, transition = heapq.heappop(self.queue)
+
+            try:
+                finished = transition.done(transition.poll())
+
+                if not finished and time.monotonic() >= transition.deadline:
+                    transition.error = 'timed out waiting for lifecycle transition'
+                    finished = True
+
+            except Exception as e:
+                transition.error = e
+                finished = True
+
+            with self.condition:
+                if finished:
+                    self.pending[transition.region] -= 1
+                    self.finished.append(transition)
+
+                    if transition.error is None:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+
+                else:
+                    transition.interval = min(self.max_interval, transition.interval * 2)
+                    heapq.heappush(self.queue, (time.monotonic() + transition.interval, next(self.sequence), transition))
+
+                self.condition.notify_all()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # block until transitions of a region (or all regions)
+    # complete, return the failed ones
+    # - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def wait(self, region=None):
+        with self.condition:
+            while any(count for name, count in self.pending.items() if region is None or name == region):
+                self.condition.wait()
+
+            failed = [transition for transition in self.finished if transition.error is not None and region in (None, transition.region)]
+            self.finished = [transition for transition in self.finished if region not in (None, transition.region)]
+
+        return failed
+
+    def summary(self):
+        with self.condition:
+            return f"{self.completed} completed, {self.failed} failed"
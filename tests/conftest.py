@@ -0,0 +1,69 @@
+# coding: utf-8
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# shared fixtures
+#
+# tests run offline: OCI-TagByName.py runs end to end
+# against the in-process fake oci backend
+# (benchmarks/fake_oci.py) on small seeded tenancies
+# (benchmarks/tenancy.py). requires the oci SDK installed
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+import os
+import sys
+import runpy
+
+import pytest
+
+repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+script_path = os.path.join(repo_path, 'OCI-TagByName.py')
+sys.path.insert(0, repo_path)
+
+from benchmarks import fake_oci
+from benchmarks.tenancy import generate
+from modules.tagging import tagging_stats
+from modules.discovery import search_stats
+
+# a compartment with two instances (boot volume, block volume
+# and their backups) and a bucket
+small_shape = {
+    'depth': 1,
+    'fan_out': 1,
+    'regions': 1,
+    'instances': 2,
+    'db_homes': 0,
+    'buckets': 1,
+    'services': 0,
+    }
+
+@pytest.fixture
+def tenancy():
+    return generate(0, **small_shape)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# run OCI-TagByName.py on a tenancy, return the fake
+# backend of the run (backend.updated: OCIDs updated).
+# run counters are module globals, reset before a run
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+@pytest.fixture
+def tag_by_name(monkeypatch):
+
+    def run(tenancy, *arguments):
+        backend = fake_oci.FakeBackend(tenancy, latency=0, transition_seconds=0.01)
+        fake_oci.install(backend)
+
+        tagging_stats.counts.clear()
+        search_stats.counts.clear()
+
+        monkeypatch.setattr(sys, 'argv', [script_path, '-cf', '-q', '-tn', tenancy.tag_namespace, '-tk', tenancy.tag_key, *arguments])
+
+        try:
+            runpy.run_path(script_path, run_name='__main__')
+        except SystemExit as e:
+            if e.code:
+                raise
+
+        return backend
+
+    return run
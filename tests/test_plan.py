@@ -0,0 +1,101 @@
+# coding: utf-8
+
+import json
+
+from modules.plan import PlanWriter, ApplyJournal, read_plan, count_plan, parse_shard
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# plan sharding
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def write_plan(path, count):
+    writer = PlanWriter(str(path))
+
+    for index in range(count):
+        writer.write({'ocid': f'ocid-{index}'})
+
+    writer.close()
+
+    return str(path)
+
+def test_shards_partition_the_plan(tmp_path):
+    plan_path = write_plan(tmp_path / 'plan.jsonl', 10)
+    shards = [[entry['ocid'] for entry in read_plan(plan_path, (index, 3))] for index in range(3)]
+
+    assert sorted(sum(shards, [])) == sorted(f'ocid-{index}' for index in range(10))
+    assert shards[1] == ['ocid-1', 'ocid-4', 'ocid-7']
+    assert [count_plan(plan_path, (index, 3)) for index in range(3)] == [4, 3, 3]
+
+def test_blank_lines_are_skipped(tmp_path):
+    plan_path = tmp_path / 'plan.jsonl'
+    plan_path.write_text(json.dumps({'ocid': 'a'}) + '\n\n' + json.dumps({'ocid': 'b'}) + '\n')
+
+    assert [entry['ocid'] for entry in read_plan(str(plan_path))] == ['a', 'b']
+    assert count_plan(str(plan_path)) == 2
+
+def test_parse_shard():
+    assert parse_shard('0/1') == (0, 1)
+    assert parse_shard('2/3') == (2, 3)
+
+    for value in ('3/3', '-1/2', '1/0', 'a/b', '1'):
+        assert parse_shard(value) is None
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# .done journal
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def test_journal_resumes(tmp_path):
+    plan_path = str(tmp_path / 'plan.jsonl')
+
+    journal = ApplyJournal(plan_path)
+    journal.mark_done('ocid-1')
+    journal.close()
+
+    journal = ApplyJournal(plan_path)
+    journal.mark_done('ocid-2')
+
+    assert journal.is_done('ocid-1')
+    assert journal.is_done('ocid-2')
+    assert not journal.is_done('ocid-3')
+    journal.close()
+
+    assert (tmp_path / 'plan.jsonl.done').read_text().split() == ['ocid-1', 'ocid-2']
+
+def test_apply_resumes_from_done(tenancy, tag_by_name, tmp_path):
+    plan_path = str(tmp_path / 'plan.jsonl')
+    state_path = str(tmp_path / 'state.db')
+
+    tag_by_name(tenancy, '-all', '--plan', plan_path, '-st', state_path)
+    entries = list(read_plan(plan_path))
+
+    assert len(entries) == len(tenancy.taggable())
+    assert not any(resource.defined_tags for resource in tenancy.taggable())
+
+    def updated_names(backend):
+        return {tenancy.resources[ocid].display_name for ocid in backend.updated}
+
+    # first half applied, then interrupted
+    first = tag_by_name(tenancy, '--apply', plan_path, '--shard', '0/2', '-st', state_path)
+
+    assert updated_names(first) == {entry['name'] for entry in read_plan(plan_path, (0, 2))}
+    assert set(open(plan_path + '.done').read().split()) == {entry['ocid'] for entry in read_plan(plan_path, (0, 2))}
+
+    # resumed: entries in .done are not applied again
+    second = tag_by_name(tenancy, '--apply', plan_path, '-st', state_path)
+
+    assert updated_names(second) == {entry['name'] for entry in read_plan(plan_path, (1, 2))}
+    assert not any(not resource.defined_tags for resource in tenancy.taggable())
+
+def test_failed_entry_is_left_out_of_done(tenancy, tag_by_name, tmp_path):
+    plan_path = tmp_path / 'plan.jsonl'
+
+    tag_by_name(tenancy, '-all', '--plan', str(plan_path))
+    entries = [json.loads(line) for line in plan_path.read_text().splitlines()]
+    entries[0]['tag_method'] = 'tag_unknown_resource'
+    del entries[1]['client']
+    plan_path.write_text(''.join(json.dumps(entry) + '\n' for entry in entries))
+
+    tag_by_name(tenancy, '--apply', str(plan_path), '-w', '4')
+    done = set((tmp_path / 'plan.jsonl.done').read_text().split())
+
+    assert done == {entry['ocid'] for entry in entries[2:]}
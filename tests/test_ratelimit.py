@@ -0,0 +1,66 @@
+# coding: utf-8
+
+import pytest
+
+from modules.ratelimit import AdaptiveTokenBucket, RateLimiter
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# AIMD: additive increase on fast success, halved on
+# 429, cut by 10% on latency spikes, within bounds
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def test_additive_increase_on_success():
+    bucket = AdaptiveTokenBucket(rate=10.0)
+    bucket.on_response(200, 0.01)
+
+    assert bucket.rate == pytest.approx(10.1)
+
+def test_multiplicative_decrease_on_throttling():
+    bucket = AdaptiveTokenBucket(rate=10.0)
+    bucket.on_response(429, 0.01)
+
+    assert bucket.rate == pytest.approx(5.0)
+    assert bucket.throttled == 1
+    assert bucket.tokens <= 0
+
+def test_rate_stays_within_bounds():
+    bucket = AdaptiveTokenBucket(rate=1.0, min_rate=0.5, max_rate=2.0)
+
+    for _ in range(10):
+        bucket.on_response(429, 0.01)
+
+    assert bucket.rate == 0.5
+
+    for _ in range(100):
+        bucket.on_response(200, 0.01)
+
+    assert bucket.rate == 2.0
+
+def test_latency_spike_cuts_rate():
+    bucket = AdaptiveTokenBucket(rate=10.0)
+    bucket.on_response(200, 0.5)
+    rate = bucket.rate
+
+    # ewma 0.8 * 0.5 + 0.2 * 10 = 2.4 > 3 * base latency 0.5
+    bucket.on_response(200, 10.0)
+
+    assert bucket.latency == pytest.approx(2.4)
+    assert bucket.rate == pytest.approx(rate * 0.9)
+
+def test_spike_under_min_latency_is_noise():
+    bucket = AdaptiveTokenBucket(rate=10.0)
+    bucket.on_response(200, 0.01)
+    rate = bucket.rate
+
+    # 10 times the base latency, but under min_latency (1s)
+    bucket.on_response(200, 0.5)
+
+    assert bucket.rate > rate
+
+def test_one_bucket_per_region_and_endpoint():
+    limiter = RateLimiter(rate=5.0, max_rate=20.0)
+
+    assert limiter.bucket('r1', 'iaas') is limiter.bucket('r1', 'iaas')
+    assert limiter.bucket('r1', 'iaas') is not limiter.bucket('r2', 'iaas')
+    assert limiter.bucket('r1', 'iaas') is not limiter.bucket('r1', 'query')
+    assert limiter.bucket('r1', 'iaas').max_rate == 20.0
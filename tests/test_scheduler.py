@@ -0,0 +1,65 @@
+# coding: utf-8
+
+import threading
+
+from modules.scheduler import WorkStealingScheduler
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# units are spread round robin, an idle worker steals
+# from the tail of the busiest queue
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def test_steals_from_tail_of_busiest_queue():
+    scheduler = WorkStealingScheduler(3)
+    scheduler.submit(range(7))
+
+    assert [list(queue) for queue in scheduler.queues] == [[0, 3, 6], [1, 4], [2, 5]]
+
+    assert scheduler.next_unit(1) == 1
+    assert scheduler.next_unit(1) == 4
+    assert scheduler.next_unit(1) == 6
+    assert scheduler.stolen == 1
+
+def test_idle_worker_takes_over_a_blocked_queue():
+    scheduler = WorkStealingScheduler(2)
+    scheduler.submit(['slow'] + [f'unit-{index}' for index in range(9)])
+
+    others_done = threading.Event()
+    runs = []
+    lock = threading.Lock()
+
+    def handler(unit):
+        if unit == 'slow':
+            assert others_done.wait(10)
+            return
+
+        with lock:
+            runs.append(unit)
+
+            if len(runs) == 9:
+                others_done.set()
+
+    scheduler.run(handler)
+
+    # worker 0 is held by 'slow', worker 1 runs its own 5 units
+    # and the 4 queued behind 'slow'
+    assert sorted(runs) == sorted(f'unit-{index}' for index in range(9))
+    assert scheduler.stolen == 4
+    assert scheduler.done == 10
+    assert scheduler.failed == 0
+
+def test_failed_unit_does_not_stop_the_run():
+    scheduler = WorkStealingScheduler(2)
+    scheduler.submit(range(6))
+    ran = []
+
+    def handler(unit):
+        if unit == 3:
+            raise RuntimeError('boom')
+        ran.append(unit)
+
+    scheduler.run(handler)
+
+    assert sorted(ran) == [0, 1, 2, 4, 5]
+    assert scheduler.done == 5
+    assert scheduler.failed == 1
@@ -0,0 +1,72 @@
+# coding: utf-8
+
+from datetime import datetime, timedelta, timezone
+
+from modules.state import StateStore, tags_hash
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# state store: tag value and tags hash per OCID
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def test_tags_hash_ignores_key_order():
+    assert tags_hash({'a': {'x': 1, 'y': 2}, 'b': {}}) == tags_hash({'b': {}, 'a': {'y': 2, 'x': 1}})
+    assert tags_hash(None) == tags_hash({})
+    assert tags_hash({'a': {'x': 1}}) != tags_hash({'a': {'x': 2}})
+
+def test_is_current_checks_value_and_hash(tmp_path):
+    store = StateStore(str(tmp_path / 'state.db'))
+    tags = {'Tags': {'name': 'vm-1'}}
+    store.record('ocid-1', 'instance', 'r1', 'vm-1', tags)
+
+    assert store.is_current('ocid-1', 'vm-1', tags)
+    assert not store.is_current('ocid-1', 'vm-2', tags)
+    assert not store.is_current('ocid-1', 'vm-1', {'Tags': {'name': 'vm-1'}, 'Other': {'k': 'v'}})
+    assert not store.is_current('ocid-2', 'vm-1', tags)
+
+    # known by OCID only (attachments): no hash to compare
+    assert store.is_current('ocid-1', 'vm-1')
+
+def test_compact_drops_entries_not_seen(tmp_path):
+    store = StateStore(str(tmp_path / 'state.db'))
+    store.record('old', 'instance', 'r1', 'a', {})
+    store.record('new', 'instance', 'r1', 'b', {})
+
+    old = (datetime.now(timezone.utc) - timedelta(days=40)).isoformat()
+    store.connection().execute('UPDATE applied_tags SET last_seen = ? WHERE ocid = ?', (old, 'old'))
+
+    assert store.compact(30) == 1
+    assert store.count() == 1
+    assert store.is_current('new', 'b')
+
+def test_watermark_round_trip(tmp_path):
+    store = StateStore(str(tmp_path / 'state.db'))
+    value = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    store.set_watermark('last_run:scope', value)
+
+    assert store.get_watermark('last_run:scope') == value
+    assert store.get_watermark('last_run:other') is None
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# end to end with -st: unchanged resources are not
+# updated again, a resource whose tags changed since
+# the last run is tagged again
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def test_state_skips_unchanged_and_retags_changed(tenancy, tag_by_name, tmp_path):
+    state_path = str(tmp_path / 'state.db')
+
+    first = tag_by_name(tenancy, '-all', '-st', state_path)
+
+    assert len(first.updated) == len(tenancy.taggable())
+
+    second = tag_by_name(tenancy, '-all', '-st', state_path)
+
+    assert second.updated == set()
+
+    instance = tenancy.by_kind[(tenancy.regions[0], 'instance')][0]
+    tenancy.tag(instance, 'changed by hand')
+
+    third = tag_by_name(tenancy, '-all', '-st', state_path)
+
+    assert third.updated == {instance.id}
+    assert instance.defined_tags == {tenancy.tag_namespace: {tenancy.tag_key: instance.display_name}}
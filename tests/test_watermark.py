@@ -0,0 +1,73 @@
+# coding: utf-8
+
+from datetime import datetime, timezone
+
+import oci
+
+from benchmarks import fake_oci
+from modules.state import StateStore
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+# --since last: watermarks are kept per scope
+# (families, region, compartment subtree), a run never
+# uses or moves the watermark of another scope
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def watermark_names(state_path):
+    store = StateStore(state_path)
+    names = {row[0] for row in store.connection().execute('SELECT name FROM watermarks')}
+    store.close()
+
+    return names
+
+def test_watermark_per_scope(tenancy, tag_by_name, tmp_path):
+    state_path = str(tmp_path / 'state.db')
+    region = tenancy.regions[0]
+
+    tag_by_name(tenancy, '-c', '--since', 'last', '-st', state_path)
+
+    assert watermark_names(state_path) == {f'last_run:compute|*|{tenancy.id}|-', f'last_full_run:compute|*|{tenancy.id}|-'}
+
+    # storage has no watermark yet: full run, old buckets are tagged
+    bucket = tenancy.by_kind[(region, 'bucket')][0]
+    assert not bucket.defined_tags
+
+    tag_by_name(tenancy, '-s', '--since', 'last', '-st', state_path)
+
+    assert bucket.defined_tags
+    assert f'last_run:storage|*|{tenancy.id}|-' in watermark_names(state_path)
+
+    # compute from its watermark: resources created before are not listed
+    old_instance = tenancy.by_kind[(region, 'instance')][0]
+    tenancy.tag(old_instance, None)
+    new_instance = tenancy.add(region, 'instance', old_instance.compartment_id, availability_domain=old_instance.availability_domain)
+    new_instance.time_created = datetime.now(timezone.utc)
+
+    backend = tag_by_name(tenancy, '-c', '--since', 'last', '-st', state_path)
+
+    assert new_instance.id in backend.updated
+    assert old_instance.id not in backend.updated
+
+def test_failed_run_keeps_watermark(tenancy, tag_by_name, tmp_path, monkeypatch):
+    state_path = str(tmp_path / 'state.db')
+
+    tag_by_name(tenancy, '-c', '--since', 'last', '-st', state_path)
+    store = StateStore(state_path)
+    watermark = store.get_watermark(f'last_run:compute|*|{tenancy.id}|-')
+    store.close()
+
+    # every update of the next run fails
+    region = tenancy.regions[0]
+    instance = tenancy.add(region, 'instance', tenancy.compartments[1].id)
+    instance.time_created = datetime.now(timezone.utc)
+
+    def failing_update(self, resource, details, if_match=None):
+        raise oci.exceptions.ServiceError(400, 'InvalidParameter', {}, 'rejected')
+
+    monkeypatch.setattr(fake_oci.FakeBackend, 'update', failing_update)
+
+    tag_by_name(tenancy, '-c', '--since', 'last', '-st', state_path)
+    store = StateStore(state_path)
+
+    assert store.get_watermark(f'last_run:compute|*|{tenancy.id}|-') == watermark
+    store.close()